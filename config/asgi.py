@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_asgi_application()
+
+# Typeahead indeksi birinchi so'rovni kutmasdan fon thread'ida quriladi
+from core import autocomplete  # noqa: E402
+
+autocomplete.start()
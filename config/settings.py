@@ -2,6 +2,8 @@ from pathlib import Path
 import os
 from datetime import timedelta
 
+from corsheaders.defaults import default_headers
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 DEBUG = True
@@ -71,6 +73,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
+    "core.middleware.ReplicaRoutingMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -94,11 +97,119 @@ TEMPLATES = [
 WSGI_APPLICATION = "config.wsgi.application"
 
 # ---------------- Database ----------------
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# WAL: o'quvchilar yozuvchini kutmaydi; synchronous=NORMAL WAL'da xavfsiz
+# (elektr uzilishida faqat oxirgi tranzaksiyalar yo'qolishi mumkin, baza buzilmaydi)
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,  # ms
+    "mmap_size": 128 * 1024 * 1024,
+    "cache_size": -32000,  # manfiy - KiB (≈32 MB)
+    "temp_store": "MEMORY",
+}
+
+# DB_ENGINE=postgres: PostgreSQL (psycopg 3 pool bilan), aks holda SQLite
+DB_ENGINE = os.getenv("DB_ENGINE", "sqlite")
+
+if DB_ENGINE == "postgres":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.getenv("DB_NAME", "alehson"),
+            "USER": os.getenv("DB_USER", "alehson"),
+            "PASSWORD": os.getenv("DB_PASSWORD", ""),
+            "HOST": os.getenv("DB_HOST", "localhost"),
+            "PORT": os.getenv("DB_PORT", "5432"),
+            # Ulanishlarni pool boshqaradi: CONN_MAX_AGE 0 bo'lishi shart
+            "CONN_MAX_AGE": 0,
+            # PgBouncer transaction rejimida server-side cursor'lar ishlamaydi
+            "DISABLE_SERVER_SIDE_CURSORS": os.getenv("DB_DISABLE_SERVER_SIDE_CURSORS") == "1",
+            "OPTIONS": {
+                "pool": {
+                    "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+                    "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+                    "timeout": 10,  # soniya: bo'sh ulanish kutish
+                    "max_idle": 300,
+                },
+                # Osilib qolgan so'rov worker'ni band qilmasin; uzoq ishlaydigan
+                # buyruqlar core.dbutils.long_running() ichida bajariladi
+                "options": (
+                    f"-c statement_timeout={os.getenv('DB_STATEMENT_TIMEOUT_MS', '30000')} "
+                    f"-c lock_timeout={os.getenv('DB_LOCK_TIMEOUT_MS', '10000')} "
+                    f"-c idle_in_transaction_session_timeout=60000"
+                ),
+                "application_name": "alehson",
+            },
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "core.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+            # Doimiy ulanishlar: har so'rovda qayta ochilmaydi, ishlatishdan oldin tekshiriladi
+            "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "600")),
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                "init_command": ";".join(f"PRAGMA {name}={value}" for name, value in SQLITE_PRAGMAS.items()),
+                # Yozuv tranzaksiyasi boshida qulf olinadi: o'rtada "database is locked" bo'lmaydi
+                "transaction_mode": "IMMEDIATE",
+                "timeout": 20,  # soniya
+                "lock_retries": 5,
+                "lock_backoff": 0.05,  # soniya
+            },
+        }
     }
+
+# ---------------- Read replicas ----------------
+# DB_REPLICAS: vergul bilan ajratilgan replica'lar. SQLite'da - fayl yo'llari
+# (faqat o'qiladi, `manage.py sync_sqlite_replicas` bilan yangilanadi),
+# Postgres'da - "host" yoki "host:port" (oqimli replikatsiya).
+DATABASE_REPLICAS = []
+for index, replica_name in enumerate(filter(None, os.getenv("DB_REPLICAS", "").split(",")), start=1):
+    alias = f"replica_{index}"
+    if DB_ENGINE == "postgres":
+        host, _, port = replica_name.strip().partition(":")
+        replica = {**DATABASES["default"], "HOST": host, "PORT": port or DATABASES["default"]["PORT"]}
+    else:
+        replica = {
+            **DATABASES["default"],
+            "NAME": replica_name.strip(),
+            "OPTIONS": {
+                **DATABASES["default"]["OPTIONS"],
+                "init_command": DATABASES["default"]["OPTIONS"]["init_command"] + ";PRAGMA query_only=ON",
+                "transaction_mode": None,
+            },
+        }
+    # Testlarda replica alohida baza emas, primary'ning o'zi
+    replica["TEST"] = {"MIRROR": "default"}
+    DATABASES[alias] = replica
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["core.routers.PrimaryReplicaRouter"]
+DB_REPLICA_HEALTH_INTERVAL = 10  # soniya
+DB_REPLICA_MAX_LAG = 30  # soniya (Postgres)
+DB_PIN_COOKIE_NAME = "db_pin"
+DB_PIN_SECONDS = 10  # yozuvdan keyin shuncha vaqt klient primary'dan o'qiydi
+
+# ---------------- Cache ----------------
+# "hits": blog ko'rishlarining takroriy tekshiruvi va hali flush qilinmagan
+# ko'rishlar. HITS_CACHE_URL (redis://...) berilsa barcha worker'lar uchun
+# umumiy Redis, aks holda jarayon ichidagi LocMem (trade-off'lar "Blog views"da)
+HITS_CACHE_URL = os.getenv("HITS_CACHE_URL")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "hits": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": HITS_CACHE_URL,
+    } if HITS_CACHE_URL else {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "hits",
+        "OPTIONS": {"MAX_ENTRIES": 100000},
+    },
 }
 
 # ---------------- Password validators ----------------
@@ -124,6 +235,75 @@ MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
 CKEDITOR_UPLOAD_PATH = "uploads/"
+
+# ---------------- Static JSON snapshots ----------------
+# nginx SNAPSHOT_URL ni SNAPSHOT_ROOT dan to'g'ridan-to'g'ri berishi kerak
+SNAPSHOT_ROOT = os.getenv("SNAPSHOT_ROOT", os.path.join(BASE_DIR, "snapshots"))
+SNAPSHOT_URL = "/api/snapshots/"
+SNAPSHOT_KEEP_VERSIONS = 3
+SNAPSHOT_LATEST_BLOGS = 12
+
+# ---------------- Sync feed ----------------
+SYNC_DEFAULT_BATCH = 200
+SYNC_MAX_BATCH = 1000
+SYNC_SETTLE_SECONDS = 2
+SYNC_TOMBSTONE_TTL_DAYS = 90
+
+# ---------------- Batch API ----------------
+BATCH_MAX_REQUESTS = 10
+BATCH_ALLOW_CONCURRENT = True
+
+# ---------------- Applications ----------------
+BULK_STATUS_MAX_ITEMS = 5000  # /api/applications/bulk-set-status/ partiyasi
+APPLICATION_IMPORT_CHUNK_SIZE = 1000  # import_applications: bitta bulk_create partiyasi
+APPLICATION_IMPORT_MAX_ERRORS = 1000  # hisobotdagi qator xatolari (qolganlari faqat sanaladi)
+# Asinxron qabul (?async=1 -> 202): process_application_intakes worker'i yaratadi
+APPLICATION_INTAKE_ASYNC = os.environ.get("APPLICATION_INTAKE_ASYNC") == "1"  # hamma yuborishlar uchun
+APPLICATION_INTAKE_MAX_ATTEMPTS = 3
+APPLICATION_INTAKE_RETRY_DELAY = 30  # soniya, har urinishda ikki barobar
+APPLICATION_INTAKE_STALE_SECONDS = 600  # shundan uzoq "processing" - worker to'xtab qolgan
+APPLICATION_INTAKE_KEEP_DAYS = 7  # yakunlangan yozuvlar holat so'rovlari uchun saqlanadi
+
+# ---------------- Idempotency ----------------
+IDEMPOTENCY_KEY_TTL = 24 * 3600  # soniya: saqlangan javob shuncha vaqt qaytariladi
+IDEMPOTENCY_RETRY_AFTER = 1  # soniya: birinchisi hali bajarilayotgan takror so'rovga 409 bilan
+IDEMPOTENCY_PROCESSING_TIMEOUT = 300  # soniya: shundan uzoq "processing" kalit tashlab ketilgan
+
+# ---------------- Outbound HTTP ----------------
+# Async view'lar (core.outbound): aiohttp, bitta event loop uchun umumiy ulanishlar pool'i
+OUTBOUND_HTTP_TIMEOUT = 30  # soniya
+OUTBOUND_HTTP_MAX_CONNECTIONS = 200
+TELEGRAM_API_URL = "https://api.telegram.org"
+# Kalitlar muhitdan olinadi (repoda saqlanmaydi)
+TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
+TELEGRAM_CHAT_ID = int(os.getenv("TELEGRAM_CHAT_ID", "-5075343219"))
+IMGBB_UPLOAD_URL = "https://api.imgbb.com/1/upload"
+IMGBB_API_KEY = os.getenv("IMGBB_API_KEY", "")
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+
+# ---------------- Autocomplete ----------------
+# Indeks fon thread'ida quriladi; o'zgarishlar "default" kesh orqali boshqa
+# jarayonlarga yetkaziladi (LocMem'da har jarayon faqat o'z o'zgarishlarini ko'radi)
+AUTOCOMPLETE_MAX_AGE = 300  # soniya: xotiradagi indeks shundan keyin fon thread'ida qayta quriladi
+AUTOCOMPLETE_SYNC_INTERVAL = 5  # soniya: fon thread'i eskirgan indekslarni shuncha vaqtda tekshiradi
+
+# ---------------- Blog views ----------------
+# Ko'rishlar BLOG_VIEW_CACHE'da yig'ilib, har BLOG_VIEW_FLUSH_INTERVAL
+# soniyada bazaga yoziladi. Kesh LocMem bo'lsa (HITS_CACHE_URL berilmagan):
+#   - jarayon to'satdan o'ldirilsa (SIGKILL, OOM) flush qilinmagan ko'rishlar
+#     yo'qoladi; atexit faqat normal to'xtashda yozib ulguradi;
+#   - bir nechta worker'da takroriy tekshiruv har worker uchun alohida, ya'ni
+#     bitta o'quvchi boshqa worker'ga tushsa yana sanaladi;
+#   - MAX_ENTRIES to'lsa LocMem kalitlarni o'chiradi, ular orasida flush
+#     qilinmagan ko'rishlar ham bo'lishi mumkin.
+# Redis bilan ko'rishlar worker qayta ishga tushishidan omon qoladi va
+# takroriy tekshiruv barcha worker'lar uchun bitta.
+HITCOUNT_KEEP_HIT_ACTIVE = {"days": 7}
+BLOG_VIEW_CACHE = "hits"
+BLOG_VIEW_FLUSH_INTERVAL = 10  # soniya
+BLOG_LEADERBOARD_CACHE_TTL = 60  # soniya
+BLOG_VIEW_COOKIE_NAME = "blog_visitor"
+BLOG_VIEW_COOKIE_MAX_AGE = 365 * 24 * 60 * 60  # soniya
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # ---------------- Sites / Auth ----------------
@@ -203,6 +383,10 @@ CSRF_TRUSTED_ORIGINS = [
     "https://alehson-site-client.vercel.app",
 ]
 
+# Idempotency-Key (ariza / contact yuborishni qayta urinish)
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
+CORS_EXPOSE_HEADERS = ["Idempotent-Replayed"]
+
 SESSION_COOKIE_SAMESITE = "Lax"
 CSRF_COOKIE_SAMESITE = "Lax"
 SESSION_COOKIE_HTTPONLY = True
@@ -287,6 +471,9 @@ SPECTACULAR_SETTINGS = {
         {'name': 'Statistics', 'description': 'Statistika'},
         {'name': 'Contact Us', 'description': 'Aloqa'},
         {'name': 'Application Images', 'description': 'Ariza rasmlari'},
+        {'name': 'Sync', 'description': 'Keshlangan ma\'lumotlarni sinxronlash'},
+        {'name': 'Batch', 'description': 'Bir nechta so\'rovni birlashtirish'},
+        {'name': 'Autocomplete', 'description': 'Typeahead takliflari'},
     ],
     'SERVERS': [
         {'url': 'http://127.0.0.1:8000', 'description': 'Development server'},
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Typeahead indeksi birinchi so'rovni kutmasdan fon thread'ida quriladi
+from core import autocomplete  # noqa: E402
+
+autocomplete.start()
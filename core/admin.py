@@ -1,6 +1,17 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.db import transaction
 from django.utils.html import format_html
-from .models import About, Blog, Category, Subcategory, Application, ApplicationImage, Banner, ContactUs
+from .models import (
+    About, Blog, Category, Subcategory, Application, ApplicationImage, ArchivedApplication,
+    ArchivedApplicationImage, Banner, ContactUs,
+)
+from .stats import apply_deltas
+from .hits import get_view_count
+from . import search
+from .lookups import search_applications
+from .applications import BulkStatusError, bulk_set_status, parse_bulk_status
 
 
 @admin.register(Banner)
@@ -28,8 +39,11 @@ class ContactUsAdmin(admin.ModelAdmin):
     actions = ['mark_as_read']
 
     def mark_as_read(self, request, queryset):
-        queryset.update(is_read=True)
-        self.message_user(request, f"{queryset.count()} xabar o'qilgan deb belgilandi.")
+        # queryset.update() signal yubormaydi, hisoblagichni o'zimiz kamaytiramiz
+        with transaction.atomic():
+            updated = queryset.filter(is_read=False).update(is_read=True)
+            apply_deltas({"unread_contacts": -updated})
+        self.message_user(request, f"{updated} xabar o'qilgan deb belgilandi.")
     mark_as_read.short_description = "Tanlangan xabarlarni o'qilgan deb belgilash"
 
 
@@ -52,10 +66,22 @@ class BlogAdmin(admin.ModelAdmin):
     list_filter = ('region', 'created_date')
     readonly_fields = ('image_url', 'created_date')
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related('hit_count_generic')
+
     def get_hit_count(self, obj):
-        return obj.hit_count.hits if hasattr(obj, "hit_count") else 0
+        return get_view_count(obj)
     get_hit_count.short_description = "Views"
 
+    def get_search_results(self, request, queryset, search_term):
+        # LIKE '%q%' o'rniga FTS indeksi (SQLite bo'lmasa oddiy qidiruv)
+        if not search_term or not search.is_available():
+            return super().get_search_results(request, queryset, search_term)
+        ids = search.matching_ids(search_term)
+        if ids is None:
+            return queryset.none(), False
+        return queryset.filter(pk__in=ids), False
+
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -95,12 +121,18 @@ class SubcategoryAdmin(admin.ModelAdmin):
         return super().formfield_for_manytomany(db_field, request, **kwargs)
 
 
+class ApplicationActionForm(ActionForm):
+    denied_reason = forms.CharField(required=False, label="Rad etish sababi")
+
+
 @admin.register(Application)
 class ApplicationAdmin(admin.ModelAdmin):
     list_display = ('full_name', 'phone_number', 'category', 'subcategory', 'status', 'region', 'created_date')
     list_filter = ('status', 'region', 'category', 'subcategory')
     search_fields = ('full_name', 'phone_number', 'passport_number')
     readonly_fields = ('slug', 'video_url', 'document_url', 'created_date')
+    action_form = ApplicationActionForm
+    actions = ['mark_accepted', 'mark_denied', 'mark_pending']
     
     fieldsets = (
         ('Asosiy ma\'lumotlar', {
@@ -120,6 +152,37 @@ class ApplicationAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_search_results(self, request, queryset, search_term):
+        # Telefon/passport -> indeksli tenglik/prefiks, ism -> icontains
+        return search_applications(queryset, search_term), False
+
+    def _set_status(self, request, queryset, status):
+        # save()siz: bitta UPDATE, hisoblagich va rollup'lar core.applications'da
+        reason = request.POST.get("denied_reason", "").strip()
+        if status == "denied" and not reason:
+            self.message_user(request, "Rad etish uchun sabab kiriting.", level=messages.ERROR)
+            return
+        payload = {"slugs": list(queryset.values_list("slug", flat=True)), "status": status, "denied_reason": reason}
+        try:
+            results = bulk_set_status(parse_bulk_status(payload))
+        except BulkStatusError as e:
+            self.message_user(request, "; ".join(e.errors.values()), level=messages.ERROR)
+            return
+        updated = sum(result["result"] == "updated" for result in results)
+        self.message_user(request, f"{updated} ta ariza statusi '{status}' ga o'zgartirildi.")
+
+    def mark_accepted(self, request, queryset):
+        self._set_status(request, queryset, "accepted")
+    mark_accepted.short_description = "Tanlangan arizalarni qabul qilish"
+
+    def mark_denied(self, request, queryset):
+        self._set_status(request, queryset, "denied")
+    mark_denied.short_description = "Tanlangan arizalarni rad etish (sabab kiriting)"
+
+    def mark_pending(self, request, queryset):
+        self._set_status(request, queryset, "pending")
+    mark_pending.short_description = "Tanlangan arizalarni ko'rib chiqishga qaytarish"
+
     def get_queryset(self, request):
         qs = super().get_queryset(request)
         # Filter qilish uchun additional query parameters
@@ -140,6 +203,34 @@ class ApplicationAdmin(admin.ModelAdmin):
         return super().changelist_view(request, extra_context=extra_context)
 
 
+class ArchivedApplicationImageInline(admin.TabularInline):
+    model = ArchivedApplicationImage
+    extra = 0
+    can_delete = False
+    readonly_fields = ('image', 'image_url', 'created_date')
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedApplication)
+class ArchivedApplicationAdmin(admin.ModelAdmin):
+    """Faqat ko'rish va o'chirish: arxiv o'zgartirilmaydi (statistika shunga tayanadi)"""
+    list_display = ('full_name', 'phone_number', 'category', 'subcategory', 'status', 'region', 'created_date', 'archived_date')
+    list_filter = ('status', 'region', 'category', 'subcategory')
+    search_fields = ('full_name', 'phone_number', 'passport_number')
+    inlines = [ArchivedApplicationImageInline]
+
+    def get_search_results(self, request, queryset, search_term):
+        return search_applications(queryset, search_term), False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(ApplicationImage)
 class ApplicationImageAdmin(admin.ModelAdmin):
     list_display = ('application', 'image_url_preview')
@@ -0,0 +1,170 @@
+"""
+Arizalarni yaratish va ular ustidagi ommaviy amallar.
+
+`validate_submission` / `create_application` / `attach_image` -
+ApplicationViewSet.create (sinxron) va asinxron qabul (`intake`) uchun umumiy
+yaratish bosqichlari.
+
+`bulk_set_status` bir nechta arizaning statusini `save()`siz o'zgartiradi:
+butun partiya oldindan tekshiriladi, keyin bitta tranzaksiyada har bir
+(status, sabab) guruhi uchun bitta UPDATE bajariladi. UPDATE signal
+yubormagani uchun statistika hisoblagichlari va rollup'lar shu yerda, bitta
+yig'ma o'zgarish sifatida qo'llanadi.
+"""
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import stats
+from .models import Application, ApplicationImage, unique_application_slug
+from .serializers import ApplicationCreateWithFilesSerializer
+
+STATUSES = {value for value, _ in Application.STATUS_CHOICES}
+
+
+# Ariza yuborishdagi matnli maydonlar (fayllar: video, document, images)
+SUBMISSION_FIELDS = (
+    "full_name", "phone_number", "birth_date", "passport_number", "region",
+    "district", "location", "category", "subcategory", "description",
+)
+
+
+def submission_data(data):
+    return {field: data.get(field) for field in SUBMISSION_FIELDS}
+
+
+def unique_slug(full_name):
+    return unique_application_slug(full_name)
+
+
+def validate_submission(data, video=None, document=None):
+    """Tekshirilgan serializer; xato bo'lsa rest_framework ValidationError"""
+    serializer = ApplicationCreateWithFilesSerializer(data={**data, "video": video, "document": document})
+    serializer.is_valid(raise_exception=True)
+    return serializer
+
+
+def create_application(serializer):
+    return serializer.save(slug=unique_slug(serializer.validated_data["full_name"]))
+
+
+def attach_image(application, image):
+    # ApplicationImage.save() rasmni imgbb'ga yuklaydi
+    return ApplicationImage.objects.create(application=application, image=image)
+
+
+class BulkStatusError(ValueError):
+    """Partiya noto'g'ri: {"index yoki maydon": xato} ko'rinishidagi `errors` bilan"""
+
+    def __init__(self, errors):
+        super().__init__("Noto'g'ri partiya")
+        self.errors = errors
+
+
+def _max_items():
+    return getattr(settings, "BULK_STATUS_MAX_ITEMS", 5000)
+
+
+def parse_bulk_status(payload):
+    """
+    Ikki ko'rinish qabul qilinadi:
+      {"slugs": [...], "status": "denied", "denied_reason": "..."}
+      {"items": [{"slug": ..., "status": ..., "denied_reason": ...}, ...]}
+    Qaytaradi: [(slug, status, denied_reason)]; xato bo'lsa BulkStatusError.
+    """
+    if not isinstance(payload, dict):
+        raise BulkStatusError({"non_field_errors": "JSON obyekt kutilgan"})
+    if "items" in payload:
+        items = payload["items"]
+        if not isinstance(items, list):
+            raise BulkStatusError({"items": "Ro'yxat bo'lishi kerak"})
+    else:
+        slugs = payload.get("slugs")
+        if not isinstance(slugs, list):
+            raise BulkStatusError({"slugs": "Ro'yxat bo'lishi kerak"})
+        items = [
+            {"slug": slug, "status": payload.get("status"), "denied_reason": payload.get("denied_reason")}
+            for slug in slugs
+        ]
+
+    if not items:
+        raise BulkStatusError({"items": "Bo'sh partiya"})
+    if len(items) > _max_items():
+        raise BulkStatusError({"items": f"Ko'pi bilan {_max_items()} ta ariza"})
+
+    errors = {}
+    parsed = []
+    seen = set()
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors[str(index)] = "Obyekt kutilgan"
+            continue
+        slug, status = item.get("slug"), item.get("status")
+        reason = (item.get("denied_reason") or "").strip()
+        if not isinstance(slug, str) or not slug:
+            errors[str(index)] = "slug kerak"
+        elif slug in seen:
+            errors[str(index)] = f"{slug}: takrorlangan"
+        elif status not in STATUSES:
+            errors[str(index)] = f"{slug}: noto'g'ri status"
+        elif status == "denied" and not reason:
+            errors[str(index)] = f"{slug}: denied uchun sabab kiritilishi kerak"
+        else:
+            seen.add(slug)
+            parsed.append((slug, status, reason if status == "denied" else ""))
+    if errors:
+        raise BulkStatusError(errors)
+    return parsed
+
+
+def bulk_set_status(items):
+    """
+    items: [(slug, status, denied_reason)] - parse_bulk_status natijasi.
+    Qaytaradi: [{"slug", "result": updated|unchanged|not_found, "status"}]
+    (kiritilgan tartibda).
+    """
+    slugs = [slug for slug, _, _ in items]
+    now = timezone.now()
+    with transaction.atomic():
+        current = {
+            row["slug"]: row
+            for row in Application.objects.select_for_update().filter(slug__in=slugs).order_by().values(
+                "pk", "slug", "status", "denied_reason", "created_date", "region", "category_id", "subcategory_id",
+            )
+        }
+
+        groups = defaultdict(list)
+        results = []
+        counter_deltas = Counter()
+        rollup_deltas = Counter()
+        for slug, status, reason in items:
+            row = current.get(slug)
+            if row is None:
+                results.append({"slug": slug, "result": "not_found", "status": None})
+                continue
+            if row["status"] == status and (row["denied_reason"] or "") == reason:
+                results.append({"slug": slug, "result": "unchanged", "status": status})
+                continue
+            groups[(status, reason)].append(row["pk"])
+            results.append({"slug": slug, "result": "updated", "status": status})
+
+            counter_deltas.update(stats.application_status_change_deltas(row["status"], status))
+            key = stats.rollup_key(
+                row["created_date"], row["region"], row["category_id"], row["subcategory_id"], row["status"]
+            )
+            rollup_deltas.update(stats.rollup_change_deltas(key, key[:-1] + (status,)))
+
+        for (status, reason), pks in groups.items():
+            # closed_date: Application.save() bilan bir xil qoida
+            closed_date = None if status == "pending" else Coalesce("closed_date", Value(now))
+            Application.objects.filter(pk__in=pks).update(
+                status=status, denied_reason=reason, closed_date=closed_date
+            )
+
+        stats.apply_deltas(counter_deltas)
+        stats.apply_rollup_deltas_bulk(rollup_deltas)
+    return results
@@ -0,0 +1,136 @@
+"""
+Yopilgan arizalarni arxivlash (hot/cold split).
+
+Xodimlar asosan pending arizalar bilan ishlaydi, accepted/denied arizalar esa
+yillar davomida to'planib har bir ro'yxat, filtr va admin so'rovini
+sekinlashtiradi. `archive_applications` buyrug'i `closed_date`'i N kundan eski
+arizalarni (rasmlari bilan) ArchivedApplication / ArchivedApplicationImage
+jadvallariga partiyalab ko'chiradi.
+
+Ko'chirish signal'larsiz o'chiradi: ariza mavjudligicha qoladi, faqat boshqa
+jadvalda. Shuning uchun StatisticsCounter va ApplicationRollup o'zgarmaydi,
+`stats.compute_counts()` va `stats.rebuild_rollups()` esa arxivni ham sanaydi.
+"""
+from datetime import timedelta
+
+from django.db import connections, router, transaction
+from django.db.models import Value
+from django.utils import timezone
+
+from . import autocomplete
+from .models import Application, ApplicationImage, ArchivedApplication, ArchivedApplicationImage
+
+CLOSED_STATUSES = ("accepted", "denied")
+
+# Application'dan arxivga nusxalanadigan ustunlar (id -> original_id)
+APPLICATION_FIELDS = [field.attname for field in Application._meta.concrete_fields if field.attname != "id"]
+IMAGE_FIELDS = ["image", "image_url", "created_date"]
+
+
+def _delete_rows(model, column, ids):
+    """
+    Oddiy DELETE ... WHERE column IN (...): post_delete signal'lari hisoblagich
+    va rollup'larni kamaytirmasligi uchun ORM'ning delete()'i ishlatilmaydi
+    """
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    placeholders = ", ".join(["%s"] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {quote(model._meta.db_table)} WHERE {quote(column)} IN ({placeholders})", ids
+        )
+
+
+def archivable(older_than_days):
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    return Application.objects.filter(status__in=CLOSED_STATUSES, closed_date__lt=cutoff)
+
+
+def _archive_batch(queryset, batch_size):
+    """Bitta partiyani ko'chiradi, ko'chirilgan arizalar sonini qaytaradi"""
+    with transaction.atomic():
+        # Postgres'da qatorlar qulflanadi (parallel status o'zgarishi kutadi)
+        ids = list(
+            queryset.select_for_update(skip_locked=True).order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not ids:
+            return 0
+
+        rows = Application.objects.filter(pk__in=ids).order_by("pk").values("id", *APPLICATION_FIELDS)
+        archived = ArchivedApplication.objects.bulk_create(
+            [ArchivedApplication(original_id=row.pop("id"), **row) for row in rows]
+        )
+        archived_ids = {application.original_id: application.pk for application in archived}
+
+        images = ApplicationImage.objects.filter(application_id__in=ids).values("application_id", *IMAGE_FIELDS)
+        ArchivedApplicationImage.objects.bulk_create([
+            ArchivedApplicationImage(application_id=archived_ids[row.pop("application_id")], **row)
+            for row in images
+        ])
+
+        _delete_rows(ApplicationImage, ApplicationImage._meta.get_field("application").column, ids)
+        _delete_rows(Application, Application._meta.pk.column, ids)
+    return len(ids)
+
+
+def archive_applications(older_than_days, batch_size=500):
+    """Qaytaradi: (ko'chirilgan arizalar soni, partiyalar soni)"""
+    queryset = archivable(older_than_days)
+    total = batches = 0
+    while True:
+        moved = _archive_batch(queryset, batch_size)
+        if not moved:
+            break
+        total += moved
+        batches += 1
+    if total:
+        # Ism/tuman takliflari faqat asosiy jadvaldan olinadi
+        autocomplete.invalidate("district", "name")
+    return total, batches
+
+
+def include_archived(request):
+    return request.query_params.get("include_archived") in ("1", "true")
+
+
+class MergedApplications:
+    """
+    Ikkala jadvaldan filtrlangan arizalar, created_date bo'yicha (yangilari
+    oldin). UNION faqat (arxivmi, id, created_date) ustida bajariladi va
+    kesish (`[offset:offset + limit]`) unga LIMIT/OFFSET sifatida tushadi:
+    faqat sahifadagi kalitlar o'qiladi, obyektlar keyin har bir jadvaldan id
+    bo'yicha olinadi. count() va kesish - LimitOffsetPagination uchun yetarli.
+    """
+    related = ("category", "subcategory")
+
+    def __init__(self, live, archived):
+        self.live = live
+        self.archived = archived
+
+    def _keys(self):
+        def keys(queryset, is_archived):
+            return (
+                queryset.order_by().annotate(is_archived=Value(is_archived))
+                .values_list("is_archived", "id", "created_date")
+            )
+
+        return keys(self.live, False).union(keys(self.archived, True), all=True).order_by("-created_date", "-id")
+
+    def count(self):
+        return self.live.count() + self.archived.count()
+
+    def __getitem__(self, page):
+        if not isinstance(page, slice):
+            raise TypeError("MergedApplications faqat kesish (slice) bilan o'qiladi")
+        rows = list(self._keys()[page])
+        objects = {
+            is_archived: queryset.model.objects.select_related(*self.related).prefetch_related("images")
+            .in_bulk([pk for archived, pk, _ in rows if bool(archived) == is_archived])
+            for is_archived, queryset in ((False, self.live), (True, self.archived))
+        }
+        return [objects[bool(archived)][pk] for archived, pk, _ in rows if pk in objects[bool(archived)]]
+
+
+def merged_applications(live, archived):
+    return MergedApplications(live, archived)
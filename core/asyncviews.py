@@ -0,0 +1,70 @@
+"""
+DRF view'lari uchun native async handler'lar.
+
+DRF dispatch'i sinxron: ASGI ostida har bir so'rov tashqi xizmat (Google,
+Telegram, imgbb) javobini kutayotganda ham thread'ni band qilib turadi.
+`AsyncDispatchMixin` bilan handler `async def` bo'lsa, shu yo'l (route)
+coroutine view sifatida e'lon qilinadi: handler event loop'da bajariladi,
+DRF'ning sinxron qismi (autentifikatsiya, ruxsatlar, throttle) esa bitta
+sync_to_async chaqiruvida.
+
+ViewSet'da qaror har bir yo'l uchun alohida: faqat sinxron action'lardan
+iborat yo'llar (masalan, ApplicationViewSet.list) odatdagi DRF dispatch'idan
+o'tadi. WSGI ostida async yo'llarni Django o'zi async_to_sync bilan chaqiradi.
+"""
+from inspect import iscoroutine
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.utils.decorators import classonlymethod
+from django.utils.functional import classproperty
+
+
+def _is_async(cls, actions=None):
+    """Yo'lning biror handler'i coroutine funksiyami (ViewSet: action map, APIView: HTTP metodlar)"""
+    names = actions.values() if actions else cls.http_method_names
+    return any(iscoroutinefunction(getattr(cls, name, None)) for name in names)
+
+
+class AsyncDispatchMixin:
+    """APIView / ViewSet uchun: `async def` handler'lar native await qilinadi"""
+
+    @classproperty
+    def view_is_async(cls):
+        # Django'ning View.view_is_async'i sync va async handler aralash bo'lsa xato beradi
+        return _is_async(cls)
+
+    @classonlymethod
+    def as_view(cls, *args, **initkwargs):
+        view = super().as_view(*args, **initkwargs)
+        if _is_async(cls, getattr(view, "actions", None)):
+            markcoroutinefunction(view)
+        return view
+
+    def dispatch(self, request, *args, **kwargs):
+        if not _is_async(type(self), getattr(self, "action_map", None)):
+            return super().dispatch(request, *args, **kwargs)
+        return self._dispatch_async(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # Async handler chaqirilganda hali bajarilmagan coroutine qaytaradi:
+        # u _dispatch_async'da await qilinib, keyin yakunlanadi
+        if iscoroutine(response):
+            return response
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    async def _dispatch_async(self, request, *args, **kwargs):
+        """
+        DRF'ning o'z dispatch'i (request, autentifikatsiya, ruxsatlar, throttle,
+        handler tanlash) bitta sync_to_async chaqiruvida bajariladi. Sinxron
+        handler shu thread'da tugaydi; async handler esa coroutine qaytaradi va
+        u event loop'da await qilinadi.
+        """
+        response = await sync_to_async(super().dispatch)(request, *args, **kwargs)
+        if not iscoroutine(response):
+            return response
+        try:
+            response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        self.response = self.finalize_response(self.request, response, *self.args, **self.kwargs)
+        return self.response
@@ -0,0 +1,394 @@
+"""
+Typeahead (autocomplete) uchun jarayon xotirasidagi prefiks indeksi.
+
+Har bir maydon (district, category, subcategory, name) uchun tartiblangan
+(normallashtirilgan kalit, yozuv) massivi saqlanadi; prefiks diapazoni
+`bisect` bilan topiladi va DB'ga murojaat qilinmaydi. Har bir so'z boshidan
+ham kalit yaratiladi, shuning uchun "val" "Ali Valiyev"ni ham topadi.
+
+Normallashtirish katta/kichik harfni va tutuq belgilarini (', ʻ, ʼ, ‘, ’, `)
+olib tashlaydi: "Farg'ona", "fargʻona" va "fargona" bir xil kalit beradi.
+
+Har bir prefiks uchun reyting bo'yicha eng yaxshi yozuvlar ro'yxati saqlanadi
+va o'zgarishlarda joyida tuzatiladi, shuning uchun qidiruv k ta yozuvni
+ko'radi; diapazon faqat ro'yxat hali yo'q yoki eskirgan prefiks uchun bir
+marta ko'rib chiqiladi.
+
+Indeks so'rov yo'lida DB'dan qurilmaydi: fon thread'i (`start()`) yangi
+nusxani qulfsiz quradi va faqat almashtirishda qulf oladi. Signal'lar
+o'zgarishni (delta) keshga yozib versiyani oshiradi; har bir jarayon
+deltalarni keshdan o'qib o'z indeksiga qo'llaydi. Delta topilmasa (kesh
+tozalangan, ommaviy import) yoki AUTOCOMPLETE_MAX_AGE o'tsa indeks fon
+thread'ida qayta quriladi.
+"""
+import bisect
+import heapq
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.db.models import Count
+
+from .dbutils import ITERATOR_CHUNK_SIZE
+from .models import Application, Category, Subcategory
+
+logger = logging.getLogger(__name__)
+
+APOSTROPHES = "'`ʻʼ‘’"
+_APOSTROPHE_RE = re.compile(f"[{APOSTROPHES}]")
+_WORD_START_RE = re.compile(r"(?:^|\s)(?=\S)")
+
+# Prefiks ro'yxatlari: API limit'ining yuqori chegarasi va o'chirishlar uchun zaxira
+TOP_K = 20
+TOP_BUFFER = 2 * TOP_K
+MAX_CACHED_PREFIXES = 20000
+# Qurilganda shu uzunlikkacha bo'lgan prefikslar (eng katta diapazonlar) oldindan hisoblanadi
+WARM_PREFIX_LENGTH = 2
+# Bundan ko'p delta orqada qolgan jarayon indeksni qayta quradi
+MAX_DELTA_GAP = 1000
+DELTA_TTL = 24 * 60 * 60
+
+# Faqat xotiradagi amallar (delta, qidiruv, almashtirish) uchun; DB va kesh I/O qulfsiz
+_lock = threading.Lock()
+_wake = threading.Event()
+_worker = None
+
+
+def normalize(value):
+    value = unicodedata.normalize("NFKC", value or "").casefold()
+    value = _APOSTROPHE_RE.sub("", value)
+    return " ".join(value.split())
+
+
+class PrefixIndex:
+    """Tartiblangan (kalit, yozuv id) massivi va prefikslar bo'yicha top ro'yxatlar"""
+
+    def __init__(self):
+        self.entries = {}  # yozuv id -> {"value", "id", "count"}
+        self._texts = {}  # yozuv id -> normallashtirilgan qiymat
+        self._keys = []
+        self._top = OrderedDict()  # prefiks -> [reyting bo'yicha yozuv id'lari, hammasimi]
+        self.built_at = 0.0
+        self.version = 0
+
+    @staticmethod
+    def _suffixes(text):
+        return {text[match.end():] for match in _WORD_START_RE.finditer(text)}
+
+    def _prefixes(self, entry_id):
+        return {
+            suffix[:end]
+            for suffix in self._suffixes(self._texts[entry_id])
+            for end in range(1, len(suffix) + 1)
+        }
+
+    def _rank(self, prefix, entry_id):
+        entry = self.entries[entry_id]
+        # To'liq mos kelgan boshlanish (so'zning boshi emas, butun qiymat) yuqoriroq
+        return (not self._texts[entry_id].startswith(prefix), -entry["count"], entry["value"])
+
+    def _collect(self, prefix, size=TOP_BUFFER):
+        """Diapazonni ko'rib chiqadi: (eng yaxshi `size` ta id, diapazon to'liq sig'dimi)"""
+        start = bisect.bisect_left(self._keys, (prefix,))
+        end = bisect.bisect_left(self._keys, (prefix[:-1] + chr(ord(prefix[-1]) + 1),), start)
+        candidates = {self._keys[index][1] for index in range(start, end)}
+        ranked = heapq.nsmallest(size, candidates, key=lambda entry_id: self._rank(prefix, entry_id))
+        return [ranked, len(candidates) <= size]
+
+    def _ranked(self, prefix):
+        cached = self._top.get(prefix)
+        if cached is None:
+            cached = self._top[prefix] = self._collect(prefix)
+            if len(self._top) > MAX_CACHED_PREFIXES:
+                self._top.popitem(last=False)
+        else:
+            self._top.move_to_end(prefix)
+        return cached[0]
+
+    def _reposition(self, entry_id, prefixes):
+        """
+        Yozuv qo'shilgan/o'zgargan/o'chirilgandan keyin uning prefikslaridagi
+        ro'yxatlarni tuzatadi. Ro'yxat har doim diapazonning aniq eng yaxshi
+        qismi bo'lib qoladi; juda qisqarib qolsa keyingi qidiruvda qayta yig'iladi.
+        """
+        alive = entry_id in self.entries
+        for prefix in prefixes:
+            cached = self._top.get(prefix)
+            if cached is None:
+                continue
+            ranked, complete = cached
+            if entry_id in ranked:
+                ranked.remove(entry_id)
+            if alive:
+                rank = self._rank(prefix, entry_id)
+                ranks = [self._rank(prefix, other) for other in ranked]
+                # Ro'yxat chegarasidan yomon yozuv uchun tashqaridagilar noma'lum: qo'shilmaydi
+                if complete or (ranks and rank < ranks[-1]):
+                    ranked.insert(bisect.bisect_left(ranks, rank), entry_id)
+                    if len(ranked) > TOP_BUFFER:
+                        ranked.pop()
+                        cached[1] = False
+            if not cached[1] and len(ranked) < TOP_K:
+                del self._top[prefix]
+
+    def add(self, entry_id, value, count=1, pk=None):
+        entry = self.entries.get(entry_id)
+        if entry is None:
+            entry = self.entries[entry_id] = {"value": value, "id": pk, "count": 0}
+            text = self._texts[entry_id] = normalize(value)
+            for suffix in self._suffixes(text):
+                bisect.insort(self._keys, (suffix, entry_id))
+        entry["count"] += count
+        self._reposition(entry_id, self._prefixes(entry_id))
+
+    def remove(self, entry_id, count=None):
+        """`count` berilsa hisoblagichni kamaytiradi, 0 ga tushsa yozuvni o'chiradi"""
+        entry = self.entries.get(entry_id)
+        if entry is None:
+            return
+        prefixes = self._prefixes(entry_id)
+        if count is not None:
+            entry["count"] -= count
+            if entry["count"] > 0:
+                self._reposition(entry_id, prefixes)
+                return
+        del self.entries[entry_id]
+        for suffix in self._suffixes(self._texts.pop(entry_id)):
+            index = bisect.bisect_left(self._keys, (suffix, entry_id))
+            if index < len(self._keys) and self._keys[index] == (suffix, entry_id):
+                del self._keys[index]
+        self._reposition(entry_id, prefixes)
+
+    def load(self, items):
+        """items: (yozuv id, qiymat, son, pk) - indeksni noldan quradi"""
+        self.entries = {}
+        self._texts = {}
+        self._top = OrderedDict()
+        keys = []
+        for entry_id, value, count, pk in items:
+            self.entries[entry_id] = {"value": value, "id": pk, "count": count}
+            text = self._texts[entry_id] = normalize(value)
+            keys.extend((suffix, entry_id) for suffix in self._suffixes(text))
+        keys.sort()
+        self._keys = keys
+
+        # Eng katta diapazonlar (1-2 harf) so'rovni kutmasdan hisoblanadi
+        short = sorted({suffix[:end] for suffix, _ in keys for end in range(1, WARM_PREFIX_LENGTH + 1)})
+        for prefix in short:
+            self._top[prefix] = self._collect(prefix)
+
+    def search(self, query, limit=10):
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        if limit > TOP_K:
+            ranked = self._collect(prefix, size=limit)[0]
+        else:
+            ranked = self._ranked(prefix)
+        return [dict(self.entries[entry_id]) for entry_id in ranked[:limit]]
+
+
+# ---------------- Manbalar ----------------
+def _district_items():
+    rows = (
+        Application.objects.exclude(district="").order_by()
+        .values("district").annotate(count=Count("id"))
+    )
+    for row in rows.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield normalize(row["district"]), row["district"], row["count"], None
+
+
+def _name_items():
+    rows = Application.objects.order_by().values("full_name").annotate(count=Count("id"))
+    for row in rows.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield normalize(row["full_name"]), row["full_name"], row["count"], None
+
+
+def _taxonomy_items(model):
+    def items():
+        for pk, title in model.objects.order_by().values_list("pk", "title"):
+            yield pk, title, 0, pk
+    return items
+
+
+SOURCES = {
+    "district": _district_items,
+    "category": _taxonomy_items(Category),
+    "subcategory": _taxonomy_items(Subcategory),
+    "name": _name_items,
+}
+
+# Faqat admin/xodimlar uchun (shaxsiy ma'lumot)
+STAFF_ONLY_FIELDS = {"name"}
+
+_indexes = {field: PrefixIndex() for field in SOURCES}
+_stale = set()
+
+
+def _version_key(field):
+    return f"autocomplete:version:{field}"
+
+
+def _delta_key(field, version):
+    return f"autocomplete:delta:{field}:{version}"
+
+
+def _max_age():
+    return getattr(settings, "AUTOCOMPLETE_MAX_AGE", 300)
+
+
+def _bump_version(field):
+    key = _version_key(field)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        if cache.add(key, 1, timeout=None):
+            return 1
+        return cache.incr(key)
+
+
+# ---------------- Qurish (fon thread'i) ----------------
+def rebuild(field):
+    """
+    Indeksni DB'dan yangi nusxaga quradi va almashtiradi. O'qish va saralash
+    qulfsiz: shu vaqt ichida qidiruvlar eski nusxadan javob oladi.
+    """
+    # Versiya DB'dan oldin o'qiladi: oradagi delta ikki marta qo'llanishi mumkin,
+    # lekin yo'qolmaydi; hisoblagichdagi farqni keyingi qayta qurish tuzatadi
+    version = cache.get(_version_key(field), 0)
+    index = PrefixIndex()
+    index.load(SOURCES[field]())
+    index.built_at = time.monotonic()
+    index.version = version
+    with _lock:
+        _indexes[field] = index
+    _stale.discard(field)
+    # Qurish paytida e'lon qilingan deltalar
+    if not sync(field):
+        _stale.add(field)
+
+
+def refresh_stale():
+    """Qurilmagan, eskirgan yoki deltalari uzilgan indekslarni qayta quradi"""
+    for field in SOURCES:
+        index = _indexes[field]
+        if (
+            not index.built_at or field in _stale or not sync(field)
+            or time.monotonic() - index.built_at >= _max_age()
+        ):
+            rebuild(field)
+
+
+def _worker_loop(interval):
+    while True:
+        try:
+            refresh_stale()
+        except Exception:
+            logger.exception("Autocomplete index rebuild failed")
+        finally:
+            close_old_connections()
+        _wake.wait(interval)
+        _wake.clear()
+
+
+def start():
+    """Fon thread'ini ishga tushiradi (WSGI/ASGI yuklanganda va birinchi so'rovda)"""
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _lock:
+        if _worker is not None and _worker.is_alive():
+            return
+        interval = getattr(settings, "AUTOCOMPLETE_SYNC_INTERVAL", 5)
+        _worker = threading.Thread(
+            target=_worker_loop, args=(interval,), name="autocomplete-builder", daemon=True
+        )
+        _worker.start()
+
+
+# ---------------- Deltalar ----------------
+def _apply(index, delta):
+    kind, *args = delta
+    if kind == "counted":
+        old_value, new_value = args
+        if normalize(old_value):
+            index.remove(normalize(old_value), count=1)
+        if normalize(new_value):
+            index.add(normalize(new_value), new_value, count=1)
+    else:
+        pk, title = args
+        index.remove(pk)
+        if title is not None:
+            index.add(pk, title, count=0, pk=pk)
+
+
+def sync(field):
+    """
+    Keshdagi yangi deltalarni indeksga qo'llaydi (DB'siz). Deltalar uzilgan
+    bo'lsa False: indeks fon thread'ida qayta qurilishi kerak.
+    """
+    index = _indexes[field]
+    if not index.built_at:
+        return True
+    latest = cache.get(_version_key(field), 0)
+    if latest == index.version:
+        return True
+    if latest < index.version or latest - index.version > MAX_DELTA_GAP:
+        return False
+    keys = [_delta_key(field, version) for version in range(index.version + 1, latest + 1)]
+    found = cache.get_many(keys)
+    with _lock:
+        current = _indexes[field]
+        for version in range(current.version + 1, latest + 1):
+            delta = found.get(_delta_key(field, version))
+            if delta is None:
+                return False
+            _apply(current, delta)
+            current.version = version
+    return True
+
+
+def _publish(field, delta):
+    """Deltani keshga yozadi va o'zimizdagi indeksga qo'llaydi"""
+    version = _bump_version(field)
+    cache.set(_delta_key(field, version), delta, timeout=DELTA_TTL)
+    if not sync(field):
+        _stale.add(field)
+        _wake.set()
+
+
+def invalidate(*fields):
+    """Ommaviy o'zgarishdan keyin: indekslar (barcha jarayonlarda) fon thread'ida qayta quriladi"""
+    for field in fields:
+        # Deltasiz versiya: boshqa jarayonlar uzilishni ko'rib qayta quradi
+        _bump_version(field)
+        _stale.add(field)
+    _wake.set()
+
+
+def suggest(field, query, limit=10):
+    start()
+    if not sync(field):
+        _stale.add(field)
+        _wake.set()
+    with _lock:
+        return _indexes[field].search(query, limit=limit)
+
+
+def counted_change(field, old_value, new_value):
+    """district/name: eski qiymat -1, yangi qiymat +1"""
+    old_value, new_value = old_value or "", new_value or ""
+    if normalize(old_value) == normalize(new_value):
+        return
+    _publish(field, ("counted", old_value, new_value))
+
+
+def taxonomy_change(field, pk, title=None):
+    """Kategoriya/subkategoriya: `title` None bo'lsa o'chirilgan"""
+    _publish(field, ("taxonomy", pk, title))
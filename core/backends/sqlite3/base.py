@@ -0,0 +1,62 @@
+"""
+SQLite backend'i: "database is locked" xatolarini qayta urinish bilan yumshatadi.
+
+busy_timeout ko'p hollarda yozuvchini kutib turadi, lekin WAL'da ham ba'zi
+holatlarda (masalan checkpoint yoki o'quvchi tranzaksiyani yozuvga
+ko'targanda) SQLite kutmasdan SQLITE_BUSY qaytaradi. Bunday so'rov hech narsa
+o'zgartirmagan bo'ladi, shuning uchun uni ortib boruvchi kutish bilan qayta
+bajarish xavfsiz.
+
+Sozlamalar (DATABASES[...]["OPTIONS"]):
+- lock_retries: qayta urinishlar soni (standart 5)
+- lock_backoff: birinchi kutish, soniya (standart 0.05, har safar 2 barobar)
+"""
+import random
+import time
+
+from django.db.backends.sqlite3 import base
+
+LOCKED_MESSAGES = ("database is locked", "database table is locked")
+
+
+def is_locked_error(error):
+    return any(message in str(error) for message in LOCKED_MESSAGES)
+
+
+class SQLiteCursorWrapper(base.SQLiteCursorWrapper):
+    retries = 5
+    backoff = 0.05
+
+    def _retry(self, method, *args):
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            try:
+                return method(*args)
+            except base.Database.OperationalError as error:
+                if attempt == self.retries or not is_locked_error(error):
+                    raise
+                # Bir vaqtda uyg'ongan oqimlar yana to'qnashmasligi uchun tasodifiy qo'shimcha
+                time.sleep(delay * (1 + random.random()))
+                delay *= 2
+
+    def execute(self, query, params=None):
+        return self._retry(super().execute, query, params)
+
+    def executemany(self, query, param_list):
+        # Generator qayta urinishda tugab qolmasligi uchun ro'yxatga aylantiriladi
+        return self._retry(super().executemany, query, list(param_list))
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        # sqlite3.connect() bu kalitlarni tanimaydi
+        self.lock_retries = kwargs.pop("lock_retries", SQLiteCursorWrapper.retries)
+        self.lock_backoff = kwargs.pop("lock_backoff", SQLiteCursorWrapper.backoff)
+        return kwargs
+
+    def create_cursor(self, name=None):
+        cursor = self.connection.cursor(factory=SQLiteCursorWrapper)
+        cursor.retries = self.lock_retries
+        cursor.backoff = self.lock_backoff
+        return cursor
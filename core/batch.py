@@ -0,0 +1,167 @@
+"""
+Bir nechta GET so'rovni bitta round trip'da bajarish (/api/batch/).
+
+Ichki so'rovlar middleware'siz, to'g'ridan-to'g'ri URL resolver orqali
+chaqiriladi. Asosiy so'rovdagi autentifikatsiya natijasi (JWT bir marta
+tekshiriladi) ichki so'rovlarga DRF'ning force-auth mexanizmi orqali beriladi.
+
+Ichki javoblar qo'ygan cookie'lar (masalan, blog tashrif buyuruvchisi cookie'si)
+tashqi javobga ko'chiriladi; bir xil nomli cookie'da oxirgi so'rovniki qoladi.
+Parallel rejimda worker'lardagi yozuvlar tashqi so'rovga ham belgilanadi, shunda
+ReplicaRoutingMiddleware DB pin cookie'sini odatdagidek qo'yadi.
+"""
+import asyncio
+import copy
+import json
+import logging
+from http.cookies import SimpleCookie
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db import connections
+from django.http import Http404, QueryDict
+from django.urls import Resolver404, resolve
+
+from . import routers
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/"
+
+
+class BatchError(ValueError):
+    pass
+
+
+def parse_batch_paths(payload):
+    """So'rov tanasidan yo'llar ro'yxatini ajratadi va tekshiradi"""
+    items = payload.get("requests") if isinstance(payload, dict) else None
+    if not isinstance(items, list) or not items:
+        raise BatchError("'requests' bo'sh bo'lmagan ro'yxat bo'lishi kerak")
+
+    max_requests = getattr(settings, "BATCH_MAX_REQUESTS", 10)
+    if len(items) > max_requests:
+        raise BatchError(f"Bitta batch'da ko'pi bilan {max_requests} ta so'rov bo'lishi mumkin")
+
+    paths = []
+    for item in items:
+        path = item.get("path") if isinstance(item, dict) else item
+        if not isinstance(path, str) or not path:
+            raise BatchError("Har bir so'rov yo'l (string) yoki {'path': ...} bo'lishi kerak")
+        paths.append(path)
+    return paths
+
+
+def _build_subrequest(request, drf_request, path, query):
+    sub = copy.copy(request)
+    sub.method = "GET"
+    sub.path_info = path
+    sub.path = f"{request.META.get('SCRIPT_NAME', '')}{path}"
+    sub.META = dict(request.META)
+    sub.META.update({
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "CONTENT_LENGTH": "0",
+    })
+    sub.GET = QueryDict(query)
+    sub.POST = QueryDict()
+    sub._body = b""
+
+    user = getattr(drf_request, "user", None)
+    if user is not None and user.is_authenticated:
+        sub._force_auth_user = user
+        sub._force_auth_token = drf_request.auth
+    return sub
+
+
+def _response_body(response):
+    data = getattr(response, "data", None)
+    if data is not None or response.status_code == 204:
+        return data
+    content_type = response.get("Content-Type", "")
+    if not content_type.startswith("application/json"):
+        return None
+    content = response.getvalue() if not response.streaming else b"".join(response.streaming_content)
+    return json.loads(content or b"null")
+
+
+async def _await(coroutine):
+    return await coroutine
+
+
+def dispatch_one(request, drf_request, path, cookies=None):
+    """
+    Bitta ichki GET so'rovni bajaradi va {path, status, body} qaytaradi.
+    Javob cookie'lari berilgan `cookies`ga (SimpleCookie) qo'shiladi.
+    """
+    result = {"path": path}
+    parsed = urlsplit(path)
+    if parsed.scheme or parsed.netloc or not parsed.path.startswith(API_PREFIX):
+        result.update(status=400, body={"error": f"Faqat {API_PREFIX} ichidagi yo'llar ruxsat etiladi"})
+        return result
+
+    try:
+        match = resolve(parsed.path)
+    except Resolver404:
+        result.update(status=404, body={"detail": "Topilmadi"})
+        return result
+
+    if getattr(getattr(match.func, "cls", None), "batch_excluded", False):
+        result.update(status=400, body={"error": "Bu yo'lni batch ichida chaqirib bo'lmaydi"})
+        return result
+
+    sub = _build_subrequest(request, drf_request, parsed.path, parsed.query)
+    sub.resolver_match = match
+    try:
+        # DRF Response render qilinmaydi: ma'lumot allaqachon .data'da
+        response = match.func(sub, *match.args, **match.kwargs)
+        if asyncio.iscoroutine(response):
+            # Async view (core.asyncviews): shu thread'dan natijasini kutamiz
+            response = async_to_sync(_await)(response)
+        result.update(status=response.status_code, body=_response_body(response))
+        if cookies is not None:
+            cookies.update(response.cookies)
+        response.close()
+    except Http404:
+        result.update(status=404, body={"detail": "Topilmadi"})
+    except PermissionDenied:
+        result.update(status=403, body={"detail": "Ruxsat yo'q"})
+    except Exception:
+        logger.exception("Batch sub-request failed: %s", path)
+        result.update(status=500, body={"error": "Ichki xatolik"})
+    return result
+
+
+def _dispatch_in_worker(request, drf_request, path):
+    cookies = SimpleCookie()
+    try:
+        result = dispatch_one(request, drf_request, path, cookies)
+        # Worker konteksti tashqi so'rovnikidan alohida
+        return result, cookies, routers.wrote_to_primary()
+    finally:
+        # Executor thread'i ulanishni keyingi so'rovda qayta ishlatmaydi:
+        # close_old_connections() CONN_MAX_AGE ichida ulanishni ochiq
+        # qoldiradi, shuning uchun bu thread'ning ulanishlari aniq yopiladi
+        connections.close_all()
+
+
+async def _dispatch_concurrently(request, drf_request, paths):
+    worker = sync_to_async(_dispatch_in_worker, thread_sensitive=False)
+    return await asyncio.gather(*(worker(request, drf_request, path) for path in paths))
+
+
+def dispatch_batch(request, drf_request, paths, concurrent=False):
+    """Natijalar ro'yxati va ichki javoblar qo'ygan cookie'lar (SimpleCookie)"""
+    cookies = SimpleCookie()
+    if concurrent and len(paths) > 1 and getattr(settings, "BATCH_ALLOW_CONCURRENT", True):
+        results = []
+        for result, sub_cookies, wrote in async_to_sync(_dispatch_concurrently)(request, drf_request, paths):
+            results.append(result)
+            cookies.update(sub_cookies)
+            if wrote:
+                routers.mark_written()
+        return results, cookies
+    return [dispatch_one(request, drf_request, path, cookies) for path in paths], cookies
@@ -0,0 +1,146 @@
+"""
+Benchmark buyruqlari uchun umumiy yordamchilar.
+
+Buyruqlar katta jadvalni tranzaksiya ichida to'ldiradi, so'rovlarni
+EXPLAIN QUERY PLAN va vaqt o'lchovi bilan tekshiradi, oxirida esa hammasini
+rollback qiladi: haqiqiy ma'lumotlarga ta'sir qilmaydi.
+"""
+import datetime
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+
+class _Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back():
+    """Ichidagi barcha yozuvlar oxirida bekor qilinadi"""
+    try:
+        with transaction.atomic():
+            yield
+            raise _Rollback
+    except _Rollback:
+        pass
+
+
+def bulk_seed(model, make, start, stop, batch_size=2000):
+    """make(i) -> model obyekti; [start, stop) oralig'ini bulk_create bilan yozadi"""
+    for offset in range(start, stop, batch_size):
+        model.objects.bulk_create(
+            [make(i) for i in range(offset, min(offset + batch_size, stop))], batch_size=batch_size
+        )
+
+
+def seed_taxonomy(size=20):
+    """Benchmark uchun (kategoriyalar, subkategoriyalar)"""
+    from .models import Category, Subcategory
+
+    categories = Category.objects.bulk_create(
+        [Category(title=f"Benchmark {i}") for i in range(size)]
+    )
+    subcategories = Subcategory.objects.bulk_create(
+        [Subcategory(title=f"Benchmark {i}", slug=f"benchmark-{i}") for i in range(size)]
+    )
+    return categories, subcategories
+
+
+def application_factory(categories, subcategories):
+    """make(i) -> Application: viloyat, status va vaqt bo'yicha bir tekis taqsimlangan"""
+    from .models import Application, REGION_CHOICES
+
+    regions = [value for value, _ in REGION_CHOICES]
+    statuses = [value for value, _ in Application.STATUS_CHOICES]
+    now = timezone.now()
+
+    def make(i):
+        return Application(
+            full_name=f"Benchmark {i}",
+            phone_number=f"99890{i:07d}",
+            phone_digits=f"99890{i:07d}",
+            birth_date=datetime.date(1990, 1, 1),
+            passport_number=f"AA{i:07d}",
+            passport_normalized=f"AA{i:07d}",
+            region=regions[i % len(regions)],
+            location="benchmark",
+            category=categories[i % len(categories)],
+            subcategory=subcategories[(i // 3) % len(subcategories)],
+            description="benchmark",
+            slug=f"benchmark-{i}",
+            status=statuses[i % len(statuses)],
+            created_date=now - timedelta(minutes=i),
+        )
+    return make
+
+
+def analyze():
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+
+def explain(queryset):
+    """So'rov rejasining qatorlari (SQLite EXPLAIN QUERY PLAN)"""
+    if connection.vendor != "sqlite":
+        return [connection.ops.explain_query_prefix()] + queryset.explain().splitlines()
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def plan_problems(plan):
+    """
+    To'liq jadval skaneri (indekssiz SCAN) va vaqtinchalik B-tree saralashlari.
+    "SCAN t USING INDEX" (indeks bo'yicha tartibda o'qish + LIMIT) muammo emas.
+    """
+    problems = []
+    for line in plan:
+        if line.startswith("SCAN ") and " USING " not in line:
+            problems.append(line)
+        elif "TEMP B-TREE" in line:
+            problems.append(line)
+    return problems
+
+
+def timed(func, repeat=5):
+    """Funksiyani `repeat` marta bajaradi, mediana vaqtni (ms) qaytaradi"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def _fetch(queryset):
+    # .all() - har safar yangi so'rov (queryset keshi ishlatilmaydi)
+    return list(queryset.all())
+
+
+def run_cases(cases, repeat, write):
+    """
+    cases: {nom: queryset yoki (queryset, bajaruvchi)}. Har birining rejasi va
+    vaqtini chiqaradi, muammoli rejalar ro'yxatini qaytaradi.
+    """
+    failures = []
+    for name, case in cases.items():
+        queryset, run = case if isinstance(case, tuple) else (case, _fetch)
+        plan = explain(queryset)
+        elapsed = timed(lambda: run(queryset), repeat=repeat)
+        problems = plan_problems(plan)
+        write(f"  {name:<28} {elapsed:8.2f} ms  {'FAIL' if problems else 'ok'}")
+        for line in plan:
+            write(f"      {line}")
+        failures.extend(f"{name}: {line}" for line in problems)
+    return failures
+
+
+def parse_sizes(value):
+    return sorted({int(size) for size in value.split(",") if size.strip()})
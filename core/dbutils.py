@@ -0,0 +1,24 @@
+"""
+Katta hajmli DB ishlari uchun yordamchilar (rollup, sweeper, rebuild buyruqlari).
+"""
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+# .iterator(chunk_size=...) uchun: Postgres'da server-side cursor shuncha
+# qatordan olib keladi, SQLite'da fetchmany hajmi
+ITERATOR_CHUNK_SIZE = 2000
+
+
+@contextmanager
+def long_running(using=DEFAULT_DB_ALIAS):
+    """
+    Tranzaksiya ochadi; Postgres'da uning ichida statement_timeout o'chiriladi
+    (SET LOCAL - tranzaksiya tugagach pool'dagi ulanish odatiy holiga qaytadi).
+    """
+    with transaction.atomic(using=using):
+        connection = connections[using]
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL statement_timeout = 0")
+        yield
@@ -0,0 +1,89 @@
+"""
+Maxsus model maydonlari.
+
+CodedChoiceField tanlov qiymatlarini ("Qoraqalpog'iston", "Texnik masala")
+har bir qatorda varchar sifatida takrorlamasdan, kichik butun son (kod)
+sifatida saqlaydi. Python, serializer va filtrlar tomonida qiymat avvalgidek
+string bo'lib qoladi: kod faqat bazada.
+
+Kod - choices ro'yxatidagi o'rin + 1. Shuning uchun yangi tanlovlar faqat
+ro'yxat oxiriga qo'shiladi, mavjudlarining tartibi o'zgartirilmaydi.
+"""
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.models import Lookup
+
+
+class CodedChoiceField(models.PositiveSmallIntegerField):
+    """
+    Ustun turi PositiveSmallIntegerField (django-filter va boshqa kutubxonalar
+    uni shunday taniydi), qiymat esa Python tomonida string.
+    """
+    description = "Kichik butun son sifatida saqlanadigan tanlov"
+
+    def __init__(self, *args, **kwargs):
+        if not kwargs.get("choices"):
+            raise TypeError("CodedChoiceField uchun choices majburiy")
+        super().__init__(*args, **kwargs)
+        self._codes = {value: code for code, (value, _) in enumerate(self.flatchoices, start=1)}
+        self._values = {code: value for value, code in self._codes.items()}
+
+    @property
+    def validators(self):
+        # IntegerField'ning min/max validatorlari string qiymatga mos emas
+        return [*self.default_validators, *self._validators]
+
+    def code_for(self, value):
+        return self._codes.get(value)
+
+    def codes_matching(self, text):
+        """Qiymati yoki nomi `text`ni o'z ichiga olgan kodlar (icontains uchun)"""
+        text = str(text).casefold()
+        return [
+            self._codes[value] for value, label in self.flatchoices
+            if text in str(value).casefold() or text in str(label).casefold()
+        ]
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return self._values.get(value, value)
+
+    def to_python(self, value):
+        if isinstance(value, int) and value in self._values:
+            return self._values[value]
+        return value
+
+    def formfield(self, **kwargs):
+        return models.Field.formfield(self, **kwargs)
+
+    def get_prep_value(self, value):
+        value = models.Field.get_prep_value(self, value)
+        if value is None or isinstance(value, int):
+            return value
+        # Noma'lum qiymat jim 0 ga aylantirilmaydi: filtrda ham, saqlashda ham
+        # xato. Foydalanuvchi kiritgan qiymatlar view'da oldindan tekshiriladi.
+        if value not in self._codes:
+            raise ValidationError(f"{self.name}: noma'lum qiymat {value!r}")
+        return self._codes[value]
+
+    def value_to_string(self, obj):
+        return self.value_from_object(obj)
+
+
+@CodedChoiceField.register_lookup
+class CodedIContains(Lookup):
+    """
+    `field__icontains="tosh"` -> `field IN (kodlar)`: admin search_fields va
+    shu kabi matnli qidiruvlar kodlangan ustunda ham ishlaydi.
+    """
+    lookup_name = "icontains"
+    prepare_rhs = False
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        codes = self.lhs.output_field.codes_matching(self.rhs)
+        if not codes:
+            return "1 = 0", []
+        placeholders = ", ".join(["%s"] * len(codes))
+        return f"{lhs} IN ({placeholders})", [*lhs_params, *codes]
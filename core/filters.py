@@ -0,0 +1,32 @@
+"""
+django-filter FilterSet'lari.
+
+Sana oralig'i filtrlari `created_date__date` o'rniga kun chegaralari bilan
+solishtiradi: ustunga funksiya qo'llanmagani uchun indeks ishlatiladi.
+"""
+from datetime import datetime, time, timedelta
+
+import django_filters
+from django.utils import timezone
+
+from .models import Blog, REGION_CHOICES
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class BlogFilter(django_filters.FilterSet):
+    region = django_filters.ChoiceFilter(choices=REGION_CHOICES)
+    date_from = django_filters.DateFilter(method="filter_date_from", label="Sanadan (YYYY-MM-DD)")
+    date_to = django_filters.DateFilter(method="filter_date_to", label="Sanagacha (YYYY-MM-DD, shu kun ham)")
+
+    class Meta:
+        model = Blog
+        fields = ["region", "date_from", "date_to"]
+
+    def filter_date_from(self, queryset, name, value):
+        return queryset.filter(created_date__gte=_start_of_day(value))
+
+    def filter_date_to(self, queryset, name, value):
+        return queryset.filter(created_date__lt=_start_of_day(value + timedelta(days=1)))
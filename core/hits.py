@@ -0,0 +1,357 @@
+"""
+Blog ko'rishlarini buferlab hisoblash.
+
+Har bir ko'rishda hitcount'ning Hit qatori va HitCount UPDATE'ini yozish
+o'rniga ko'rishlar BLOG_VIEW_CACHE ("hits") keshidagi blog hisoblagichlarida
+yig'iladi. Bir xil tashrif buyuruvchi oyna ichida faqat bir marta sanaladi;
+bu tekshiruv ham o'sha keshda. Redis ulansa (HITS_CACHE_URL) ikkalasi barcha
+worker'lar uchun umumiy, LocMem'da esa har jarayon uchun alohida (settings). Anonim o'quvchilar DB sessiyasi o'rniga imzolangan cookie
+(yoki cookie qabul qilmaydiganlar uchun IP + User-Agent fingerprint'i) orqali
+aniqlanadi, shuning uchun ko'rish django_session'ga yozmaydi.
+
+Fon thread'i har BLOG_VIEW_FLUSH_INTERVAL soniyada hisoblagichlarni bitta
+tranzaksiyada, bitta UPDATE ... CASE bilan HitCount'ga yozadi; keshdagi qulf
+tufayli bir vaqtda faqat bitta worker flush qiladi. O'qishda saqlangan son va
+hali yozilmagan delta qo'shib qaytariladi.
+
+Ko'rishlar tarixi BlogViewDaily'da saqlanadi: flush bugungi kunga qo'shadi.
+Hit qatorlari endi yozilmaydi; oldin yozilganlarini `compact_hits`
+(rollup_blog_hits buyrug'i) bir marta kunlik yig'indiga aylantiradi.
+"""
+import atexit
+import hashlib
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+from django.db import close_old_connections, transaction
+from django.db.models import Case, Count, F, IntegerField, Value, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from hitcount.models import BlacklistIP, BlacklistUserAgent, Hit, HitCount
+from hitcount.utils import get_ip
+
+from . import leaderboard
+from .models import Blog, BlogViewDaily
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_flusher = None
+
+VISITOR_COOKIE_SALT = "core.hits.visitor"
+FLUSH_LOCK_KEY = "blogview:flush-lock"
+PENDING_CHUNK_SIZE = 500
+
+
+def _cache():
+    return caches[getattr(settings, "BLOG_VIEW_CACHE", "default")]
+
+
+def _pending_key(blog_id):
+    return f"blogview:pending:{blog_id}"
+
+
+def _add_pending(counts):
+    """{blog_id: n} ni keshdagi hisoblagichlarga atomar qo'shadi"""
+    cache = _cache()
+    for blog_id, count in counts.items():
+        key = _pending_key(blog_id)
+        try:
+            cache.incr(key, count)
+        except ValueError:
+            # Kalit hali yo'q; parallel so'rov birinchi yaratsa incr qilamiz
+            if not cache.add(key, count, timeout=None):
+                cache.incr(key, count)
+
+
+def _take_pending():
+    """
+    Flush qilinmagan ko'rishlarni {blog_id: n} qilib oladi. Hisoblagichlar
+    o'chirilmaydi, olingan son ayiriladi: shu orada qo'shilgan ko'rishlar
+    keyingi flush'ga qoladi.
+    """
+    cache = _cache()
+    blog_ids = list(Blog.objects.order_by("pk").values_list("pk", flat=True))
+    batch = {}
+    for start in range(0, len(blog_ids), PENDING_CHUNK_SIZE):
+        keys = {_pending_key(pk): pk for pk in blog_ids[start:start + PENDING_CHUNK_SIZE]}
+        for key, count in cache.get_many(list(keys)).items():
+            if count:
+                cache.decr(key, count)
+                batch[keys[key]] = count
+    return batch
+
+
+def _dedup_window():
+    window = getattr(settings, "BLOG_VIEW_DEDUP_WINDOW", None)
+    if window is None:
+        grace = getattr(settings, "HITCOUNT_KEEP_HIT_ACTIVE", {"days": 7})
+        window = timedelta(**grace).total_seconds()
+    return int(window)
+
+
+def _visitor_cookie_name():
+    return getattr(settings, "BLOG_VIEW_COOKIE_NAME", "blog_visitor")
+
+
+def _fingerprint(request):
+    """Cookie'siz mijozlar (botlar) uchun IP + User-Agent'dan barqaror identifikator"""
+    raw = f"{get_ip(request)}|{request.headers.get('User-Agent', '')[:255]}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def anonymous_visitor_id(request):
+    """
+    Anonim tashrif buyuruvchi identifikatori: imzolangan cookie'dan, u bo'lmasa
+    fingerprint'dan. Natija so'rovda saqlanadi (set_visitor_cookie uchun).
+    """
+    visitor_id = getattr(request, "_blog_visitor_id", None)
+    if visitor_id is None:
+        visitor_id = request.get_signed_cookie(_visitor_cookie_name(), default=None, salt=VISITOR_COOKIE_SALT)
+        request._blog_visitor_cookie_valid = visitor_id is not None
+        request._blog_visitor_id = visitor_id = visitor_id or _fingerprint(request)
+    return visitor_id
+
+
+def visitor_key(request):
+    """Tashrif buyuruvchini aniqlovchi kalit (anonimlar uchun sessiyaga tegmaydi)"""
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return f"u:{user.pk}"
+    return f"a:{anonymous_visitor_id(request)}"
+
+
+def set_visitor_cookie(request, response):
+    """Anonim tashrif buyuruvchiga imzolangan cookie beradi (hali bo'lmasa)"""
+    if getattr(request, "_blog_visitor_cookie_valid", True):
+        return response
+    response.set_signed_cookie(
+        _visitor_cookie_name(),
+        anonymous_visitor_id(request),
+        salt=VISITOR_COOKIE_SALT,
+        max_age=getattr(settings, "BLOG_VIEW_COOKIE_MAX_AGE", 365 * 24 * 60 * 60),
+        secure=settings.SESSION_COOKIE_SECURE,
+        httponly=True,
+        samesite=settings.SESSION_COOKIE_SAMESITE,
+    )
+    return response
+
+
+def _is_blacklisted(request):
+    user_agent = request.headers.get("User-Agent", "")[:255]
+    return (
+        BlacklistIP.objects.filter(ip__exact=get_ip(request)).exists()
+        or BlacklistUserAgent.objects.filter(user_agent__exact=user_agent).exists()
+    )
+
+
+def record_view(request, blog):
+    """Ko'rishni buferga qo'shadi. Sanalgan bo'lsa True qaytaradi."""
+    key = f"blogview:{blog.pk}:{visitor_key(request)}"
+    if not _cache().add(key, 1, timeout=_dedup_window()):
+        return False
+    # Qora ro'yxat faqat yangi (takrorlanmagan) ko'rishlar uchun tekshiriladi
+    if _is_blacklisted(request):
+        return False
+
+    _add_pending({blog.pk: 1})
+    _ensure_flusher()
+    return True
+
+
+def pending_views(blog_id):
+    return _cache().get(_pending_key(blog_id), 0)
+
+
+def get_view_count(blog):
+    """Saqlangan son + hali flush qilinmagan ko'rishlar"""
+    counts = list(blog.hit_count_generic.all())
+    persisted = counts[0].hits if counts else 0
+    return persisted + pending_views(blog.pk)
+
+
+def _apply(batch):
+    ctype = ContentType.objects.get_for_model(Blog)
+    blog_ids = list(batch)
+    now = timezone.now()
+
+    with transaction.atomic():
+        existing = set(
+            HitCount.objects.filter(content_type=ctype, object_pk__in=blog_ids)
+            .order_by().values_list("object_pk", flat=True)
+        )
+        missing = [pk for pk in blog_ids if pk not in existing]
+        if missing:
+            # O'chirilgan bloglar uchun HitCount yaratmaymiz
+            alive = set(Blog.objects.filter(pk__in=missing).order_by().values_list("pk", flat=True))
+            HitCount.objects.bulk_create(
+                [HitCount(content_type=ctype, object_pk=pk) for pk in missing if pk in alive],
+                ignore_conflicts=True,
+            )
+
+        HitCount.objects.filter(content_type=ctype, object_pk__in=blog_ids).update(
+            hits=F("hits") + Case(
+                *[When(object_pk=pk, then=Value(count)) for pk, count in batch.items()],
+                default=Value(0),
+                output_field=IntegerField(),
+            ),
+            modified=now,
+        )
+        add_daily_views({(pk, timezone.localdate(now)): count for pk, count in batch.items()})
+
+
+def flush():
+    """Keshdagi ko'rishlarni bazaga yozadi va yozilgan sonni qaytaradi"""
+    cache = _cache()
+    interval = getattr(settings, "BLOG_VIEW_FLUSH_INTERVAL", 10)
+    # Qulf egasi o'lib qolsa ham timeout'dan keyin boshqa worker flush qiladi
+    if not cache.add(FLUSH_LOCK_KEY, 1, timeout=max(interval * 6, 60)):
+        return 0
+    try:
+        batch = _take_pending()
+        if not batch:
+            return 0
+        try:
+            _apply(batch)
+        except Exception:
+            # Yo'qolmasligi uchun hisoblagichlarga qaytaramiz, keyingi intervalda qayta urinadi
+            _add_pending(batch)
+            raise
+    finally:
+        cache.delete(FLUSH_LOCK_KEY)
+
+    try:
+        leaderboard.refresh(batch)
+    except Exception:
+        logger.exception("Blog leaderboard refresh failed")
+    return sum(batch.values())
+
+
+def add_daily_views(counts):
+    """{(blog_id, kun): n} ni BlogViewDaily'ga qo'shadi (har kun uchun bitta UPDATE)"""
+    by_day = {}
+    for (blog_id, day), count in counts.items():
+        if count:
+            by_day.setdefault(day, {})[blog_id] = count
+
+    for day, blogs in by_day.items():
+        existing = set(
+            BlogViewDaily.objects.filter(day=day, blog_id__in=list(blogs))
+            .order_by().values_list("blog_id", flat=True)
+        )
+        if existing:
+            BlogViewDaily.objects.filter(day=day, blog_id__in=existing).update(
+                views=F("views") + Case(
+                    *[When(blog_id=pk, then=Value(blogs[pk])) for pk in existing],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+            )
+        missing = [pk for pk in blogs if pk not in existing]
+        if missing:
+            alive = set(Blog.objects.filter(pk__in=missing).order_by().values_list("pk", flat=True))
+            BlogViewDaily.objects.bulk_create(
+                [BlogViewDaily(blog_id=pk, day=day, views=blogs[pk]) for pk in missing if pk in alive]
+            )
+
+
+def compact_hits(batch_size=5000):
+    """
+    Eski ma'lumotni bir martalik tozalash. Ko'rishlar buferga o'tgandan beri yangi Hit
+    qatorlari yozilmaydi; bu funksiya undan oldin hitcount yozgan blog
+    Hit'larini BlogViewDaily'ga qo'shib, o'zlarini partiyalab o'chiradi.
+    Takroriy tekshiruv keshda bo'lgani uchun hamma Hit'lar siqiladi.
+    HitCount jami o'zgarmaydi, Hit'lar qolmagan bo'lsa hech narsa qilmaydi.
+    Qaytaradi: (siqilgan Hit'lar soni, partiyalar soni).
+    """
+    ctype = ContentType.objects.get_for_model(Blog)
+    base = Hit.objects.filter(hitcount__content_type=ctype)
+
+    total = batches = 0
+    while True:
+        with transaction.atomic():
+            ids = list(base.order_by("pk").values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                break
+            rows = (
+                Hit.objects.filter(pk__in=ids).order_by()
+                .annotate(day=TruncDate("created"))
+                .values("hitcount__object_pk", "day")
+                .annotate(count=Count("id"))
+            )
+            add_daily_views({
+                (row["hitcount__object_pk"], row["day"]): row["count"] for row in rows
+            })
+            # queryset.delete() HitCount.hits'ni kamaytirmaydi (Hit.delete() dan farqli)
+            Hit.objects.filter(pk__in=ids).delete()
+        total += len(ids)
+        batches += 1
+    return total, batches
+
+
+def view_history(blog, days=30):
+    """Oxirgi `days` kunlik ko'rishlar: [{"day": ..., "views": ...}]"""
+    today = timezone.localdate()
+    since = today - timedelta(days=days - 1)
+    history = Counter(dict(
+        BlogViewDaily.objects.filter(blog=blog, day__gte=since).values_list("day", "views")
+    ))
+
+    history[today] += pending_views(blog.pk)
+
+    return [
+        {"day": since + timedelta(days=offset), "views": history.get(since + timedelta(days=offset), 0)}
+        for offset in range(days)
+    ]
+
+
+def run_periodic():
+    """
+    Fon thread'ining bitta qadami: ko'rishlarni yozadi va kun almashgan bo'lsa
+    reytingning 7d/30d oynalarini qayta hisoblaydi (o'qish yo'lida emas).
+    """
+    try:
+        flush()
+    except Exception:
+        logger.exception("Blog view flush failed")
+    try:
+        leaderboard.ensure_fresh()
+    except Exception:
+        logger.exception("Blog leaderboard refresh failed")
+
+
+def _flush_loop(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            run_periodic()
+        finally:
+            close_old_connections()
+
+
+def _ensure_flusher():
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    with _lock:
+        if _flusher is not None and _flusher.is_alive():
+            return
+        interval = getattr(settings, "BLOG_VIEW_FLUSH_INTERVAL", 10)
+        _flusher = threading.Thread(
+            target=_flush_loop, args=(interval,), name="blog-view-flusher", daemon=True
+        )
+        _flusher.start()
+
+
+@atexit.register
+def _flush_on_exit():
+    try:
+        flush()
+    except Exception:
+        logger.exception("Blog view flush on exit failed")
@@ -0,0 +1,218 @@
+"""
+POST so'rovlari uchun `Idempotency-Key`.
+
+Yomon aloqadagi mobil klientlar ariza / contact xabarini qayta yuboradi; har
+bir takror slug qidiruvi, imgbb yuklashlari va Telegram xabarini qaytadan
+bajarib, dublikat yaratadi. Klient sarlavhada kalit yuborsa:
+
+- birinchi so'rov kalitni "processing" holatida band qiladi (`begin`), view
+  bajariladi va 2xx javob bazaga yoziladi (`complete`);
+- shu kalit bilan keyingi so'rovlar saqlangan javobni oladi (view qayta
+  bajarilmaydi, javobda `Idempotent-Replayed: true`);
+- birinchisi hali bajarilayotgan bo'lsa, takror so'rov kutmasdan 409 va
+  `Retry-After: IDEMPOTENCY_RETRY_AFTER` oladi (worker band qilinmaydi);
+- view xato bilan tugasa kalit bo'shatiladi (`abort`), klient qayta urinishi mumkin;
+- boshqa mazmundagi so'rovda qayta ishlatilgan kalit 422 qaytaradi.
+
+Yozuvlar IDEMPOTENCY_KEY_TTL soniya saqlanadi (`prune_idempotency_keys`).
+"""
+import functools
+import hashlib
+import json
+from datetime import timedelta
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = IdempotencyKey._meta.get_field("key").max_length
+
+PROCESSING = "processing"
+COMPLETED = "completed"
+
+
+class IdempotencyError(Exception):
+    def __init__(self, message, status, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+    def response(self):
+        headers = {"Retry-After": str(self.retry_after)} if self.retry_after is not None else None
+        return Response({"error": str(self)}, status=self.status, headers=headers)
+
+
+def _ttl():
+    return getattr(settings, "IDEMPOTENCY_KEY_TTL", 24 * 3600)
+
+
+def _retry_after():
+    return getattr(settings, "IDEMPOTENCY_RETRY_AFTER", 1)
+
+
+def _processing_timeout():
+    return getattr(settings, "IDEMPOTENCY_PROCESSING_TIMEOUT", 300)
+
+
+def fingerprint(request):
+    """Metod, yo'l, foydalanuvchi, maydonlar va fayllar (nomi, hajmi) xeshi"""
+    data = request.data
+    if hasattr(data, "lists"):
+        # multipart/form: fayllar data'ga ham tushadi, ular `files`da alohida hisoblanadi
+        data = sorted((name, values) for name, values in data.lists() if name not in request.FILES)
+    files = sorted(
+        (name, upload.name, upload.size)
+        for name, uploads in request.FILES.lists()
+        for upload in uploads
+    )
+    payload = {
+        "method": request.method,
+        "path": request.path,
+        "user": request.user.pk if request.user.is_authenticated else None,
+        "data": data,
+        "files": files,
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _abandoned(record, now):
+    if record.expires_date <= now:
+        return True
+    return record.state == PROCESSING and record.created_date < now - timedelta(seconds=_processing_timeout())
+
+
+def begin(scope, key, request_fingerprint):
+    """
+    Kalitni band qiladi. Qaytaradi: yangi "processing" yozuv (view bajarilsin)
+    yoki "completed" yozuv (saqlangan javob qaytarilsin). Xato: IdempotencyError
+    (boshqa so'rov hali bajarilayotgan bo'lsa - darhol 409).
+    """
+    while True:
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                return IdempotencyKey.objects.create(
+                    scope=scope, key=key, fingerprint=request_fingerprint,
+                    expires_date=now + timedelta(seconds=_ttl()),
+                )
+        except IntegrityError:
+            pass
+
+        record = IdempotencyKey.objects.filter(scope=scope, key=key).first()
+        if record is None:
+            # Orada o'chirildi (abort yoki muddati o'tgan)
+            continue
+        if _abandoned(record, now):
+            # Muddati o'tgan yoki bajaruvchisi to'xtab qolgan: shartli o'chirib qayta band qilamiz
+            IdempotencyKey.objects.filter(pk=record.pk, state=record.state).delete()
+            continue
+        if record.fingerprint != request_fingerprint:
+            raise IdempotencyError(f"{HEADER} boshqa so'rov uchun ishlatilgan", status=422)
+        if record.state == COMPLETED:
+            return record
+        # Kutib turish worker'ni (yoki thread pool'ni) band qiladi: klient o'zi qayta urinadi
+        raise IdempotencyError(
+            "Shu kalitli so'rov hali bajarilmoqda, keyinroq qayta urinib ko'ring",
+            status=409, retry_after=_retry_after(),
+        )
+
+
+def complete(record, response):
+    """View javobini saqlaydi: keyingi takrorlar shu javobni oladi"""
+    IdempotencyKey.objects.filter(pk=record.pk).update(
+        state=COMPLETED, response_status=response.status_code, response_body=response.data,
+    )
+
+
+def abort(record):
+    """Kalitni bo'shatadi (view xato bilan tugadi): klient qayta urinishi mumkin"""
+    IdempotencyKey.objects.filter(pk=record.pk, state=PROCESSING).delete()
+
+
+def replay(record):
+    return Response(record.response_body, status=record.response_status, headers={REPLAYED_HEADER: "true"})
+
+
+def _key_error(key):
+    if len(key) > MAX_KEY_LENGTH:
+        return Response({"error": f"{HEADER} ko'pi bilan {MAX_KEY_LENGTH} belgi"}, status=400)
+    return None
+
+
+def _settle(record, response):
+    """Faqat 2xx javob saqlanadi, qolganida kalit bo'shatiladi"""
+    if 200 <= response.status_code < 300:
+        complete(record, response)
+    else:
+        abort(record)
+
+
+def idempotent(scope):
+    """
+    ViewSet metodi uchun dekorator (sync va async metodlar). Sarlavha bo'lmasa
+    view odatdagidek bajariladi; faqat 2xx javoblar saqlanadi.
+    """
+    def decorator(method):
+        if iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def async_wrapper(self, request, *args, **kwargs):
+                key = request.headers.get(HEADER)
+                if not key:
+                    return await method(self, request, *args, **kwargs)
+                error = _key_error(key)
+                if error is not None:
+                    return error
+
+                try:
+                    record = await sync_to_async(begin)(scope, key, fingerprint(request))
+                except IdempotencyError as e:
+                    return e.response()
+                if record.state == COMPLETED:
+                    return replay(record)
+
+                try:
+                    response = await method(self, request, *args, **kwargs)
+                except BaseException:
+                    await sync_to_async(abort)(record)
+                    raise
+                await sync_to_async(_settle)(record, response)
+                return response
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            key = request.headers.get(HEADER)
+            if not key:
+                return method(self, request, *args, **kwargs)
+            error = _key_error(key)
+            if error is not None:
+                return error
+
+            try:
+                record = begin(scope, key, fingerprint(request))
+            except IdempotencyError as e:
+                return e.response()
+            if record.state == COMPLETED:
+                return replay(record)
+
+            try:
+                response = method(self, request, *args, **kwargs)
+            except BaseException:
+                abort(record)
+                raise
+            _settle(record, response)
+            return response
+        return wrapper
+    return decorator
+
+
+def prune_expired():
+    deleted, _ = IdempotencyKey.objects.filter(expires_date__lt=timezone.now()).delete()
+    return deleted
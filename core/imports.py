@@ -0,0 +1,317 @@
+"""
+Arizalarni CSV / NDJSON fayldan ommaviy import qilish.
+
+Hududiy bo'limlar oflayn yig'gan arizalar fayl oqim sifatida o'qiladi (butun
+fayl xotiraga yuklanmaydi): har bir qator kategoriya/subkategoriya xaritasi
+(import boshida bir marta yuklanadi) bo'yicha tekshiriladi, to'g'ri qatorlar
+`chunk_size` tadan yig'ilib slug'lari bir so'rovda ajratiladi va `bulk_create`
+bilan yoziladi. Noto'g'ri qatorlar importni to'xtatmaydi: ular qator raqami
+bilan hisobotga tushadi.
+
+`bulk_create` signal yubormaydi, shuning uchun statistika hisoblagichlari va
+rollup'lar har bir partiya uchun shu yerda, bitta tranzaksiyada yangilanadi.
+Import qilingan arizalar `create` orqali kelganlari kabi "pending" holatida.
+"""
+import csv
+import json
+from collections import Counter
+from datetime import datetime
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from . import autocomplete, stats
+from .lookups import prefix_range
+from .models import (
+    Application, ArchivedApplication, Category, REGION_CHOICES, Subcategory,
+    application_slug_base, normalize_passport, normalize_phone,
+)
+
+FORMATS = ("csv", "ndjson")
+FIELDS = (
+    "full_name", "phone_number", "birth_date", "passport_number", "region",
+    "district", "location", "category", "subcategory", "description",
+)
+DATE_FORMATS = ("%Y-%m-%d", "%d.%m.%Y")
+TEXT_FIELDS = [field for field in FIELDS if field not in ("birth_date", "region", "category", "subcategory")]
+
+# Bitta so'rovdagi slug prefikslari (SQLite ifoda chuqurligi chegarasi)
+SLUG_LOOKUP_BATCH = 100
+
+_REGIONS = {autocomplete.normalize(value): value for value, _ in REGION_CHOICES}
+
+
+class ImportFormatError(ValueError):
+    """Fayl umuman o'qib bo'lmaydi (format, sarlavha yoki kodlash xatosi)"""
+
+
+def _chunk_size():
+    return getattr(settings, "APPLICATION_IMPORT_CHUNK_SIZE", 1000)
+
+
+def _max_errors():
+    return getattr(settings, "APPLICATION_IMPORT_MAX_ERRORS", 1000)
+
+
+def detect_format(name, fmt=None):
+    """Aniq berilgan format yoki fayl kengaytmasi (.csv, .ndjson / .jsonl)"""
+    if fmt:
+        if fmt not in FORMATS:
+            raise ImportFormatError(f"Noma'lum format: {fmt}")
+        return fmt
+    name = (name or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    raise ImportFormatError("Formatni aniqlab bo'lmadi: csv yoki ndjson ko'rsating")
+
+
+def read_rows(stream, fmt):
+    """
+    Matnli oqimdan (qator raqami, dict yoki None, xato yoki None) juftliklarini
+    birma-bir qaytaradi.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        missing = [field for field in FIELDS if field not in (reader.fieldnames or [])]
+        if missing:
+            raise ImportFormatError(f"CSV sarlavhasida ustunlar yo'q: {', '.join(missing)}")
+        for row in reader:
+            yield reader.line_num, row, None
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_number, None, {"non_field_errors": "JSON noto'g'ri"}
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, {"non_field_errors": "JSON obyekt kutilgan"}
+            continue
+        yield line_number, row, None
+
+
+class Taxonomy:
+    """Kategoriya/subkategoriya: id yoki nom bo'yicha qidiruv va ruxsat etilgan juftliklar"""
+
+    def __init__(self):
+        self.categories = self._index(Category.objects.order_by().values_list("pk", "title"))
+        self.subcategories = self._index(Subcategory.objects.order_by().values_list("pk", "title"))
+        self.pairs = set(
+            Category.subcategories.through.objects.values_list("category_id", "subcategory_id")
+        )
+
+    @staticmethod
+    def _index(rows):
+        index = {}
+        for pk, title in rows:
+            index[str(pk)] = pk
+            index.setdefault(autocomplete.normalize(title), pk)
+        return index
+
+    @staticmethod
+    def resolve(index, value):
+        return index.get(value) if value.isdigit() else index.get(autocomplete.normalize(value))
+
+
+def _text(row, field):
+    value = row.get(field)
+    return "" if value is None else str(value).strip()
+
+
+def _parse_date(value):
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def validate_row(row, taxonomy):
+    """Qaytaradi: (Application yoki None, {maydon: xato})"""
+    values = {field: _text(row, field) for field in FIELDS}
+    errors = {field: "Majburiy maydon" for field, value in values.items() if not value}
+
+    for field in TEXT_FIELDS:
+        max_length = Application._meta.get_field(field).max_length
+        if max_length and len(values[field]) > max_length:
+            errors[field] = f"Ko'pi bilan {max_length} belgi"
+
+    birth_date = _parse_date(values["birth_date"]) if values["birth_date"] else None
+    if values["birth_date"] and birth_date is None:
+        errors["birth_date"] = "Sana YYYY-MM-DD yoki DD.MM.YYYY ko'rinishida bo'lishi kerak"
+
+    region = _REGIONS.get(autocomplete.normalize(values["region"]))
+    if values["region"] and region is None:
+        errors["region"] = f"Noma'lum viloyat: {values['region']}"
+
+    category_id = taxonomy.resolve(taxonomy.categories, values["category"]) if values["category"] else None
+    if values["category"] and category_id is None:
+        errors["category"] = f"Kategoriya topilmadi: {values['category']}"
+    subcategory_id = taxonomy.resolve(taxonomy.subcategories, values["subcategory"]) if values["subcategory"] else None
+    if values["subcategory"] and subcategory_id is None:
+        errors["subcategory"] = f"Subkategoriya topilmadi: {values['subcategory']}"
+    if category_id and subcategory_id and (category_id, subcategory_id) not in taxonomy.pairs:
+        errors["subcategory"] = (
+            f"Subkategoriya '{values['subcategory']}' '{values['category']}' kategoriyasiga tegishli emas."
+        )
+
+    if errors:
+        return None, errors
+    return Application(
+        full_name=values["full_name"],
+        phone_number=values["phone_number"],
+        phone_digits=normalize_phone(values["phone_number"]),
+        birth_date=birth_date,
+        passport_number=values["passport_number"],
+        passport_normalized=normalize_passport(values["passport_number"]),
+        region=region,
+        district=values["district"],
+        location=values["location"],
+        category_id=category_id,
+        subcategory_id=subcategory_id,
+        description=values["description"],
+        status="pending",
+    ), {}
+
+
+class SlugAllocator:
+    """
+    Application.save() bilan bir xil shakldagi slug'lar (ism, ism-1, ism-2, ...)
+    ni partiya uchun bir so'rovda ajratadi: har bir asos uchun band qilingan eng
+    katta qo'shimcha xotirada saqlanadi. Arxivdagi slug'lar ham band hisoblanadi.
+    """
+
+    def __init__(self):
+        self._next = {}  # asos -> keyingi bo'sh qo'shimcha (0 - asosning o'zi bo'sh)
+
+    def _load(self, bases):
+        for offset in range(0, len(bases), SLUG_LOOKUP_BATCH):
+            batch = bases[offset:offset + SLUG_LOOKUP_BATCH]
+            q = Q()
+            for base in batch:
+                q |= Q(slug=base) | prefix_range("slug", f"{base}-")
+            existing = [
+                slug
+                for model in (Application, ArchivedApplication)
+                for slug in model.objects.filter(q).order_by().values_list("slug", flat=True)
+            ]
+
+            taken = {base: -1 for base in batch}
+            for slug in existing:
+                if slug in taken:
+                    taken[slug] = max(taken[slug], 0)
+                    continue
+                base, _, suffix = slug.rpartition("-")
+                if base in taken and suffix.isdigit():
+                    taken[base] = max(taken[base], int(suffix))
+            for base, last in taken.items():
+                self._next[base] = last + 1
+
+    @staticmethod
+    def _base(application):
+        return application_slug_base(application.full_name)
+
+    def assign(self, applications):
+        bases = [self._base(application) for application in applications]
+        self._load([base for base in dict.fromkeys(bases) if base not in self._next])
+        for application, base in zip(applications, bases):
+            suffix = self._next[base]
+            application.slug = f"{base}-{suffix}" if suffix else base
+            self._next[base] = suffix + 1
+
+    def forget(self, applications):
+        for application in applications:
+            self._next.pop(self._base(application), None)
+
+
+def _count(applications):
+    counter_deltas = Counter()
+    rollup_deltas = Counter()
+    for application in applications:
+        counter_deltas.update(stats.application_deltas(application.status, 1))
+        rollup_deltas[stats.application_rollup_key(application)] += 1
+    stats.apply_deltas(counter_deltas)
+    stats.apply_rollup_deltas_bulk(rollup_deltas)
+
+
+def _insert_chunk(chunk, allocator, report):
+    """chunk: [(qator raqami, Application)]"""
+    applications = [application for _, application in chunk]
+    allocator.assign(applications)
+    try:
+        with transaction.atomic():
+            Application.objects.bulk_create(applications)
+            _count(applications)
+        report["created"] += len(applications)
+        return
+    except IntegrityError:
+        # Parallel yaratilgan ariza slug'ni band qilgan yoki bog'langan yozuv
+        # o'chirilgan: partiya qatorma-qator, odatiy save() orqali yoziladi
+        allocator.forget(applications)
+
+    for line, application in chunk:
+        application.pk = None
+        application.slug = ""
+        try:
+            with transaction.atomic():
+                application.save()
+        except (IntegrityError, ValidationError) as e:
+            _add_error(report, line, {"non_field_errors": str(e)})
+        else:
+            report["created"] += 1
+
+
+def _add_error(report, line, errors):
+    report["failed"] += 1
+    if len(report["errors"]) < _max_errors():
+        report["errors"].append({"line": line, "errors": errors})
+    else:
+        report["errors_truncated"] = True
+
+
+def import_applications(stream, fmt, chunk_size=None, dry_run=False):
+    """
+    stream: matnli oqim (CSV uchun newline="" bilan ochilgan). Qaytaradi:
+    {"total", "created", "failed", "errors": [{"line", "errors"}], "errors_truncated", "dry_run"}.
+    Yozilgan partiyalar keyingi partiyadagi xatoda bekor qilinmaydi.
+    """
+    chunk_size = chunk_size or _chunk_size()
+    taxonomy = Taxonomy()
+    allocator = SlugAllocator()
+    report = {"total": 0, "created": 0, "failed": 0, "errors": [], "errors_truncated": False, "dry_run": dry_run}
+
+    chunk = []
+    try:
+        for line, row, errors in read_rows(stream, fmt):
+            report["total"] += 1
+            application = None
+            if row is not None:
+                application, errors = validate_row(row, taxonomy)
+            if application is None:
+                _add_error(report, line, errors)
+                continue
+            if dry_run:
+                continue
+            chunk.append((line, application))
+            if len(chunk) >= chunk_size:
+                _insert_chunk(chunk, allocator, report)
+                chunk = []
+        if chunk:
+            _insert_chunk(chunk, allocator, report)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ImportFormatError(
+            f"Faylni o'qib bo'lmadi ({report['created']} ta ariza yozib bo'lingan): {e}"
+        ) from e
+    finally:
+        if report["created"]:
+            # Ism/tuman takliflari signal'siz qo'shilgan qatorlarni bilmaydi
+            autocomplete.invalidate("district", "name")
+    return report
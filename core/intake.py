@@ -0,0 +1,206 @@
+"""
+Arizalarni asinxron qabul qilish.
+
+`POST /api/applications/?async=1` maydonlarni tekshiradi, xom ma'lumot va
+fayllarni mahalliy storage'ga (MEDIA_ROOT/intake/<id>/) yozadi va darhol
+`202 Accepted` qaytaradi. Arizani yaratish (slug, video/document, imgbb'ga
+rasmlar) `process_application_intakes` worker'ida bajariladi; holat va
+natijaviy slug GET /api/applications/intake/<id>/ orqali ko'rinadi.
+
+Worker qayta ishga tushirilsa ham dublikat bo'lmaydi: yaratilgan ariza
+slug'i va yuklangan rasmlar soni (`images_done`) har qadamda saqlanadi,
+qayta urinish shu joydan davom etadi. Vaqtinchalik xatolar (imgbb, tarmoq)
+APPLICATION_INTAKE_MAX_ATTEMPTS martagacha qayta uriniladi.
+"""
+import logging
+import posixpath
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db.models import F, Q
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError as SubmissionError
+
+from .applications import attach_image, create_application, validate_submission
+from .models import Application, ApplicationIntake
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+PROCESSING = "processing"
+COMPLETED = "completed"
+FAILED = "failed"
+
+INTAKE_DIR = "intake"
+
+
+def _max_attempts():
+    return getattr(settings, "APPLICATION_INTAKE_MAX_ATTEMPTS", 3)
+
+
+def _stale_seconds():
+    return getattr(settings, "APPLICATION_INTAKE_STALE_SECONDS", 600)
+
+
+def _retry_delay(attempts):
+    return getattr(settings, "APPLICATION_INTAKE_RETRY_DELAY", 30) * 2 ** (attempts - 1)
+
+
+def _keep_days():
+    return getattr(settings, "APPLICATION_INTAKE_KEEP_DAYS", 7)
+
+
+def requested(request):
+    return request.query_params.get("async") in ("1", "true") or getattr(settings, "APPLICATION_INTAKE_ASYNC", False)
+
+
+def _store(intake, kind, upload):
+    name = posixpath.join(INTAKE_DIR, str(intake.pk), kind, posixpath.basename(upload.name))
+    return default_storage.save(name, upload)
+
+
+def submit(data, video=None, document=None, images=()):
+    """Tekshirilgan yuborishni navbatga qo'yadi (fayllar storage'ga yoziladi)"""
+    intake = ApplicationIntake(data=data, images_total=len(images))
+    files = {"images": []}
+    try:
+        if video:
+            files["video"] = _store(intake, "video", video)
+        if document:
+            files["document"] = _store(intake, "document", document)
+        for image in images:
+            files["images"].append(_store(intake, "images", image))
+        intake.files = files
+        intake.save()
+    except Exception:
+        _delete_files(files)
+        raise
+    return intake
+
+
+def status(intake):
+    return {
+        "id": str(intake.pk),
+        "state": intake.state,
+        "images_total": intake.images_total,
+        "images_done": intake.images_done,
+        "slug": intake.slug or None,
+        "error": intake.error,
+        "created_date": intake.created_date,
+        "finished_date": intake.finished_date,
+    }
+
+
+def _delete_files(files):
+    paths = [files.get("video"), files.get("document"), *files.get("images", [])]
+    for path in filter(None, paths):
+        try:
+            default_storage.delete(path)
+        except OSError:
+            logger.warning("Intake fayli o'chirilmadi: %s", path)
+
+
+def _open(path):
+    # FileField upload_to'ga faqat fayl nomi beriladi (yo'l emas)
+    return File(default_storage.open(path), name=posixpath.basename(path))
+
+
+def claim():
+    """
+    Navbatdagi (yoki to'xtab qolgan) yozuvni shartli UPDATE bilan egallaydi:
+    bir nechta worker bir yozuvni ikki marta olmaydi.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=_stale_seconds())
+    candidates = (
+        ApplicationIntake.objects.filter(
+            Q(state=QUEUED, retry_date__isnull=True) | Q(state=QUEUED, retry_date__lte=now)
+            | Q(state=PROCESSING, started_date__lt=stale)
+        )
+        .order_by("created_date").values_list("pk", "state", "started_date")[:10]
+    )
+    for pk, state, started_date in candidates:
+        claimed = ApplicationIntake.objects.filter(pk=pk, state=state, started_date=started_date).update(
+            state=PROCESSING, started_date=now, attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return ApplicationIntake.objects.get(pk=pk)
+    return None
+
+
+def _finish(intake, state, error=None):
+    intake.state = state
+    intake.error = error
+    intake.finished_date = timezone.now()
+    intake.save(update_fields=["state", "error", "finished_date", "slug", "images_done"])
+    _delete_files(intake.files)
+
+
+def _application(intake):
+    """Oldingi urinishda yaratilgan ariza yoki yangisi"""
+    if intake.slug:
+        application = Application.objects.filter(slug=intake.slug).first()
+        if application is not None:
+            return application
+        intake.images_done = 0
+
+    files = {kind: _open(intake.files[kind]) for kind in ("video", "document") if intake.files.get(kind)}
+    try:
+        application = create_application(validate_submission(intake.data, **files))
+    finally:
+        for file in files.values():
+            file.close()
+    intake.slug = application.slug
+    ApplicationIntake.objects.filter(pk=intake.pk).update(slug=application.slug, images_done=0)
+    return application
+
+
+def process(intake):
+    """Egallangan yozuvdan arizani yaratadi; yakuniy holatni qaytaradi"""
+    if intake.attempts > _max_attempts():
+        # Worker har safar shu yozuvda to'xtab qolgan (claim to'xtab qolganini qayta oladi)
+        _finish(intake, FAILED, {"error": "Urinishlar soni tugadi"})
+        return intake.state
+
+    application = None
+    try:
+        application = _application(intake)
+        images = intake.files.get("images", [])
+        for index in range(intake.images_done, len(images)):
+            with _open(images[index]) as image:
+                attach_image(application, image)
+            intake.images_done = index + 1
+            ApplicationIntake.objects.filter(pk=intake.pk).update(images_done=intake.images_done)
+    except SubmissionError as e:
+        # Yuborilgandan keyin o'zgargan ma'lumot (masalan, kategoriya o'chirilgan)
+        _finish(intake, FAILED, e.detail)
+        return intake.state
+    except Exception as e:
+        logger.exception("Intake %s: %d-urinish muvaffaqiyatsiz", intake.pk, intake.attempts)
+        if intake.attempts < _max_attempts():
+            ApplicationIntake.objects.filter(pk=intake.pk).update(
+                state=QUEUED, started_date=None, error={"error": str(e)},
+                retry_date=timezone.now() + timedelta(seconds=_retry_delay(intake.attempts)),
+            )
+            return QUEUED
+        # Sinxron create kabi: chala yaratilgan ariza o'chiriladi
+        application = application or (Application.objects.filter(slug=intake.slug).first() if intake.slug else None)
+        if application is not None:
+            application.delete()
+        intake.slug = ""
+        _finish(intake, FAILED, {"error": str(e)})
+        return intake.state
+
+    _finish(intake, COMPLETED)
+    return intake.state
+
+
+def prune_finished():
+    """APPLICATION_INTAKE_KEEP_DAYS'dan eski yakunlangan yozuvlar (fayllari allaqachon o'chirilgan)"""
+    cutoff = timezone.now() - timedelta(days=_keep_days())
+    deleted, _ = ApplicationIntake.objects.filter(
+        state__in=(COMPLETED, FAILED), finished_date__lt=cutoff,
+    ).delete()
+    return deleted
@@ -0,0 +1,138 @@
+"""
+Eng ko'p o'qilgan bloglar reytingi.
+
+Reyting BlogLeaderboard jadvalida har bir oyna (7d, 30d, all) uchun
+oldindan hisoblab qo'yiladi: 7d/30d BlogViewDaily yig'indilaridan, "all"
+esa HitCount jamidan. Reyting o'qish yo'lida hech qachon hisoblanmaydi:
+ko'rishlar flush qilinganda fon thread'i faqat o'zgargan bloglarni, kun
+almashganda esa oynalarni to'liq yangilaydi (core.hits.run_periodic);
+rebuild_blog_leaderboard buyrug'i deploy va cron uchun. API javoblari
+keshlanadi va reyting o'zgarganda kesh versiyasi oshiriladi.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Sum
+from django.utils import timezone
+from hitcount.models import HitCount
+
+from .models import Blog, BlogLeaderboard, BlogViewDaily
+
+WINDOWS = {"7d": 7, "30d": 30, "all": None}
+
+VERSION_KEY = "blog-leaderboard:version"
+FRESH_DAY_KEY = "blog-leaderboard:day"
+
+
+def _window_counts(days, blog_ids=None):
+    """{blog_id: ko'rishlar} - `days` None bo'lsa jami"""
+    if days is None:
+        ctype = ContentType.objects.get_for_model(Blog)
+        qs = HitCount.objects.filter(content_type=ctype).order_by()
+        if blog_ids is not None:
+            qs = qs.filter(object_pk__in=blog_ids)
+        return dict(qs.values_list("object_pk", "hits"))
+
+    since = timezone.localdate() - timedelta(days=days - 1)
+    daily = BlogViewDaily.objects.filter(day__gte=since).order_by()
+    if blog_ids is not None:
+        daily = daily.filter(blog_id__in=blog_ids)
+    return dict(daily.values("blog_id").annotate(total=Sum("views")).values_list("blog_id", "total"))
+
+
+def _bump_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, timeout=None)
+
+
+def refresh(blog_ids=None):
+    """Reytingni qayta hisoblaydi: `blog_ids` berilsa faqat o'sha bloglar uchun"""
+    today = timezone.localdate()
+    if blog_ids is not None:
+        blog_ids = list(blog_ids)
+        if not blog_ids:
+            return
+
+    with transaction.atomic():
+        alive = Blog.objects.order_by()
+        if blog_ids is not None:
+            alive = alive.filter(pk__in=blog_ids)
+        alive = set(alive.values_list("pk", flat=True))
+
+        for window, days in WINDOWS.items():
+            counts = _window_counts(days, blog_ids)
+            rows = BlogLeaderboard.objects.filter(window=window)
+            if blog_ids is not None:
+                rows = rows.filter(blog_id__in=blog_ids)
+            rows.delete()
+            BlogLeaderboard.objects.bulk_create([
+                BlogLeaderboard(window=window, blog_id=blog_id, views=views, computed_day=today)
+                for blog_id, views in counts.items()
+                if views > 0 and blog_id in alive
+            ], batch_size=1000)
+
+    if blog_ids is None:
+        cache.set(FRESH_DAY_KEY, today, timeout=None)
+    _bump_version()
+
+
+def ensure_fresh():
+    """Kun almashgan bo'lsa 7d/30d oynalarini to'liq qayta hisoblaydi"""
+    today = timezone.localdate()
+    if cache.get(FRESH_DAY_KEY) == today:
+        return
+    stale = BlogLeaderboard.objects.filter(computed_day__lt=today).exists()
+    if stale or not BlogLeaderboard.objects.exists():
+        try:
+            refresh()
+        except IntegrityError:
+            # Boshqa jarayon aynan hozir qayta hisoblayapti
+            return
+    cache.set(FRESH_DAY_KEY, today, timeout=None)
+
+
+def invalidate():
+    _bump_version()
+
+
+def get_popular(window, region=None, limit=10):
+    """Faqat keshdagi yoki BlogLeaderboard'dagi tayyor reyting (hisoblamaydi)"""
+    version = cache.get(VERSION_KEY, 0)
+    key = f"blog-leaderboard:{version}:{window}:{region or ''}:{limit}"
+    result = cache.get(key)
+    if result is not None:
+        return result
+
+    qs = (
+        BlogLeaderboard.objects.filter(window=window).select_related("blog")
+        .defer("blog__content", "blog__content_html", "blog__toc")
+    )
+    if region:
+        qs = qs.filter(blog__region=region)
+    entries = qs.order_by("-views", "blog_id")[:limit]
+
+    result = [
+        {
+            "rank": rank,
+            "views": entry.views,
+            "blog": {
+                "id": entry.blog.id,
+                "title": entry.blog.title,
+                "slug": entry.blog.slug,
+                "description": entry.blog.description,
+                "excerpt": entry.blog.excerpt,
+                "reading_time": entry.blog.reading_time,
+                "region": entry.blog.region,
+                "image_url": entry.blog.image_url,
+                "created_date": entry.blog.created_date,
+            },
+        }
+        for rank, entry in enumerate(entries, start=1)
+    ]
+    cache.set(key, result, timeout=getattr(settings, "BLOG_LEADERBOARD_CACHE_TTL", 60))
+    return result
@@ -0,0 +1,77 @@
+"""
+Arizachilarni qidirish.
+
+Telefon va passport raqamlari formatlanishi har xil bo'ladi ("+998 90 123-45-67",
+"90 123 45 67" va "998901234567"), shuning uchun ular normallashtirilgan (telefon
+davlat kodi bilan), indekslangan
+phone_digits / passport_normalized ustunlarida qidiriladi. So'rov shakliga
+qarab telefon yoki passport bo'lsa indeksdagi tenglik/prefiks diapazoniga,
+aks holda ism bo'yicha icontains'ga yo'naltiriladi.
+"""
+import re
+
+from django.db.models import Q
+from rest_framework import filters
+
+from .models import LOCAL_PHONE_LENGTH, PHONE_COUNTRY_CODE, normalize_passport, normalize_phone
+
+MIN_PHONE_DIGITS = 3
+
+_PHONE_RE = re.compile(r"[\d\s+\-()]+")
+_PASSPORT_RE = re.compile(r"[A-Za-z]{1,3}[\s\-]*\d[\d\s\-]*")
+
+
+def classify_query(query):
+    """("phone" | "passport" | "name", normallashtirilgan qiymat)"""
+    query = (query or "").strip()
+    if _PHONE_RE.fullmatch(query):
+        digits = normalize_phone(query)
+        if len(digits) >= MIN_PHONE_DIGITS:
+            return "phone", digits
+    if _PASSPORT_RE.fullmatch(query):
+        return "passport", normalize_passport(query)
+    return "name", query
+
+
+def prefix_range(field, prefix):
+    """
+    `field LIKE 'prefix%'` o'rniga indeksdan foydalanadigan diapazon:
+    prefix <= field < prefix'ning oxirgi belgisi +1
+    """
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return Q(**{f"{field}__gte": prefix, f"{field}__lt": upper})
+
+
+def _phone_q(digits):
+    # Bazada raqamlar kanonik (998...) shaklda: mahalliy raqam boshiga
+    # ("90 123") davlat kodi qo'shiladi. To'liq mahalliy raqamga
+    # normalize_phone o'zi qo'shgan.
+    if not digits.startswith(PHONE_COUNTRY_CODE) and len(digits) < LOCAL_PHONE_LENGTH:
+        digits = PHONE_COUNTRY_CODE + digits
+    if len(digits) >= len(PHONE_COUNTRY_CODE) + LOCAL_PHONE_LENGTH:
+        return Q(phone_digits=digits)
+    return prefix_range("phone_digits", digits)
+
+
+def applicant_search_q(query):
+    """Qidiruv so'rovi uchun Q; so'rov bo'sh bo'lsa None"""
+    kind, value = classify_query(query)
+    if not value:
+        return None
+    if kind == "phone":
+        return _phone_q(value)
+    if kind == "passport":
+        return prefix_range("passport_normalized", value)
+    return Q(full_name__icontains=value)
+
+
+def search_applications(queryset, query):
+    q = applicant_search_q(query)
+    return queryset.filter(q) if q is not None else queryset
+
+
+class ApplicationSearchFilter(filters.SearchFilter):
+    """DRF SearchFilter o'rnida: ?search= ni `search_applications` orqali qidiradi"""
+
+    def filter_queryset(self, request, queryset, view):
+        return search_applications(queryset, request.query_params.get(self.search_param, ""))
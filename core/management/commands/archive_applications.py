@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.archive import archivable, archive_applications
+
+
+class Command(BaseCommand):
+    help = (
+        "Yopilganiga (accepted/denied) N kundan ko'p bo'lgan arizalarni rasmlari bilan "
+        "arxiv jadvaliga partiyalab ko'chiradi. Statistika o'zgarmaydi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than", type=int, default=180,
+            help="Necha kun oldin yopilgan arizalar ko'chiriladi (default: 180)",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=500,
+            help="Bitta tranzaksiyada ko'chiriladigan arizalar soni (default: 500)",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Faqat sonini ko'rsatish")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size musbat bo'lishi kerak")
+        if options["older_than"] < 0:
+            raise CommandError("--older-than manfiy bo'lmasligi kerak")
+        if options["dry_run"]:
+            count = archivable(options["older_than"]).count()
+            self.stdout.write(f"{count} ta ariza arxivlanadi")
+            return
+        total, batches = archive_applications(options["older_than"], options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{total} ta ariza {batches} partiyada arxivlandi"))
@@ -0,0 +1,108 @@
+import csv
+import io
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks import rolled_back, seed_taxonomy
+from core.imports import FIELDS, FORMATS, import_applications
+from core.models import Application, Category, REGION_CHOICES
+
+TAXONOMY_SIZE = 20
+# Ismlar takrorlanadi: slug ajratish ham (ism-1, ism-2, ...) o'lchanadi
+DISTINCT_NAMES = 5000
+
+
+class Command(BaseCommand):
+    help = (
+        "import_applications tezligini (qator/s) o'lchaydi: N ta qatorli CSV/NDJSON "
+        "xotirada yaratiladi va import qilinadi, taqqoslash uchun qatorma-qator "
+        "Application.save() ham o'lchanadi. Ma'lumotlar rollback qilinadi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100000)
+        parser.add_argument("--format", choices=FORMATS, default="csv")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--baseline", type=int, default=2000,
+            help="Qatorma-qator save() bilan yoziladigan qatorlar (0 - o'tkazib yuborish)",
+        )
+        parser.add_argument("--invalid-every", type=int, default=100, help="Har N-qator noto'g'ri (0 - yo'q)")
+
+    def _rows(self, count, categories, subcategories, invalid_every):
+        regions = [value for value, _ in REGION_CHOICES]
+        for i in range(count):
+            index = i % len(categories)
+            row = {
+                "full_name": f"Benchmark Import {i % DISTINCT_NAMES}",
+                "phone_number": f"+998 90 {i:07d}",
+                "birth_date": "1990-01-01",
+                "passport_number": f"AA {i:07d}",
+                "region": regions[i % len(regions)],
+                "district": f"Tuman {i % 50}",
+                "location": "benchmark",
+                # Kategoriya id bilan, subkategoriya nom bilan
+                "category": str(categories[index].pk),
+                "subcategory": subcategories[index].title,
+                "description": "benchmark",
+            }
+            if invalid_every and i % invalid_every == invalid_every - 1:
+                row["region"] = "Noma'lum"
+            yield row
+
+    def _payload(self, rows, fmt):
+        buffer = io.StringIO(newline="")
+        if fmt == "csv":
+            writer = csv.DictWriter(buffer, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            for row in rows:
+                buffer.write(json.dumps(row, ensure_ascii=False) + "\n")
+        buffer.seek(0)
+        return buffer
+
+    def handle(self, *args, **options):
+        if options["rows"] < 1 or options["chunk_size"] < 1:
+            raise CommandError("--rows va --chunk-size musbat bo'lishi kerak")
+
+        with rolled_back():
+            categories, subcategories = seed_taxonomy(TAXONOMY_SIZE)
+            Category.subcategories.through.objects.bulk_create([
+                Category.subcategories.through(category_id=category.pk, subcategory_id=subcategory.pk)
+                for category, subcategory in zip(categories, subcategories)
+            ])
+
+            if options["baseline"]:
+                subcategory_ids = {subcategory.title: subcategory.pk for subcategory in subcategories}
+                start = time.perf_counter()
+                for row in self._rows(options["baseline"], categories, subcategories, 0):
+                    row["category_id"] = int(row.pop("category"))
+                    row["subcategory_id"] = subcategory_ids[row.pop("subcategory")]
+                    Application(**row).save()
+                elapsed = time.perf_counter() - start
+                self.stdout.write(
+                    f"save() qatorma-qator: {options['baseline']} qator, {elapsed:.2f} s, "
+                    f"{options['baseline'] / elapsed:,.0f} qator/s"
+                )
+
+            payload = self._payload(
+                self._rows(options["rows"], categories, subcategories, options["invalid_every"]), options["format"]
+            )
+            start = time.perf_counter()
+            report = import_applications(payload, options["format"], chunk_size=options["chunk_size"])
+            elapsed = time.perf_counter() - start
+
+            self.stdout.write(
+                f"import ({options['format']}, partiya {options['chunk_size']}): {report['total']} qator, "
+                f"{report['created']} yaratildi, {report['failed']} xato, {elapsed:.2f} s, "
+                f"{report['total'] / elapsed:,.0f} qator/s"
+            )
+
+            expected = options["rows"] - (options["rows"] // options["invalid_every"] if options["invalid_every"] else 0)
+            created = Application.objects.filter(full_name__startswith="Benchmark Import").count()
+            if report["created"] != expected or created != expected + options["baseline"]:
+                raise CommandError(f"Kutilgan {expected} ta ariza, yaratildi {report['created']}")
+        self.stdout.write(self.style.SUCCESS("Import benchmark tugadi (rollback qilindi)"))
@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks import (
+    analyze, application_factory, bulk_seed, parse_sizes, rolled_back, run_cases, seed_taxonomy,
+)
+from core.models import Application, REGION_CHOICES
+
+PAGE_SIZE = 20
+TAXONOMY_SIZE = 20
+
+
+class Command(BaseCommand):
+    help = (
+        "Arizalar ro'yxatlari (viewset filtrlari, filter_applications, kategoriya/subkategoriya "
+        "bo'yicha, admin list_filter, statistika) so'rov rejalarini tekshiradi. To'liq skaner "
+        "yoki TEMP B-TREE saralash topilsa xato bilan tugaydi. Ma'lumotlar rollback qilinadi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1000,10000,50000", help="Vergul bilan jadval o'lchamlari")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--analyze", action="store_true", help="Har o'lchamda ANALYZE bajarish")
+
+    def _cases(self, category, subcategory, region):
+        ordered = Application.objects.order_by("-created_date")
+        admin = Application.objects.order_by("-created_date", "-pk")
+        count = lambda qs: qs.count()  # noqa: E731
+
+        cases = {
+            # ApplicationViewSet (filterset_fields)
+            "viewset list": ordered[:PAGE_SIZE],
+            "viewset ?status": ordered.filter(status="pending")[:PAGE_SIZE],
+            "viewset ?region": ordered.filter(region=region)[:PAGE_SIZE],
+            "viewset ?category": ordered.filter(category=category)[:PAGE_SIZE],
+            "viewset ?subcategory": ordered.filter(subcategory=subcategory)[:PAGE_SIZE],
+            # filter_applications (Meta.ordering)
+            "filter status+region": Application.objects.filter(status="accepted", region=region)[:PAGE_SIZE],
+            "filter category+status": Application.objects.filter(category_id=category.pk, status="pending")[:PAGE_SIZE],
+            # applications_by_category / applications_by_subcategory
+            "by category": Application.objects.filter(category_id=category.pk).order_by("-created_date")[:PAGE_SIZE],
+            "by subcategory": Application.objects.filter(subcategory_id=subcategory.pk).order_by("-created_date")[:PAGE_SIZE],
+            # ApplicationAdmin (list_filter + "-pk" tartibi, paginator COUNT)
+            "admin changelist": admin[:100],
+            "admin ?status": admin.filter(status="denied")[:100],
+            "admin ?region": admin.filter(region=region)[:100],
+            "admin ?status count": (Application.objects.filter(status="denied").order_by(), count),
+            # Statistika (reconcile/compute_counts)
+            "stats status count": (Application.objects.filter(status="pending").order_by(), count),
+        }
+        return cases
+
+    def handle(self, *args, **options):
+        sizes = parse_sizes(options["sizes"])
+        regions = [value for value, _ in REGION_CHOICES]
+        failures = []
+        with rolled_back():
+            categories, subcategories = seed_taxonomy(TAXONOMY_SIZE)
+            make = application_factory(categories, subcategories)
+
+            seeded = 0
+            for size in sizes:
+                bulk_seed(Application, make, seeded, size)
+                seeded = size
+                if options["analyze"]:
+                    analyze()
+
+                self.stdout.write(self.style.MIGRATE_HEADING(f"{size} ta ariza"))
+                cases = self._cases(categories[0], subcategories[0], regions[0])
+                failures.extend(run_cases(cases, options["repeat"], self.stdout.write))
+
+        if failures:
+            raise CommandError("Indekssiz reja topildi:\n" + "\n".join(failures))
+        self.stdout.write(self.style.SUCCESS("Barcha so'rovlar indeks orqali bajarildi"))
@@ -0,0 +1,273 @@
+import asyncio
+import io
+import json
+import statistics
+import threading
+import time
+import uuid
+
+import requests
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.shortcuts import get_object_or_404
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.urls import include, path
+from PIL import Image
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from core.benchmarks import seed_taxonomy
+from core.models import Application, ApplicationImage, ContactUs, REGION_CHOICES
+from core.serializers import ContactUsSerializer
+
+ENDPOINTS = ("contact", "images")
+NAME_PREFIX = "Benchmark Async"
+
+
+# Taqqoslash uchun: async'gacha bo'lgan sinxron implementatsiyalar (requests bilan)
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def sync_contact_create(request):
+    serializer = ContactUsSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+    requests.post(
+        f"{settings.TELEGRAM_API_URL}/bot{settings.TELEGRAM_BOT_TOKEN}/sendMessage",
+        params={"chat_id": settings.TELEGRAM_CHAT_ID, "text": "benchmark", "parse_mode": "Markdown"},
+        timeout=5,
+    )
+    return Response(serializer.data, status=201)
+
+
+@api_view(["POST"])
+@permission_classes([AllowAny])
+@parser_classes([MultiPartParser])
+def sync_add_images(request, slug):
+    application = get_object_or_404(Application, slug=slug)
+    images = request.FILES.getlist("images")
+    for image in images:
+        # ApplicationImage.save -> models.upload_to_imgbb (requests)
+        ApplicationImage.objects.create(application=application, image=image)
+    return Response({"added_count": len(images)}, status=201)
+
+
+# override_settings(ROOT_URLCONF=__name__): asosiy URL'lar + sinxron variantlar
+urlpatterns = [
+    path("benchmark/sync/contact-us/", sync_contact_create),
+    path("benchmark/sync/applications/<slug:slug>/add-images/", sync_add_images),
+    path("", include(settings.ROOT_URLCONF)),
+]
+
+
+class StandInServer:
+    """
+    Telegram / imgbb o'rnidagi mahalliy HTTP/1.1 server (keep-alive): har bir
+    javob `latency` soniya kechikadi. Alohida thread'dagi bitta event loop'da
+    ishlaydi, shuning uchun o'lchanadigan thread'lar soniga qo'shilmaydi.
+    """
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.writers = set()
+        self.loop = asyncio.new_event_loop()
+        self.server = self.loop.run_until_complete(asyncio.start_server(self._serve, "127.0.0.1", 0))
+        self.url = f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    async def _serve(self, reader, writer):
+        self.writers.add(writer)
+        try:
+            while request_line := await reader.readline():
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                await reader.readexactly(int(headers.get("content-length", 0)))
+                await asyncio.sleep(self.latency)
+
+                if b"/sendMessage" in request_line:
+                    body = {"ok": True}
+                else:
+                    body = {"data": {"url": f"{self.url}/images/{uuid.uuid4().hex}.png"}}
+                payload = json.dumps(body).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+    def close(self):
+        async def stop():
+            self.server.close()
+            # Ochiq qolgan keep-alive ulanishlar
+            for writer in self.writers:
+                writer.close()
+        asyncio.run_coroutine_threadsafe(stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+def _png():
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), "white").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class Command(BaseCommand):
+    help = (
+        "Async view'lar (ContactUs create -> Telegram, add-images -> imgbb) va ularning "
+        "sinxron variantlarini ASGI orqali bir vaqtda N ta so'rov bilan o'lchaydi. Tashqi "
+        "xizmatlar o'rniga kechikishli mahalliy stand-in server ishlatiladi; yaratilgan "
+        "yozuvlar oxirida o'chiriladi. GoogleAuthView o'lchanmaydi: sertifikatlar keshlanadi. "
+        "Eslatma: Django ASGIHandler har bir so'rovga alohida thread-sensitive executor beradi, "
+        "shuning uchun thread'lar soni ikkala variantda bir xil; async'da ular tarmoqni kutmaydi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=300)
+        parser.add_argument("--concurrency", type=int, default=100, help="Bir vaqtdagi so'rovlar")
+        parser.add_argument("--latency", type=float, default=0.5, help="Stand-in javob kechikishi (soniya)")
+        parser.add_argument("--images", type=int, default=3, help="add-images so'rovidagi rasmlar")
+        parser.add_argument("--endpoint", choices=ENDPOINTS, action="append", help="Default: hammasi")
+        parser.add_argument("--skip-sync", action="store_true", help="Sinxron variantni o'lchamaslik")
+
+    async def _post(self, app, url, data):
+        """
+        So'rov to'g'ridan-to'g'ri ASGIHandler'ga (uvicorn kabi, har bir so'rov
+        uchun ThreadSensitiveContext bilan). Test AsyncClient barcha sinxron
+        view'larni bitta thread'da bajaradi va taqqoslashni buzadi.
+        """
+        body = encode_multipart(BOUNDARY, data)
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "scheme": "http",
+            "method": "POST", "path": url, "raw_path": url.encode(), "query_string": b"", "root_path": "",
+            "headers": [
+                (b"host", b"localhost"),
+                (b"content-type", MULTIPART_CONTENT.encode()),
+                (b"content-length", str(len(body)).encode()),
+            ],
+            "client": ("127.0.0.1", 0), "server": ("localhost", 80),
+        }
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+        response = {"status": None, "body": b""}
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            # Klient uzilmaydi: Django disconnect'ni kutuvchi vazifani o'zi bekor qiladi
+            await asyncio.Future()
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["body"] += message.get("body", b"")
+
+        await app(scope, receive, send)
+        return response
+
+    async def _run(self, url, payload, count, concurrency):
+        app = ASGIHandler()
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+        peak_threads = threading.active_count()
+        done = asyncio.Event()
+
+        async def sample_threads():
+            nonlocal peak_threads
+            while not done.is_set():
+                peak_threads = max(peak_threads, threading.active_count())
+                await asyncio.sleep(0.01)
+
+        async def one(i):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await self._post(app, url, payload(i))
+                latencies.append(time.perf_counter() - start)
+                if response["status"] != 201:
+                    raise CommandError(f"{url}: {response['status']} {response['body'][:200]!r}")
+
+        sampler = asyncio.create_task(sample_threads())
+        start = time.perf_counter()
+        try:
+            await asyncio.gather(*(one(i) for i in range(count)))
+        finally:
+            elapsed = time.perf_counter() - start
+            done.set()
+            await sampler
+        return elapsed, latencies, peak_threads
+
+    def _report(self, label, count, result):
+        elapsed, latencies, peak_threads = result
+        percentiles = statistics.quantiles(latencies, n=20) if len(latencies) > 1 else latencies * 19
+        self.stdout.write(
+            f"  {label:<6} {count} so'rov, {elapsed:.2f} s, {count / elapsed:,.0f} so'rov/s, "
+            f"p50 {statistics.median(latencies) * 1000:.0f} ms, p95 {percentiles[18] * 1000:.0f} ms, "
+            f"thread'lar (eng ko'p) {peak_threads}"
+        )
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["concurrency"] < 1 or options["images"] < 1:
+            raise CommandError("--requests, --concurrency va --images musbat bo'lishi kerak")
+        endpoints = options["endpoint"] or ENDPOINTS
+
+        server = StandInServer(options["latency"])
+        (category,), (subcategory,) = seed_taxonomy(1)
+        category.subcategories.add(subcategory)
+        application = Application.objects.create(
+            full_name=NAME_PREFIX, phone_number="+998 90 0000000", birth_date="1990-01-01",
+            passport_number="AA 0000000", region=REGION_CHOICES[0][0], location="benchmark",
+            category=category, subcategory=subcategory, description="benchmark",
+        )
+        png = _png()
+
+        def contact(i):
+            return {
+                "full_name": f"{NAME_PREFIX} {i}", "email": f"benchmark{i}@example.com",
+                "theme": ContactUs._meta.get_field("theme").choices[0][0], "message": "benchmark",
+            }
+
+        def images(i):
+            return {"images": [SimpleUploadedFile(f"{i}-{n}.png", png, "image/png") for n in range(options["images"])]}
+
+        cases = {
+            "contact": ("/api/contact-us/", "/benchmark/sync/contact-us/", contact),
+            "images": (
+                f"/api/applications/{application.slug}/add-images/",
+                f"/benchmark/sync/applications/{application.slug}/add-images/",
+                images,
+            ),
+        }
+        count, concurrency = options["requests"], options["concurrency"]
+        try:
+            with override_settings(
+                ROOT_URLCONF=__name__, ALLOWED_HOSTS=["*"],
+                TELEGRAM_API_URL=server.url, IMGBB_UPLOAD_URL=f"{server.url}/1/upload",
+            ):
+                for name in endpoints:
+                    async_url, sync_url, payload = cases[name]
+                    self.stdout.write(
+                        f"{name}: kechikish {options['latency'] * 1000:.0f} ms, bir vaqtda {concurrency}"
+                    )
+                    self._report("async", count, asyncio.run(self._run(async_url, payload, count, concurrency)))
+                    if not options["skip_sync"]:
+                        self._report("sync", count, asyncio.run(self._run(sync_url, payload, count, concurrency)))
+        finally:
+            server.close()
+            ContactUs.objects.filter(full_name__startswith=NAME_PREFIX).delete()
+            # Ariza va uning rasmlari kategoriya bilan birga o'chadi
+            category.delete()
+            subcategory.delete()
+        self.stdout.write(self.style.SUCCESS("Async view benchmark tugadi (yozuvlar o'chirildi)"))
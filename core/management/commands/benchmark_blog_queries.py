@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.benchmarks import analyze, bulk_seed, parse_sizes, rolled_back, run_cases
+from core.filters import BlogFilter
+from core.models import Blog, REGION_CHOICES
+
+PAGE_SIZE = 20
+
+
+def _list_queryset(params):
+    """BlogViewSet.list bilan bir xil: filter + tartib + defer"""
+    queryset = Blog.objects.defer("content", "content_html", "toc")
+    return BlogFilter(params, queryset=queryset).qs.order_by("-created_date")
+
+
+class Command(BaseCommand):
+    help = (
+        "Blog ro'yxati filtrlari (region, sana oralig'i) uchun so'rov rejalarini va "
+        "vaqtini o'lchaydi. Ma'lumotlar vaqtinchalik, oxirida rollback qilinadi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1000,10000,50000", help="Vergul bilan jadval o'lchamlari")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--analyze", action="store_true", help="Har o'lchamda ANALYZE bajarish")
+
+    def handle(self, *args, **options):
+        sizes = parse_sizes(options["sizes"])
+        regions = [value for value, _ in REGION_CHOICES]
+        now = timezone.now()
+
+        def make(i):
+            return Blog(
+                title=f"Benchmark {i}",
+                slug=f"benchmark-{i}",
+                description="benchmark",
+                content="",
+                region=regions[i % len(regions)],
+                created_date=now - timedelta(minutes=i),
+            )
+
+        today = timezone.localdate()
+        params = {
+            "list": {},
+            "region": {"region": regions[0]},
+            "region + date range": {
+                "region": regions[0],
+                "date_from": str(today - timedelta(days=30)),
+                "date_to": str(today),
+            },
+            "date range": {"date_from": str(today - timedelta(days=7)), "date_to": str(today)},
+        }
+
+        failures = []
+        with rolled_back():
+            seeded = 0
+            for size in sizes:
+                bulk_seed(Blog, make, seeded, size)
+                seeded = size
+                if options["analyze"]:
+                    analyze()
+
+                self.stdout.write(self.style.MIGRATE_HEADING(f"{size} ta blog"))
+                cases = {}
+                for name, query in params.items():
+                    queryset = _list_queryset(query)
+                    # Sahifa: LIMIT 20 OFFSET 0 va paginator'ning COUNT(*) so'rovi
+                    cases[f"{name} (page)"] = queryset[:PAGE_SIZE]
+                    if query:
+                        cases[f"{name} (count)"] = (queryset.order_by(), lambda qs: qs.count())
+                failures.extend(run_cases(cases, options["repeat"], self.stdout.write))
+
+        if failures:
+            raise CommandError("Indekssiz reja topildi:\n" + "\n".join(failures))
+        self.stdout.write(self.style.SUCCESS("Barcha so'rovlar indeks orqali bajarildi"))
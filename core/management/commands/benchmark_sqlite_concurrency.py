@@ -0,0 +1,144 @@
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connections, transaction
+
+TABLE = "bench_item"
+
+
+def _profiles():
+    """(nom, ENGINE, OPTIONS, CONN_MAX_AGE): "oldin" - Django standarti, "keyin" - settings"""
+    tuned = settings.DATABASES["default"]
+    return [
+        ("default", "django.db.backends.sqlite3", {"init_command": "PRAGMA journal_mode=DELETE"}, 0),
+        ("tuned", tuned["ENGINE"], dict(tuned.get("OPTIONS", {})), tuned.get("CONN_MAX_AGE", 0)),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "SQLite'ga bir vaqtda o'qish/yozish yuklamasini beradi va standart sozlamalar "
+        "(rollback journal, har so'rovda yangi ulanish) bilan settings'dagi profil "
+        "(WAL, pragmalar, doimiy ulanish, qayta urinish) o'tkazuvchanligini solishtiradi. "
+        "Vaqtinchalik bazada ishlaydi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=8)
+        parser.add_argument("--writers", type=int, default=2)
+        parser.add_argument("--duration", type=float, default=5.0, help="Har profil uchun, soniya")
+        parser.add_argument("--rows", type=int, default=10000)
+
+    def handle(self, *args, **options):
+        if settings.DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+            raise CommandError("Benchmark faqat SQLite profili uchun")
+
+        directory = tempfile.mkdtemp(prefix="sqlite-bench-")
+        results = {}
+        try:
+            for name, engine, db_options, max_age in _profiles():
+                alias = f"bench_{name}"
+                connections.settings[alias] = {
+                    **connections["default"].settings_dict,
+                    "ENGINE": engine,
+                    "NAME": os.path.join(directory, f"{name}.sqlite3"),
+                    "OPTIONS": db_options,
+                    "CONN_MAX_AGE": max_age,
+                    "TEST": {},
+                }
+                try:
+                    self._seed(alias, options["rows"])
+                    results[name] = self._run(alias, options)
+                finally:
+                    connections[alias].close()
+                    del connections.settings[alias]
+                self._report(name, results[name])
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+        before, after = results["default"], results["tuned"]
+        for kind in ("reads", "writes"):
+            ratio = after[kind] / before[kind] if before[kind] else float("inf")
+            self.stdout.write(f"{kind}: {ratio:.1f}x")
+
+    def _seed(self, alias, rows):
+        with connections[alias].cursor() as cursor:
+            cursor.execute(f"CREATE TABLE {TABLE} (id INTEGER PRIMARY KEY, status INTEGER, counter INTEGER)")
+            cursor.execute(f"CREATE INDEX {TABLE}_status ON {TABLE} (status)")
+            cursor.executemany(
+                f"INSERT INTO {TABLE} (id, status, counter) VALUES (%s, %s, 0)",
+                [(i, i % 4) for i in range(1, rows + 1)],
+            )
+
+    def _run(self, alias, options):
+        rows = options["rows"]
+        deadline = time.monotonic() + options["duration"]
+        lock = threading.Lock()
+        stats = {"reads": 0, "writes": 0, "errors": 0, "latencies": []}
+
+        def read(cursor):
+            cursor.execute(f"SELECT * FROM {TABLE} WHERE id = %s", [random.randint(1, rows)])
+            cursor.fetchone()
+            cursor.execute(f"SELECT COUNT(*) FROM {TABLE} WHERE status = %s", [random.randint(0, 3)])
+            cursor.fetchone()
+
+        def write(cursor):
+            # O'qib, keyin yozish: DEFERRED tranzaksiyada aynan shu "database is locked" beradi
+            pk = random.randint(1, rows)
+            cursor.execute(f"SELECT counter FROM {TABLE} WHERE id = %s", [pk])
+            counter = cursor.fetchone()[0]
+            cursor.execute(f"UPDATE {TABLE} SET counter = %s, status = %s WHERE id = %s", [counter + 1, pk % 4, pk])
+
+        def worker(kind, operation):
+            local = {"count": 0, "errors": 0, "latencies": []}
+            while time.monotonic() < deadline:
+                # Bitta iteratsiya - bitta HTTP so'rov: boshida va oxirida close_old_connections()
+                connection = connections[alias]
+                connection.close_if_unusable_or_obsolete()
+                start = time.perf_counter()
+                try:
+                    with transaction.atomic(using=alias), connection.cursor() as cursor:
+                        operation(cursor)
+                    local["count"] += 1
+                    local["latencies"].append((time.perf_counter() - start) * 1000)
+                except DatabaseError:
+                    local["errors"] += 1
+                connection.close_if_unusable_or_obsolete()
+            connections[alias].close()
+            with lock:
+                stats[kind] += local["count"]
+                stats["errors"] += local["errors"]
+                stats["latencies"].extend(local["latencies"])
+
+        threads = [
+            threading.Thread(target=worker, args=("reads", read)) for _ in range(options["readers"])
+        ] + [
+            threading.Thread(target=worker, args=("writes", write)) for _ in range(options["writers"])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        latencies = sorted(stats.pop("latencies")) or [0]
+        return {
+            "reads": stats["reads"] / options["duration"],
+            "writes": stats["writes"] / options["duration"],
+            "errors": stats["errors"],
+            "p50": statistics.median(latencies),
+            "p95": latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0],
+        }
+
+    def _report(self, name, result):
+        self.stdout.write(self.style.MIGRATE_HEADING(name))
+        self.stdout.write(
+            f"  o'qish: {result['reads']:9.0f}/s  yozish: {result['writes']:8.0f}/s  "
+            f"xato: {result['errors']:5d}  p50: {result['p50']:6.2f} ms  p95: {result['p95']:7.2f} ms"
+        )
@@ -0,0 +1,51 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.imports import FORMATS, ImportFormatError, detect_format, import_applications
+
+SHOWN_ERRORS = 20
+
+
+class Command(BaseCommand):
+    help = (
+        "Arizalarni CSV yoki NDJSON fayldan partiyalab (bulk_create) import qiladi. "
+        "Noto'g'ri qatorlar o'tkazib yuboriladi va hisobotda qator raqami bilan ko'rsatiladi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV (.csv) yoki NDJSON (.ndjson, .jsonl) fayl")
+        parser.add_argument("--format", choices=FORMATS, help="Kengaytmadan aniqlanmasa")
+        parser.add_argument(
+            "--chunk-size", type=int, default=None,
+            help="Bitta bulk_create partiyasi (default: APPLICATION_IMPORT_CHUNK_SIZE)",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Faqat tekshirish, yozmaslik")
+        parser.add_argument("--report", help="To'liq hisobotni JSON faylga yozish")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] is not None and options["chunk_size"] < 1:
+            raise CommandError("--chunk-size musbat bo'lishi kerak")
+        try:
+            fmt = detect_format(options["path"], options["format"])
+            with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+                report = import_applications(stream, fmt, options["chunk_size"], options["dry_run"])
+        except OSError as e:
+            raise CommandError(f"Faylni ochib bo'lmadi: {e}")
+        except ImportFormatError as e:
+            raise CommandError(str(e))
+
+        for error in report["errors"][:SHOWN_ERRORS]:
+            details = "; ".join(f"{field}: {message}" for field, message in error["errors"].items())
+            self.stderr.write(f"  {error['line']}-qator: {details}")
+        if report["failed"] > SHOWN_ERRORS:
+            self.stderr.write(f"  ... yana {report['failed'] - SHOWN_ERRORS} ta xato")
+
+        if options["report"]:
+            with open(options["report"], "w", encoding="utf-8") as output:
+                json.dump(report, output, ensure_ascii=False, indent=2)
+
+        summary = f"{report['total']} ta qator: {report['created']} ta yaratildi, {report['failed']} ta xato"
+        if options["dry_run"]:
+            summary = f"{report['total']} ta qator: {report['total'] - report['failed']} ta to'g'ri, {report['failed']} ta xato"
+        self.stdout.write(self.style.SUCCESS(summary) if not report["failed"] else self.style.WARNING(summary))
@@ -0,0 +1,100 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from core.benchmarks import application_factory, bulk_seed, rolled_back, seed_taxonomy
+from core.models import Application, Blog, ContactUs, CONTACT_THEME_CHOICES, REGION_CHOICES
+
+DEFAULT_TABLES = ["core_application", "core_blog", "core_contactus"]
+
+
+def _sqlite_sizes(tables):
+    """{jadval: [(nom, bayt), ...]} - jadvalning o'zi va indekslari (dbstat)"""
+    with connection.cursor() as cursor:
+        placeholders = ", ".join(["%s"] * len(tables))
+        cursor.execute(
+            f"SELECT name, tbl_name FROM sqlite_master WHERE type IN ('table', 'index') "
+            f"AND tbl_name IN ({placeholders})",
+            tables,
+        )
+        owners = dict(cursor.fetchall())
+        cursor.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")
+        sizes = dict(cursor.fetchall())
+
+    result = {table: [] for table in tables}
+    for name, table in owners.items():
+        result[table].append((name, sizes.get(name, 0)))
+    return result
+
+
+def _postgres_sizes(tables):
+    result = {}
+    with connection.cursor() as cursor:
+        for table in tables:
+            cursor.execute("SELECT pg_relation_size(%s)", [table])
+            rows = [(table, cursor.fetchone()[0])]
+            cursor.execute(
+                "SELECT indexrelname, pg_relation_size(indexrelid) FROM pg_stat_user_indexes WHERE relname = %s",
+                [table],
+            )
+            rows.extend(cursor.fetchall())
+            result[table] = rows
+    return result
+
+
+class Command(BaseCommand):
+    help = (
+        "Jadval va indekslar hajmini o'lchaydi (SQLite: dbstat, PostgreSQL: pg_relation_size). "
+        "--seed bilan vaqtinchalik ma'lumot qo'shib o'lchaydi va rollback qiladi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tables", default=",".join(DEFAULT_TABLES))
+        parser.add_argument("--seed", type=int, default=0, help="Har jadvalga nechta qator qo'shish")
+        parser.add_argument("--vacuum", action="store_true", help="O'lchashdan oldin VACUUM (faqat --seed'siz)")
+
+    def handle(self, *args, **options):
+        tables = [table.strip() for table in options["tables"].split(",") if table.strip()]
+        if connection.vendor not in ("sqlite", "postgresql"):
+            raise CommandError("Faqat SQLite va PostgreSQL qo'llab-quvvatlanadi")
+
+        if options["seed"]:
+            with rolled_back():
+                self._seed(options["seed"])
+                self._report(tables)
+            return
+
+        if options["vacuum"]:
+            with connection.cursor() as cursor:
+                cursor.execute("VACUUM")
+        self._report(tables)
+
+    def _seed(self, count):
+        categories, subcategories = seed_taxonomy()
+        bulk_seed(Application, application_factory(categories, subcategories), 0, count)
+
+        regions = [value for value, _ in REGION_CHOICES]
+        themes = [value for value, _ in CONTACT_THEME_CHOICES]
+        now = timezone.now()
+        bulk_seed(Blog, lambda i: Blog(
+            title=f"Benchmark {i}", slug=f"benchmark-{i}", description="benchmark", content="",
+            region=regions[i % len(regions)], created_date=now - timedelta(minutes=i),
+        ), 0, count)
+        bulk_seed(ContactUs, lambda i: ContactUs(
+            full_name=f"Benchmark {i}", email=f"b{i}@example.com", theme=themes[i % len(themes)],
+            message="benchmark",
+        ), 0, count)
+
+    def _report(self, tables):
+        sizes = _sqlite_sizes(tables) if connection.vendor == "sqlite" else _postgres_sizes(tables)
+        grand_total = 0
+        for table in tables:
+            rows = sorted(sizes.get(table, []), key=lambda row: (row[0] != table, row[0]))
+            total = sum(size for _, size in rows)
+            grand_total += total
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{table}: {total / 1024:.1f} KiB"))
+            for name, size in rows:
+                self.stdout.write(f"  {name:<45} {size / 1024:10.1f} KiB")
+        self.stdout.write(self.style.SUCCESS(f"Jami: {grand_total / 1024:.1f} KiB"))
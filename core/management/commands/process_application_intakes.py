@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from core.intake import claim, process, prune_finished
+
+
+class Command(BaseCommand):
+    help = (
+        "Asinxron qabul qilingan arizalarni (POST /api/applications/?async=1) yaratadi: "
+        "slug, video/document va imgbb'ga rasmlar. Navbat bo'shaguncha ishlaydi; "
+        "--interval berilsa doimiy worker sifatida kutib turadi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval", type=float, default=0,
+            help="Navbat bo'sh bo'lsa N soniya kutib qayta tekshiradi (0 - bir marta bo'shatib chiqish)",
+        )
+        parser.add_argument("--limit", type=int, default=0, help="Ko'pi bilan N ta yozuv (0 - cheklovsiz)")
+
+    def handle(self, *args, **options):
+        if options["interval"] < 0 or options["limit"] < 0:
+            raise CommandError("--interval va --limit manfiy bo'lmasligi kerak")
+        pruned = prune_finished()
+        if pruned:
+            self.stdout.write(f"{pruned} ta eski intake yozuvi o'chirildi")
+
+        processed = 0
+        while not options["limit"] or processed < options["limit"]:
+            close_old_connections()
+            intake = claim()
+            if intake is None:
+                if not options["interval"]:
+                    break
+                time.sleep(options["interval"])
+                continue
+            started = time.perf_counter()
+            state = process(intake)
+            elapsed = (time.perf_counter() - started) * 1000
+            processed += 1
+            line = f"{intake.pk}: {state} ({elapsed:.0f} ms)"
+            self.stdout.write(self.style.SUCCESS(line) if state == "completed" else self.style.WARNING(line))
+        self.stdout.write(f"{processed} ta yozuv ishlandi")
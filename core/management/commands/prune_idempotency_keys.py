@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.idempotency import prune_expired
+
+
+class Command(BaseCommand):
+    help = "Muddati (IDEMPOTENCY_KEY_TTL) o'tgan Idempotency-Key yozuvlarini o'chiradi"
+
+    def handle(self, *args, **options):
+        deleted = prune_expired()
+        self.stdout.write(self.style.SUCCESS(f"{deleted} ta kalit o'chirildi"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.sync import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = "SYNC_TOMBSTONE_TTL_DAYS dan eski tombstone yozuvlarini o'chiradi"
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(f"{deleted} ta tombstone o'chirildi"))
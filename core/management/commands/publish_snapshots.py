@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.snapshots import SNAPSHOTS, publish
+
+
+class Command(BaseCommand):
+    help = "Ommaviy kontent uchun statik JSON snapshotlarni qayta yaratadi"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "names", nargs="*",
+            help=f"Snapshot nomlari ({', '.join(SNAPSHOTS)}). Bo'sh bo'lsa hammasi.",
+        )
+
+    def handle(self, *args, **options):
+        names = options["names"] or list(SNAPSHOTS)
+        unknown = [name for name in names if name not in SNAPSHOTS]
+        if unknown:
+            raise CommandError(f"Noma'lum snapshot: {', '.join(unknown)}")
+
+        for name in names:
+            filename = publish(name)
+            self.stdout.write(self.style.SUCCESS(f"{name}: {filename}"))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from core.leaderboard import refresh
+from core.models import BlogLeaderboard
+
+
+class Command(BaseCommand):
+    help = (
+        "Eng ko'p o'qilgan bloglar reytingini to'liq qayta hisoblaydi. Deploy'da "
+        "va cron orqali (masalan, har kuni yarim tunda) ishga tushiring: API "
+        "reytingni o'zi hisoblamaydi"
+    )
+
+    def handle(self, *args, **options):
+        refresh()
+        rows = BlogLeaderboard.objects.count()
+        self.stdout.write(self.style.SUCCESS(f"Reyting yangilandi ({rows} ta qator)"))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from core.search import is_available, rebuild
+
+
+class Command(BaseCommand):
+    help = "Bloglar uchun FTS5 qidiruv indeksini qayta quradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        if not is_available():
+            self.stdout.write(self.style.WARNING("FTS5 faqat SQLite'da ishlaydi, qidiruv icontains'ga qaytadi"))
+            return
+        total = rebuild(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Qidiruv indeksi yangilandi ({total} ta blog)"))
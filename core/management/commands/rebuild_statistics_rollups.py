@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.stats import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "ApplicationRollup jadvalini arizalardan qayta quradi"
+
+    def handle(self, *args, **options):
+        rows = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f"{rows} ta rollup qatori yaratildi"))
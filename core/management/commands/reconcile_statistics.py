@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from core.stats import reconcile
+
+
+class Command(BaseCommand):
+    help = "Statistika hisoblagichlarini jadvallardan qayta sanab tuzatadi"
+
+    def handle(self, *args, **options):
+        drift = reconcile()
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Hisoblagichlar to'g'ri"))
+            return
+        for field, (old, new) in drift.items():
+            self.stdout.write(f"{field}: {old} -> {new}")
+        self.stdout.write(self.style.WARNING(f"{len(drift)} ta hisoblagich tuzatildi"))
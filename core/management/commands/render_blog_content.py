@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Blog, RENDERED_FIELDS
+from core.rendering import render_content
+
+
+class Command(BaseCommand):
+    help = (
+        "Bloglarning content_html, excerpt, reading_time va toc maydonlarini kontentdan "
+        "qayta hisoblaydi (core.rendering o'zgarganda)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument(
+            "--missing", action="store_true",
+            help="Faqat hali render qilinmagan (content_html bo'sh) bloglar",
+        )
+
+    def handle(self, *args, **options):
+        blogs = Blog.objects.order_by("pk").only("pk", "content")
+        if options["missing"]:
+            blogs = blogs.filter(content_html="").exclude(content="")
+
+        total = 0
+        batch = []
+        for blog in blogs.iterator(chunk_size=options["batch_size"]):
+            for field, value in render_content(blog.content).items():
+                setattr(blog, field, value)
+            batch.append(blog)
+            if len(batch) >= options["batch_size"]:
+                # bulk_update signal'siz: snapshot/qidiruv indeksiga ta'sir qilmaydi
+                Blog.objects.bulk_update(batch, RENDERED_FIELDS)
+                total += len(batch)
+                batch = []
+        if batch:
+            Blog.objects.bulk_update(batch, RENDERED_FIELDS)
+            total += len(batch)
+        self.stdout.write(self.style.SUCCESS(f"{total} ta blog render qilindi"))
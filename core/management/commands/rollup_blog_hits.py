@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.hits import compact_hits
+
+
+class Command(BaseCommand):
+    help = (
+        "Bir martalik: ko'rishlar buferga o'tgunga qadar yozilgan blog Hit "
+        "qatorlarini kunlik BlogViewDaily yig'indisiga aylantirib, o'zlarini "
+        "partiyalab o'chiradi. Qayta ishga tushirish xavfsiz (Hit qolmagan bo'lsa "
+        "hech narsa qilmaydi)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=5000,
+            help="Bitta tranzaksiyada o'chiriladigan Hit'lar soni (default: 5000)",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size musbat bo'lishi kerak")
+        total, batches = compact_hits(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{total} ta Hit {batches} partiyada siqildi"))
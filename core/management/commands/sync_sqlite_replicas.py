@@ -0,0 +1,46 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.routers import replica_aliases
+
+
+class Command(BaseCommand):
+    help = (
+        "SQLite primary bazasini DB_REPLICAS fayllariga nusxalaydi (sqlite3 backup API). "
+        "Nusxalash replica'ni o'qiyotgan jarayonlarni to'xtatmaydi: ular eski yoki "
+        "yangi holatni to'liq ko'radi. Lokal sinov uchun; Postgres'da oqimli replikatsiya ishlating."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=0, help="Berilsa, har N soniyada takrorlaydi")
+        parser.add_argument("--pages", type=int, default=1024, help="Bitta qadamda nusxalanadigan sahifalar")
+
+    def handle(self, *args, **options):
+        primary = settings.DATABASES["default"]
+        if "sqlite3" not in primary["ENGINE"]:
+            raise CommandError("Buyruq faqat SQLite primary uchun")
+        aliases = replica_aliases()
+        if not aliases:
+            raise CommandError("DB_REPLICAS sozlanmagan")
+
+        while True:
+            for alias in aliases:
+                started = time.perf_counter()
+                self._copy(str(primary["NAME"]), str(settings.DATABASES[alias]["NAME"]), options["pages"])
+                elapsed = (time.perf_counter() - started) * 1000
+                self.stdout.write(self.style.SUCCESS(f"{alias}: yangilandi ({elapsed:.0f} ms)"))
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
+
+    def _copy(self, source_name, target_name, pages):
+        source = sqlite3.connect(source_name)
+        target = sqlite3.connect(target_name, timeout=30)
+        try:
+            source.backup(target, pages=pages)
+        finally:
+            target.close()
+            source.close()
@@ -0,0 +1,69 @@
+"""
+So'rov darajasidagi database routing (core.routers bilan birga ishlaydi).
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from . import routers
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+# Xodimlar har doim eng yangi ma'lumotni ko'rishi kerak
+PRIMARY_ONLY_PREFIXES = ("/admin/",)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Xavfsiz metodli so'rovlarda o'qishlarni replica'ga ruxsat beradi. Yozuv
+    qilgan so'rovdan keyin klientga cookie qo'yiladi va DB_PIN_SECONDS davomida
+    uning o'qishlari primary'dan bo'ladi.
+
+    Sync va async: ASGI ostida zanjirdagi yagona sync middleware async view'larni
+    (core.asyncviews) yana thread ichida bajarishga majbur qilardi.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _enter(self, request):
+        if (
+            request.method not in SAFE_METHODS
+            or settings.DB_PIN_COOKIE_NAME in request.COOKIES
+            or request.path.startswith(PRIMARY_ONLY_PREFIXES)
+        ):
+            routers.pin_to_primary()
+
+    def _exit(self, response):
+        if routers.wrote_to_primary():
+            response.set_cookie(
+                settings.DB_PIN_COOKIE_NAME, "1", max_age=settings.DB_PIN_SECONDS,
+                httponly=True, samesite="Lax",
+            )
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not routers.replica_aliases():
+            return self.get_response(request)
+
+        tokens = routers.allow_replica_reads()
+        try:
+            self._enter(request)
+            return self._exit(self.get_response(request))
+        finally:
+            routers.reset(tokens)
+
+    async def __acall__(self, request):
+        if not routers.replica_aliases():
+            return await self.get_response(request)
+
+        tokens = routers.allow_replica_reads()
+        try:
+            self._enter(request)
+            return self._exit(await self.get_response(request))
+        finally:
+            routers.reset(tokens)
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.5 on 2026-10-19 05:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_applicationimage_created_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='district',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='banner',
+            name='updated_date',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='updated_date',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='updated_date',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='subcategory',
+            name='updated_date',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=50)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted_date', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['deleted_date'],
+                'indexes': [models.Index(fields=['deleted_date', 'id'], name='core_tombstone_deleted_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.5 on 2026-10-19 05:17
+
+from django.db import migrations, models
+
+
+def seed_counters(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    Application = apps.get_model('core', 'Application')
+    ContactUs = apps.get_model('core', 'ContactUs')
+    StatisticsCounter = apps.get_model('core', 'StatisticsCounter')
+
+    StatisticsCounter.objects.update_or_create(pk=1, defaults={
+        'total_applications': Application.objects.count(),
+        'accepted_applications': Application.objects.filter(status='accepted').count(),
+        'denied_applications': Application.objects.filter(status='denied').count(),
+        'pending_applications': Application.objects.filter(status='pending').count(),
+        'total_users': User.objects.count(),
+        'total_blogs': apps.get_model('core', 'Blog').objects.count(),
+        'total_categories': apps.get_model('core', 'Category').objects.count(),
+        'total_subcategories': apps.get_model('core', 'Subcategory').objects.count(),
+        'total_banners': apps.get_model('core', 'Banner').objects.count(),
+        'total_contacts': ContactUs.objects.count(),
+        'unread_contacts': ContactUs.objects.filter(is_read=False).count(),
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0014_updated_date_tombstone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatisticsCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_applications', models.IntegerField(default=0)),
+                ('accepted_applications', models.IntegerField(default=0)),
+                ('denied_applications', models.IntegerField(default=0)),
+                ('pending_applications', models.IntegerField(default=0)),
+                ('total_users', models.IntegerField(default=0)),
+                ('total_blogs', models.IntegerField(default=0)),
+                ('total_categories', models.IntegerField(default=0)),
+                ('total_subcategories', models.IntegerField(default=0)),
+                ('total_banners', models.IntegerField(default=0)),
+                ('total_contacts', models.IntegerField(default=0)),
+                ('unread_contacts', models.IntegerField(default=0)),
+                ('updated_date', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Statistics Counter',
+                'verbose_name_plural': 'Statistics Counters',
+            },
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.5 on 2026-10-19 05:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def build_rollups(apps, schema_editor):
+    Application = apps.get_model('core', 'Application')
+    ApplicationRollup = apps.get_model('core', 'ApplicationRollup')
+
+    rows = (
+        Application.objects.order_by()
+        .annotate(day=TruncDate('created_date'))
+        .values('day', 'region', 'category_id', 'subcategory_id', 'status')
+        .annotate(count=Count('id'))
+    )
+    ApplicationRollup.objects.bulk_create(
+        [ApplicationRollup(**row) for row in rows], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_statisticscounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('region', models.CharField(choices=[('Toshkent', 'Toshkent'), ('Samarqand', 'Samarqand'), ('Buxoro', 'Buxoro'), ("Farg'ona", "Farg'ona"), ('Andijon', 'Andijon'), ('Namangan', 'Namangan'), ('Qashqadaryo', 'Qashqadaryo'), ('Surxondaryo', 'Surxondaryo'), ('Jizzax', 'Jizzax'), ('Sirdaryo', 'Sirdaryo'), ('Xorazm', 'Xorazm'), ('Navoiy', 'Navoiy'), ("Qoraqalpog'iston", "Qoraqalpog'iston")], max_length=50)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('accepted', 'Accepted'), ('denied', 'Denied')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('category', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='core.category')),
+                ('subcategory', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='core.subcategory')),
+            ],
+            options={
+                'verbose_name': 'Application Rollup',
+                'verbose_name_plural': 'Application Rollups',
+                'ordering': ['-day'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'region', 'category', 'subcategory', 'status'), name='core_application_rollup_key')],
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-19 05:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_applicationrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogViewDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('blog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_views', to='core.blog')),
+            ],
+            options={
+                'verbose_name': 'Blog Daily Views',
+                'verbose_name_plural': 'Blog Daily Views',
+                'ordering': ['-day'],
+                'indexes': [models.Index(fields=['day', 'blog'], name='core_blogviewdaily_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('blog', 'day'), name='core_blog_view_daily_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-19 05:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_blogviewdaily'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogLeaderboard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window', models.CharField(choices=[('7d', '7 kun'), ('30d', '30 kun'), ('all', 'Hammasi')], max_length=5)),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('computed_day', models.DateField()),
+                ('blog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.blog')),
+            ],
+            options={
+                'verbose_name': 'Blog Leaderboard',
+                'verbose_name_plural': 'Blog Leaderboard',
+                'ordering': ['window', '-views'],
+                'indexes': [models.Index(fields=['window', '-views'], name='core_leaderboard_rank_idx'), models.Index(fields=['computed_day'], name='core_leaderboard_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('window', 'blog'), name='core_blog_leaderboard_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,75 @@
+from html.parser import HTMLParser
+
+from django.db import migrations
+
+# Migratsiya jonli koddan (core.search, core.rendering) mustaqil bo'lishi
+# uchun DDL va matn ajratish shu yerda muzlatilgan
+FTS_TABLE = "core_blog_fts"
+CREATE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, description, body, "
+    "tokenize=\"unicode61 remove_diacritics 2 tokenchars '''ʻʼ‘’'\")"
+)
+DROP_SQL = f"DROP TABLE IF EXISTS {FTS_TABLE}"
+
+DROP_CONTENT_TAGS = {"script", "style", "object", "embed", "form", "noscript", "template"}
+BLOCK_TAGS = {"p", "div", "br", "li", "h1", "h2", "h3", "h4", "h5", "h6", "tr", "td", "th", "blockquote"}
+
+
+class TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self._skip += 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS and self._skip:
+            self._skip -= 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def html_to_text(value):
+    parser = TextExtractor()
+    parser.feed(value or "")
+    parser.close()
+    return " ".join("".join(parser.parts).split())
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    Blog = apps.get_model("core", "Blog")
+    schema_editor.execute(CREATE_SQL)
+    for blog in Blog.objects.order_by("pk").iterator():
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, description, body) VALUES (%s, %s, %s, %s)",
+            [blog.pk, blog.title, blog.description, html_to_text(blog.content)],
+        )
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0018_blogleaderboard"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.5 on 2026-10-19 05:27
+
+import re
+
+from django.db import migrations, models
+
+
+def backfill_search_fields(apps, schema_editor):
+    Application = apps.get_model('core', 'Application')
+
+    batch = []
+    for application in Application.objects.order_by('pk').only('pk', 'phone_number', 'passport_number').iterator(chunk_size=1000):
+        application.phone_digits = re.sub(r'\D', '', application.phone_number or '')
+        application.passport_normalized = re.sub(r'[^0-9A-Za-z]', '', application.passport_number or '').upper()
+        batch.append(application)
+        if len(batch) >= 1000:
+            Application.objects.bulk_update(batch, ['phone_digits', 'passport_normalized'])
+            batch = []
+    if batch:
+        Application.objects.bulk_update(batch, ['phone_digits', 'passport_normalized'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_blog_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='passport_normalized',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=50),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='phone_digits',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=20),
+        ),
+        migrations.RunPython(backfill_search_fields, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.5 on 2026-10-19 05:30
+
+from django.db import migrations, models
+
+# core.rendering modellarni import qilmaydi; keyingi render o'zgarishlari
+# mavjud bloglarga render_blog_content buyrug'i bilan qo'llanadi
+from core.rendering import render_content
+
+
+def render_blogs(apps, schema_editor):
+    Blog = apps.get_model('core', 'Blog')
+    fields = ['content_html', 'excerpt', 'reading_time', 'toc']
+
+    batch = []
+    for blog in Blog.objects.order_by('pk').only('pk', 'content').iterator(chunk_size=200):
+        for field, value in render_content(blog.content).items():
+            setattr(blog, field, value)
+        batch.append(blog)
+        if len(batch) >= 200:
+            Blog.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        Blog.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_application_search_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='reading_time',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='toc',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.RunPython(render_blogs, migrations.RunPython.noop),
+    ]
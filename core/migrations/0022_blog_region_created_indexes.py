@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-19 05:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_blog_render_fields'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['-created_date'], name='core_blog_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['region', '-created_date'], name='core_blog_region_created_idx'),
+        ),
+    ]
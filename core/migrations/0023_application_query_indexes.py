@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-19 05:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_blog_region_created_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['-created_date', '-id'], name='core_app_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['status', '-created_date', '-id'], name='core_app_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['region', '-created_date', '-id'], name='core_app_region_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['category', '-created_date', '-id'], name='core_app_category_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['subcategory', '-created_date', '-id'], name='core_app_subcat_created_idx'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.5 on 2026-10-19 05:34
+
+import core.fields
+from django.db import migrations
+
+# (model, maydon): varchar qiymatlar kodga (choices'dagi o'rin + 1) aylantiriladi.
+# Kodlar avval matn ko'rinishida yoziladi, AlterField ularni smallint'ga o'giradi.
+CODED_FIELDS = [
+    ('application', 'region'),
+    ('application', 'status'),
+    ('blog', 'region'),
+    ('contactus', 'theme'),
+]
+
+
+def _codes(model, field_name):
+    choices = model._meta.get_field(field_name).flatchoices
+    return [(value, str(code)) for code, (value, _) in enumerate(choices, start=1)]
+
+
+def encode_choices(apps, schema_editor):
+    for model_name, field_name in CODED_FIELDS:
+        model = apps.get_model('core', model_name)
+        for value, code in _codes(model, field_name):
+            model.objects.filter(**{field_name: value}).update(**{field_name: code})
+
+
+def decode_choices(apps, schema_editor):
+    for model_name, field_name in CODED_FIELDS:
+        model = apps.get_model('core', model_name)
+        for value, code in _codes(model, field_name):
+            model.objects.filter(**{field_name: code}).update(**{field_name: value})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_application_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(encode_choices, decode_choices),
+        migrations.AlterField(
+            model_name='application',
+            name='region',
+            field=core.fields.CodedChoiceField(choices=[('Toshkent', 'Toshkent'), ('Samarqand', 'Samarqand'), ('Buxoro', 'Buxoro'), ("Farg'ona", "Farg'ona"), ('Andijon', 'Andijon'), ('Namangan', 'Namangan'), ('Qashqadaryo', 'Qashqadaryo'), ('Surxondaryo', 'Surxondaryo'), ('Jizzax', 'Jizzax'), ('Sirdaryo', 'Sirdaryo'), ('Xorazm', 'Xorazm'), ('Navoiy', 'Navoiy'), ("Qoraqalpog'iston", "Qoraqalpog'iston")]),
+        ),
+        migrations.AlterField(
+            model_name='application',
+            name='status',
+            field=core.fields.CodedChoiceField(choices=[('pending', 'Pending'), ('accepted', 'Accepted'), ('denied', 'Denied')], default='pending'),
+        ),
+        migrations.AlterField(
+            model_name='blog',
+            name='region',
+            field=core.fields.CodedChoiceField(choices=[('Toshkent', 'Toshkent'), ('Samarqand', 'Samarqand'), ('Buxoro', 'Buxoro'), ("Farg'ona", "Farg'ona"), ('Andijon', 'Andijon'), ('Namangan', 'Namangan'), ('Qashqadaryo', 'Qashqadaryo'), ('Surxondaryo', 'Surxondaryo'), ('Jizzax', 'Jizzax'), ('Sirdaryo', 'Sirdaryo'), ('Xorazm', 'Xorazm'), ('Navoiy', 'Navoiy'), ("Qoraqalpog'iston", "Qoraqalpog'iston")]),
+        ),
+        migrations.AlterField(
+            model_name='contactus',
+            name='theme',
+            field=core.fields.CodedChoiceField(choices=[('Ehson haqida', 'Ehson haqida'), ('Hamkorlik', 'Hamkorlik'), ('Texnik masala', 'Texnik masala'), ('Boshqa', 'Boshqa')]),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Faqat PostgreSQL: trigram va partial indekslar. Boshqa bazalarda hech narsa qilmaydi.
+
+from django.db import migrations
+
+INDEXES = {
+    # full_name__icontains Postgres'da UPPER("full_name"::text) LIKE UPPER(...) bo'ladi
+    'core_app_full_name_trgm': (
+        'CREATE INDEX CONCURRENTLY IF NOT EXISTS core_app_full_name_trgm '
+        'ON core_application USING gin (UPPER(full_name::text) gin_trgm_ops)'
+    ),
+    # Ko'rib chiqilmagan arizalar navbati: jadvalning kichik qismi
+    'core_app_pending_created_idx': (
+        'CREATE INDEX CONCURRENTLY IF NOT EXISTS core_app_pending_created_idx '
+        'ON core_application (created_date DESC, id DESC) WHERE status = {pending}'
+    ),
+}
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Application = apps.get_model('core', 'Application')
+    pending = Application._meta.get_field('status').code_for('pending')
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for sql in INDEXES.values():
+        schema_editor.execute(sql.format(pending=pending))
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY tranzaksiya ichida ishlamaydi
+    atomic = False
+
+    dependencies = [
+        ('core', '0024_coded_choice_fields'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
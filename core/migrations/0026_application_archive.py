@@ -0,0 +1,79 @@
+# Generated by Django 5.2.5 on 2026-10-19 05:46
+
+import core.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_closed_date(apps, schema_editor):
+    # Haqiqiy yopilish vaqti saqlanmagan: eng yaqin taxmin - yaratilgan vaqt
+    Application = apps.get_model('core', 'Application')
+    Application.objects.exclude(status='pending').update(closed_date=models.F('created_date'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_postgres_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='closed_date',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_closed_date, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='ArchivedApplication',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField(db_index=True)),
+                ('full_name', models.CharField(max_length=255)),
+                ('phone_number', models.CharField(max_length=20)),
+                ('birth_date', models.DateField()),
+                ('passport_number', models.CharField(max_length=50)),
+                ('region', core.fields.CodedChoiceField(choices=[('Toshkent', 'Toshkent'), ('Samarqand', 'Samarqand'), ('Buxoro', 'Buxoro'), ("Farg'ona", "Farg'ona"), ('Andijon', 'Andijon'), ('Namangan', 'Namangan'), ('Qashqadaryo', 'Qashqadaryo'), ('Surxondaryo', 'Surxondaryo'), ('Jizzax', 'Jizzax'), ('Sirdaryo', 'Sirdaryo'), ('Xorazm', 'Xorazm'), ('Navoiy', 'Navoiy'), ("Qoraqalpog'iston", "Qoraqalpog'iston")])),
+                ('district', models.CharField(blank=True, max_length=100)),
+                ('location', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('video', models.FileField(blank=True, null=True, upload_to='temp/')),
+                ('video_url', models.URLField(blank=True, max_length=500)),
+                ('document', models.FileField(blank=True, null=True, upload_to='temp/')),
+                ('document_url', models.URLField(blank=True, max_length=500)),
+                ('slug', models.SlugField()),
+                ('created_date', models.DateTimeField()),
+                ('status', core.fields.CodedChoiceField(choices=[('pending', 'Pending'), ('accepted', 'Accepted'), ('denied', 'Denied')])),
+                ('denied_reason', models.TextField(blank=True, null=True)),
+                ('phone_digits', models.CharField(blank=True, db_index=True, max_length=20)),
+                ('passport_normalized', models.CharField(blank=True, db_index=True, max_length=50)),
+                ('closed_date', models.DateTimeField(blank=True, null=True)),
+                ('archived_date', models.DateTimeField(auto_now_add=True)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_applications', to='core.category')),
+                ('subcategory', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_applications', to='core.subcategory')),
+            ],
+            options={
+                'verbose_name': 'Archived Application',
+                'verbose_name_plural': 'Archived Applications',
+                'ordering': ['-created_date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedApplicationImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('image', models.ImageField(blank=True, upload_to='temp/')),
+                ('image_url', models.URLField(blank=True, max_length=500)),
+                ('created_date', models.DateTimeField()),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='images', to='core.archivedapplication')),
+            ],
+            options={
+                'verbose_name': 'Archived Application Image',
+                'verbose_name_plural': 'Archived Application Images',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedapplication',
+            index=models.Index(fields=['-created_date', '-id'], name='core_archapp_created_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-19 06:02
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0027_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationIntake',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('state', models.CharField(choices=[('queued', 'Queued'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('data', models.JSONField(default=dict)),
+                ('files', models.JSONField(default=dict)),
+                ('images_total', models.PositiveIntegerField(default=0)),
+                ('images_done', models.PositiveIntegerField(default=0)),
+                ('slug', models.SlugField(blank=True)),
+                ('error', models.JSONField(blank=True, null=True)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('retry_date', models.DateTimeField(blank=True, null=True)),
+                ('created_date', models.DateTimeField(auto_now_add=True)),
+                ('started_date', models.DateTimeField(blank=True, null=True)),
+                ('finished_date', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Application Intake',
+                'verbose_name_plural': 'Application Intakes',
+                'ordering': ['created_date'],
+                'indexes': [models.Index(fields=['state', 'created_date'], name='core_intake_state_idx'), models.Index(fields=['finished_date'], name='core_intake_finished_idx')],
+            },
+        ),
+    ]
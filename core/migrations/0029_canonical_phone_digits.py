@@ -0,0 +1,23 @@
+from django.db import migrations
+from django.db.models import Value
+from django.db.models.functions import Concat, Length
+
+
+def canonicalize_phone_digits(apps, schema_editor):
+    # 0020 mahalliy raqamlarni ("90 123 45 67") davlat kodisiz saqlagan edi
+    for model_name in ('Application', 'ArchivedApplication'):
+        model = apps.get_model('core', model_name)
+        model.objects.annotate(digits_length=Length('phone_digits')).filter(digits_length=9).update(
+            phone_digits=Concat(Value('998'), 'phone_digits')
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0028_application_intake'),
+    ]
+
+    operations = [
+        migrations.RunPython(canonicalize_phone_digits, migrations.RunPython.noop),
+    ]
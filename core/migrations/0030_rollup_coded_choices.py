@@ -0,0 +1,48 @@
+# Generated by Django 5.2.5 on 2026-10-19 07:06
+
+import core.fields
+from django.db import migrations
+
+# 0024 dagi kabi: rollup'ning varchar region/status qiymatlari kodga
+# (choices'dagi o'rin + 1) aylantiriladi, so'ng AlterField smallint'ga o'giradi.
+CODED_FIELDS = ['region', 'status']
+
+
+def _codes(model, field_name):
+    choices = model._meta.get_field(field_name).flatchoices
+    return [(value, str(code)) for code, (value, _) in enumerate(choices, start=1)]
+
+
+def encode_choices(apps, schema_editor):
+    model = apps.get_model('core', 'applicationrollup')
+    for field_name in CODED_FIELDS:
+        for value, code in _codes(model, field_name):
+            model.objects.filter(**{field_name: value}).update(**{field_name: code})
+
+
+def decode_choices(apps, schema_editor):
+    model = apps.get_model('core', 'applicationrollup')
+    for field_name in CODED_FIELDS:
+        for value, code in _codes(model, field_name):
+            model.objects.filter(**{field_name: code}).update(**{field_name: value})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0029_canonical_phone_digits'),
+    ]
+
+    operations = [
+        migrations.RunPython(encode_choices, decode_choices),
+        migrations.AlterField(
+            model_name='applicationrollup',
+            name='region',
+            field=core.fields.CodedChoiceField(choices=[('Toshkent', 'Toshkent'), ('Samarqand', 'Samarqand'), ('Buxoro', 'Buxoro'), ("Farg'ona", "Farg'ona"), ('Andijon', 'Andijon'), ('Namangan', 'Namangan'), ('Qashqadaryo', 'Qashqadaryo'), ('Surxondaryo', 'Surxondaryo'), ('Jizzax', 'Jizzax'), ('Sirdaryo', 'Sirdaryo'), ('Xorazm', 'Xorazm'), ('Navoiy', 'Navoiy'), ("Qoraqalpog'iston", "Qoraqalpog'iston")]),
+        ),
+        migrations.AlterField(
+            model_name='applicationrollup',
+            name='status',
+            field=core.fields.CodedChoiceField(choices=[('pending', 'Pending'), ('accepted', 'Accepted'), ('denied', 'Denied')]),
+        ),
+    ]
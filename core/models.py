@@ -1,12 +1,19 @@
+import re
+import uuid
 import requests
 import base64
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from django.utils.text import slugify
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from ckeditor_uploader.fields import RichTextUploadingField
 from hitcount.models import HitCountMixin, HitCount
 from django.contrib.contenttypes.fields import GenericRelation
 from django.contrib.auth.models import User
+from .fields import CodedChoiceField
+from .rendering import render_content
 
 CONTACT_THEME_CHOICES = [
     ('Ehson haqida', 'Ehson haqida'),
@@ -31,15 +38,13 @@ REGION_CHOICES = [
         ('Qoraqalpog\'iston', 'Qoraqalpog\'iston'),
     ]
 
-IMGBB_API_KEY = "be90fbfa79386858ac1e2259531ab55e"
-
 
 def upload_to_imgbb(image_field):
     """Rasmni imgbb ga yuklab, URL qaytaradi"""
     image_file = image_field.file
-    url = "https://api.imgbb.com/1/upload"
+    url = settings.IMGBB_UPLOAD_URL
     payload = {
-        "key": IMGBB_API_KEY,
+        "key": settings.IMGBB_API_KEY,
         "image": base64.b64encode(image_file.read()),
     }
     res = requests.post(url, payload)
@@ -65,6 +70,7 @@ class Banner(models.Model):
     image = models.ImageField(upload_to="temp/")
     image_url = models.URLField(max_length=500, blank=True)
     created_date = models.DateTimeField(auto_now_add=True)
+    updated_date = models.DateTimeField(auto_now=True, db_index=True)
     is_active = models.BooleanField(default=True)
 
     def save(self, *args, **kwargs):
@@ -112,7 +118,7 @@ class About(models.Model):
 class ContactUs(models.Model):
     full_name = models.CharField(max_length=100)
     email = models.EmailField()
-    theme = models.CharField(max_length=50, choices=CONTACT_THEME_CHOICES)
+    theme = CodedChoiceField(choices=CONTACT_THEME_CHOICES)
     message = models.TextField()
     created_date = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
@@ -127,16 +133,26 @@ class ContactUs(models.Model):
 
 
 # ---------------- Blog ----------------
+RENDERED_FIELDS = ("content_html", "excerpt", "reading_time", "toc")
+
+
 class Blog(models.Model, HitCountMixin):
     title = models.CharField(max_length=200)
     description = models.CharField(max_length=255)
     content = RichTextUploadingField()
-    region = models.CharField(max_length=100, choices=REGION_CHOICES)
+    region = CodedChoiceField(choices=REGION_CHOICES)
     image = models.ImageField(upload_to="temp/")
     image_url = models.URLField(max_length=500, blank=True)
     created_date = models.DateTimeField(auto_now_add=True)
+    updated_date = models.DateTimeField(auto_now=True, db_index=True)
     slug = models.SlugField(unique=True, blank=True)
 
+    # content'dan save'da hisoblanadigan render natijalari (core/rendering.py)
+    content_html = models.TextField(blank=True, editable=False)
+    excerpt = models.TextField(blank=True, editable=False)
+    reading_time = models.PositiveSmallIntegerField(default=0, editable=False)
+    toc = models.JSONField(default=list, blank=True, editable=False)
+
     hit_count_generic = GenericRelation(
         HitCount,
         object_id_field="object_pk",
@@ -152,6 +168,13 @@ class Blog(models.Model, HitCountMixin):
                 raise e
         if not self.slug:
             self.slug = slugify(self.title)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "content" in update_fields:
+            for field, value in render_content(self.content).items():
+                setattr(self, field, value)
+            if update_fields is not None:
+                kwargs["update_fields"] = set(update_fields) | set(RENDERED_FIELDS)
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -159,6 +182,10 @@ class Blog(models.Model, HitCountMixin):
     
     class Meta:
         ordering = ['-created_date']
+        indexes = [
+            models.Index(fields=["-created_date"], name="core_blog_created_idx"),
+            models.Index(fields=["region", "-created_date"], name="core_blog_region_created_idx"),
+        ]
 
 
 # ---------------- Category ----------------
@@ -171,6 +198,7 @@ class Category(models.Model):
         related_name="categories",
         blank=True
     )
+    updated_date = models.DateTimeField(auto_now=True, db_index=True)
 
     def save(self, *args, **kwargs):
         if self.image and not self.image_url:
@@ -193,6 +221,7 @@ class Category(models.Model):
 class Subcategory(models.Model):
     title = models.CharField(max_length=100)
     slug = models.SlugField(unique=True, blank=True)
+    updated_date = models.DateTimeField(auto_now=True, db_index=True)
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -208,6 +237,56 @@ class Subcategory(models.Model):
         verbose_name_plural = "Subcategories"
 
 
+PHONE_COUNTRY_CODE = "998"
+LOCAL_PHONE_LENGTH = 9
+
+
+def normalize_phone(value):
+    """
+    Telefon raqamining kanonik shakli: faqat raqamlar, mahalliy raqamga davlat
+    kodi qo'shiladi ("+998 90 123-45-67" va "90 123 45 67" -> "998901234567")
+    """
+    digits = re.sub(r"\D", "", value or "")
+    if len(digits) == LOCAL_PHONE_LENGTH:
+        digits = PHONE_COUNTRY_CODE + digits
+    return digits
+
+
+def application_slug_base(full_name):
+    """
+    Ariza slug'ining asosi: unikal qilish uchun qo'shiladigan "-N" sig'ishi
+    uchun slug ustunidan 8 belgi qisqa
+    """
+    max_length = Application._meta.get_field("slug").max_length - 8
+    return slugify(full_name)[:max_length].strip("-")
+
+
+def application_slug_taken(slug, exclude_pk=None):
+    """
+    Slug asosiy jadvalda yoki arxivda band: arxivlangan ariza ham shu slug
+    bilan ochiladi (include_archived), shuning uchun u qayta berilmaydi
+    """
+    live = Application.objects.filter(slug=slug)
+    if exclude_pk is not None:
+        live = live.exclude(pk=exclude_pk)
+    return live.exists() or ArchivedApplication.objects.filter(slug=slug).exists()
+
+
+def unique_application_slug(full_name, exclude_pk=None):
+    base_slug = application_slug_base(full_name)
+    slug = base_slug
+    counter = 1
+    while application_slug_taken(slug, exclude_pk):
+        slug = f"{base_slug}-{counter}"
+        counter += 1
+    return slug
+
+
+def normalize_passport(value):
+    """Passport raqami: faqat harf/raqam, katta harflarda ("aa 123 45 67" -> "AA1234567")"""
+    return re.sub(r"[^0-9A-Za-z]", "", value or "").upper()
+
+
 # ---------------- Application ----------------
 class Application(models.Model):
     STATUS_CHOICES = [
@@ -220,7 +299,7 @@ class Application(models.Model):
     phone_number = models.CharField(max_length=20)
     birth_date = models.DateField()
     passport_number = models.CharField(max_length=50)
-    region = models.CharField(max_length=50, choices=REGION_CHOICES)
+    region = CodedChoiceField(choices=REGION_CHOICES)
     district = models.CharField(max_length=100, blank=True)
     location = models.CharField(max_length=255)
     category = models.ForeignKey("Category", on_delete=models.CASCADE)
@@ -235,13 +314,18 @@ class Application(models.Model):
     slug = models.SlugField(unique=True, blank=True)
     created_date = models.DateTimeField(auto_now_add=True)
 
-    status = models.CharField(
-        max_length=20,
+    status = CodedChoiceField(
         choices=STATUS_CHOICES,
         default="pending"
     )
     denied_reason = models.TextField(blank=True, null=True)
 
+    # Qidiruv uchun normallashtirilgan, indekslangan nusxalar (save'da to'ldiriladi)
+    phone_digits = models.CharField(max_length=20, blank=True, db_index=True, editable=False)
+    passport_normalized = models.CharField(max_length=50, blank=True, db_index=True, editable=False)
+    # Status pending'dan chiqqan vaqt; archive_applications shu bo'yicha tanlaydi
+    closed_date = models.DateTimeField(blank=True, null=True, db_index=True, editable=False)
+
     def clean(self):
         if self.subcategory and self.category not in self.subcategory.categories.all():
             raise ValidationError({
@@ -254,14 +338,24 @@ class Application(models.Model):
     def save(self, *args, **kwargs):
         self.clean()
         if not self.slug:
-            base_slug = slugify(self.full_name)
-            slug = base_slug
-            counter = 1
-            while Application.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-
+            self.slug = unique_application_slug(self.full_name)
+
+        self.phone_digits = normalize_phone(self.phone_number)
+        self.passport_normalized = normalize_passport(self.passport_number)
+        if self.status == "pending":
+            self.closed_date = None
+        elif self.closed_date is None:
+            self.closed_date = timezone.now()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if "phone_number" in update_fields:
+                update_fields.add("phone_digits")
+            if "passport_number" in update_fields:
+                update_fields.add("passport_normalized")
+            if "status" in update_fields:
+                update_fields.add("closed_date")
+            kwargs["update_fields"] = update_fields
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -269,6 +363,15 @@ class Application(models.Model):
     
     class Meta:
         ordering = ['-created_date']
+        # Har bir filtr (status/region/kategoriya/subkategoriya) -created_date bo'yicha
+        # tartiblanadi; id oxirida - admin qo'shadigan "-pk" ham indeksdan o'qiladi
+        indexes = [
+            models.Index(fields=["-created_date", "-id"], name="core_app_created_idx"),
+            models.Index(fields=["status", "-created_date", "-id"], name="core_app_status_created_idx"),
+            models.Index(fields=["region", "-created_date", "-id"], name="core_app_region_created_idx"),
+            models.Index(fields=["category", "-created_date", "-id"], name="core_app_category_created_idx"),
+            models.Index(fields=["subcategory", "-created_date", "-id"], name="core_app_subcat_created_idx"),
+        ]
 
 
 # ---------------- Application Image ----------------
@@ -296,4 +399,275 @@ class ApplicationImage(models.Model):
     
     class Meta:
         verbose_name = "Application Image"
-        verbose_name_plural = "Application Images"
\ No newline at end of file
+        verbose_name_plural = "Application Images"
+
+
+# ---------------- Archive ----------------
+class ArchivedApplication(models.Model):
+    """
+    Yopilganiga ko'p vaqt bo'lgan (accepted/denied) arizalar: asosiy jadval
+    kichik qolishi uchun `archive_applications` buyrug'i ularni shu yerga
+    ko'chiradi. Maydonlar Application bilan bir xil nomda, shuning uchun
+    filtrlar va qidiruv ikkala jadvalda ham ishlaydi. Statistika
+    hisoblagichlari va rollup'lar arxivlangan arizalarni ham o'z ichiga oladi.
+    """
+    # Application.id; SQLite id'ni qayta ishlatishi mumkin, shuning uchun pk emas
+    original_id = models.BigIntegerField(db_index=True)
+    full_name = models.CharField(max_length=255)
+    phone_number = models.CharField(max_length=20)
+    birth_date = models.DateField()
+    passport_number = models.CharField(max_length=50)
+    region = CodedChoiceField(choices=REGION_CHOICES)
+    district = models.CharField(max_length=100, blank=True)
+    location = models.CharField(max_length=255)
+    category = models.ForeignKey("Category", on_delete=models.CASCADE, related_name="archived_applications")
+    subcategory = models.ForeignKey("Subcategory", on_delete=models.CASCADE, related_name="archived_applications")
+    description = models.TextField()
+    video = models.FileField(upload_to="temp/", blank=True, null=True)
+    video_url = models.URLField(max_length=500, blank=True)
+    document = models.FileField(upload_to="temp/", blank=True, null=True)
+    document_url = models.URLField(max_length=500, blank=True)
+    slug = models.SlugField(db_index=True)
+    created_date = models.DateTimeField()
+    status = CodedChoiceField(choices=Application.STATUS_CHOICES)
+    denied_reason = models.TextField(blank=True, null=True)
+    phone_digits = models.CharField(max_length=20, blank=True, db_index=True)
+    passport_normalized = models.CharField(max_length=50, blank=True, db_index=True)
+    closed_date = models.DateTimeField(blank=True, null=True)
+    archived_date = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.full_name
+
+    class Meta:
+        ordering = ['-created_date']
+        verbose_name = "Archived Application"
+        verbose_name_plural = "Archived Applications"
+        indexes = [
+            models.Index(fields=["-created_date", "-id"], name="core_archapp_created_idx"),
+        ]
+
+
+class ArchivedApplicationImage(models.Model):
+    application = models.ForeignKey(
+        ArchivedApplication,
+        related_name="images",
+        on_delete=models.CASCADE
+    )
+    image = models.ImageField(upload_to="temp/", blank=True)
+    image_url = models.URLField(max_length=500, blank=True)
+    created_date = models.DateTimeField()
+
+    def __str__(self):
+        return f"Image for {self.application.full_name}"
+
+    class Meta:
+        verbose_name = "Archived Application Image"
+        verbose_name_plural = "Archived Application Images"
+
+
+# ---------------- Tombstone ----------------
+class Tombstone(models.Model):
+    """O'chirilgan obyektlar izi (sync feed uchun)"""
+    model = models.CharField(max_length=50)
+    object_id = models.BigIntegerField()
+    deleted_date = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.model} #{self.object_id} (deleted)"
+
+    class Meta:
+        ordering = ['deleted_date']
+        indexes = [
+            models.Index(fields=['deleted_date', 'id'], name='core_tombstone_deleted_idx'),
+        ]
+
+
+# ---------------- Statistics Counter ----------------
+class StatisticsCounter(models.Model):
+    """
+    StatisticsAPIView uchun oldindan hisoblangan hisoblagichlar (bitta qator).
+    Signal'lar orqali yangilanadi, `reconcile_statistics` farqni tuzatadi.
+    """
+    total_applications = models.IntegerField(default=0)
+    accepted_applications = models.IntegerField(default=0)
+    denied_applications = models.IntegerField(default=0)
+    pending_applications = models.IntegerField(default=0)
+    total_users = models.IntegerField(default=0)
+    total_blogs = models.IntegerField(default=0)
+    total_categories = models.IntegerField(default=0)
+    total_subcategories = models.IntegerField(default=0)
+    total_banners = models.IntegerField(default=0)
+    total_contacts = models.IntegerField(default=0)
+    unread_contacts = models.IntegerField(default=0)
+    updated_date = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return "Statistics counters"
+
+    class Meta:
+        verbose_name = "Statistics Counter"
+        verbose_name_plural = "Statistics Counters"
+
+
+# ---------------- Application Rollup ----------------
+class ApplicationRollup(models.Model):
+    """
+    Arizalar soni (kun, viloyat, kategoriya, subkategoriya, status) kesimida.
+    Breakdown statistikasi faqat shu jadvaldan o'qiladi.
+    """
+    day = models.DateField()
+    region = CodedChoiceField(choices=REGION_CHOICES)
+    # Kategoriya o'chirilganda arizalar signal orqali ayriladi, shuning uchun
+    # bu yerda CASCADE va DB constraint kerak emas
+    category = models.ForeignKey(
+        "Category", on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    subcategory = models.ForeignKey(
+        "Subcategory", on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    status = CodedChoiceField(choices=Application.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.day} {self.region} {self.status}: {self.count}"
+
+    class Meta:
+        verbose_name = "Application Rollup"
+        verbose_name_plural = "Application Rollups"
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'region', 'category', 'subcategory', 'status'],
+                name='core_application_rollup_key',
+            ),
+        ]
+
+
+# ---------------- Blog View Daily ----------------
+class BlogViewDaily(models.Model):
+    """Blog ko'rishlari kunlik yig'indisi (siqilgan Hit'lar va buferdan yozilganlar)"""
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name="daily_views")
+    day = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.blog} {self.day}: {self.views}"
+
+    class Meta:
+        verbose_name = "Blog Daily Views"
+        verbose_name_plural = "Blog Daily Views"
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(fields=['blog', 'day'], name='core_blog_view_daily_key'),
+        ]
+        indexes = [
+            models.Index(fields=['day', 'blog'], name='core_blogviewdaily_day_idx'),
+        ]
+
+
+# ---------------- Blog Leaderboard ----------------
+class BlogLeaderboard(models.Model):
+    """Eng ko'p o'qilgan bloglar (oyna bo'yicha oldindan hisoblangan)"""
+    WINDOW_CHOICES = [
+        ("7d", "7 kun"),
+        ("30d", "30 kun"),
+        ("all", "Hammasi"),
+    ]
+
+    window = models.CharField(max_length=5, choices=WINDOW_CHOICES)
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name="+")
+    views = models.PositiveIntegerField(default=0)
+    computed_day = models.DateField()
+
+    def __str__(self):
+        return f"{self.window}: {self.blog} ({self.views})"
+
+    class Meta:
+        verbose_name = "Blog Leaderboard"
+        verbose_name_plural = "Blog Leaderboard"
+        ordering = ['window', '-views']
+        constraints = [
+            models.UniqueConstraint(fields=['window', 'blog'], name='core_blog_leaderboard_key'),
+        ]
+        indexes = [
+            models.Index(fields=['window', '-views'], name='core_leaderboard_rank_idx'),
+            models.Index(fields=['computed_day'], name='core_leaderboard_day_idx'),
+        ]
+
+
+# ---------------- Idempotency Key ----------------
+class IdempotencyKey(models.Model):
+    """
+    `Idempotency-Key` sarlavhasi bilan kelgan POST so'rovining birinchi javobi.
+    Shu kalit bilan qayta yuborilgan so'rov view'ni qayta bajarmasdan shu javobni oladi.
+    """
+    STATE_CHOICES = [
+        ("processing", "Processing"),
+        ("completed", "Completed"),
+    ]
+
+    scope = models.CharField(max_length=50)
+    key = models.CharField(max_length=255)
+    # So'rov mazmuni (metod, yo'l, foydalanuvchi, maydonlar, fayllar) xeshi
+    fingerprint = models.CharField(max_length=64)
+    state = models.CharField(max_length=20, choices=STATE_CHOICES, default="processing")
+    response_status = models.PositiveSmallIntegerField(blank=True, null=True)
+    response_body = models.JSONField(blank=True, null=True, encoder=DjangoJSONEncoder)
+    created_date = models.DateTimeField(auto_now_add=True)
+    expires_date = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.scope}: {self.key} ({self.state})"
+
+    class Meta:
+        verbose_name = "Idempotency Key"
+        verbose_name_plural = "Idempotency Keys"
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'key'], name='core_idempotency_key'),
+        ]
+
+
+# ---------------- Application Intake ----------------
+class ApplicationIntake(models.Model):
+    """
+    Asinxron qabul qilingan ariza (?async=1): xom maydonlar va vaqtincha
+    saqlangan fayllar. `process_application_intakes` buyrug'i arizani yaratadi,
+    holat GET /api/applications/intake/<id>/ orqali kuzatiladi.
+    """
+    STATE_CHOICES = [
+        ("queued", "Queued"),
+        ("processing", "Processing"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    # Taxmin qilib bo'lmaydigan id: holat manzili autentifikatsiyasiz ochiq
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    state = models.CharField(max_length=20, choices=STATE_CHOICES, default="queued")
+    data = models.JSONField(default=dict)
+    # {"video": yo'l, "document": yo'l, "images": [yo'llar]} (default_storage'da)
+    files = models.JSONField(default=dict)
+    images_total = models.PositiveIntegerField(default=0)
+    images_done = models.PositiveIntegerField(default=0)
+    # Yaratilgan ariza (arxivlanishi mumkin, shuning uchun FK emas)
+    slug = models.SlugField(blank=True)
+    error = models.JSONField(blank=True, null=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Vaqtinchalik xatodan keyin navbatdagi urinish shu vaqtdan oldin olinmaydi
+    retry_date = models.DateTimeField(blank=True, null=True)
+    created_date = models.DateTimeField(auto_now_add=True)
+    started_date = models.DateTimeField(blank=True, null=True)
+    finished_date = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.data.get('full_name', '')} ({self.state})"
+
+    class Meta:
+        verbose_name = "Application Intake"
+        verbose_name_plural = "Application Intakes"
+        ordering = ['created_date']
+        indexes = [
+            models.Index(fields=['state', 'created_date'], name='core_intake_state_idx'),
+            models.Index(fields=['finished_date'], name='core_intake_finished_idx'),
+        ]
@@ -0,0 +1,128 @@
+"""
+Tashqi xizmatlar (Telegram, imgbb, Google sertifikatlari) uchun async HTTP.
+
+Async view'lar (core.asyncviews) javobni kutayotganda thread band qilmaydi.
+aiohttp sessiyasi event loop'ga bog'langan, shuning uchun har bir loop uchun
+bitta sessiya (ulanishlar pool'i, keep-alive) saqlanadi: uvicorn worker'ida bu
+butun jarayon uchun bitta sessiya, WSGI ostida (async_to_sync) esa so'rov
+loop'i bilan birga yopiladi.
+
+httpx emas: httpcore pool'i har bir so'rovda barcha ulanishlarni qayta ko'rib
+chiqadi va yuzlab parallel so'rovda event loop shu hisob bilan band bo'ladi
+(400 ta parallel so'rov, 200 ms kechikish: aiohttp bilan ~0.4 s, httpx bilan ~7.5 s).
+
+URL'lar sozlamalardan olinadi: benchmark_async_views ularni mahalliy
+stand-in serverlarga almashtiradi.
+"""
+import asyncio
+import base64
+import logging
+import re
+import time
+
+import aiohttp
+from django.conf import settings
+from google.auth import jwt as google_jwt
+
+logger = logging.getLogger(__name__)
+
+# Tarmoq, HTTP status (raise_for_status) va umumiy timeout xatolari
+ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+# Cache-Control'da max-age bo'lmasa sertifikatlar shuncha soniya saqlanadi
+GOOGLE_CERTS_DEFAULT_MAX_AGE = 3600
+TELEGRAM_TIMEOUT = 5
+
+_sessions = {}  # event loop -> (aiohttp.ClientSession, uni yopuvchi generator)
+_google_certs = {"certs": None, "expires": 0.0}
+
+
+def _timeout():
+    return getattr(settings, "OUTBOUND_HTTP_TIMEOUT", 30)
+
+
+def _max_connections():
+    return getattr(settings, "OUTBOUND_HTTP_MAX_CONNECTIONS", 200)
+
+
+async def _close_with_loop(loop, session):
+    # Loop yopilishidan oldin asyncio.run / async_to_sync shutdown_asyncgens()
+    # chaqiradi: shu generator yakunlanadi va sessiya ham yopiladi
+    try:
+        yield
+    finally:
+        _sessions.pop(loop, None)
+        await session.close()
+
+
+async def session():
+    """Joriy event loop'ning umumiy sessiyasi"""
+    loop = asyncio.get_running_loop()
+    entry = _sessions.get(loop)
+    if entry is None or entry[0].closed:
+        http = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=_max_connections()),
+            timeout=aiohttp.ClientTimeout(total=_timeout()),
+        )
+        closer = _close_with_loop(loop, http)
+        await closer.__anext__()
+        entry = _sessions[loop] = (http, closer)
+    return entry[0]
+
+
+async def send_telegram(text):
+    """Xabar guruhga yuboriladi; xato faqat log'ga yoziladi (so'rov to'xtamaydi)"""
+    url = f"{settings.TELEGRAM_API_URL}/bot{settings.TELEGRAM_BOT_TOKEN}/sendMessage"
+    params = {
+        "chat_id": settings.TELEGRAM_CHAT_ID,
+        "text": text,
+        "parse_mode": "Markdown",
+    }
+    try:
+        http = await session()
+        async with http.post(url, params=params, timeout=aiohttp.ClientTimeout(total=TELEGRAM_TIMEOUT)) as response:
+            response.raise_for_status()
+    except ERRORS as e:
+        logger.warning("Telegram xatosi: %r", e)
+
+
+async def upload_to_imgbb(image_file):
+    """Rasmni imgbb ga yuklab, URL qaytaradi (models.upload_to_imgbb'ning async varianti)"""
+    image_file.seek(0)
+    payload = {
+        "key": settings.IMGBB_API_KEY,
+        "image": base64.b64encode(image_file.read()).decode(),
+    }
+    http = await session()
+    async with http.post(settings.IMGBB_UPLOAD_URL, data=payload) as response:
+        response.raise_for_status()
+        data = await response.json()
+    return data["data"]["url"]
+
+
+def _max_age(response):
+    match = re.search(r"max-age=(\d+)", response.headers.get("Cache-Control", ""))
+    return int(match.group(1)) if match else GOOGLE_CERTS_DEFAULT_MAX_AGE
+
+
+async def google_certs():
+    """Google'ning ochiq sertifikatlari (kid -> PEM), Cache-Control muddatigacha xotirada"""
+    now = time.monotonic()
+    if _google_certs["certs"] is None or _google_certs["expires"] <= now:
+        http = await session()
+        async with http.get(settings.GOOGLE_CERTS_URL) as response:
+            response.raise_for_status()
+            _google_certs.update(certs=await response.json(), expires=now + _max_age(response))
+    return _google_certs["certs"]
+
+
+async def verify_google_token(token, audience):
+    """
+    google.oauth2.id_token.verify_oauth2_token'ning async varianti: imzo,
+    muddat, audience va issuer tekshiriladi. Xato: ValueError.
+    """
+    idinfo = google_jwt.decode(token, certs=await google_certs(), audience=audience)
+    if idinfo.get("iss") not in GOOGLE_ISSUERS:
+        raise ValueError(f"Noto'g'ri issuer: {idinfo.get('iss')}")
+    return idinfo
@@ -0,0 +1,263 @@
+"""
+Blog kontentidan saqlanadigan render natijalari.
+
+CKEditor'dan kelgan xom HTML har bir ko'rsatishda klientda qayta ishlanmasligi
+uchun `Blog.save` bir marta quyidagilarni hisoblaydi:
+
+- content_html: ruxsat etilgan teg/atributlar bilan tozalangan HTML; rasmlarga
+  loading="lazy", decoding="async" va (MEDIA ichidagi fayllar uchun) width/height
+- excerpt: ro'yxatlar uchun qisqa matn
+- reading_time: o'qish vaqti (daqiqa)
+- toc: h2/h3 sarlavhalaridan mundarija (sarlavhalarga id qo'yiladi)
+
+Modul modellarni import qilmaydi, shuning uchun models.py va migratsiyalar
+undan bemalol foydalanadi.
+"""
+import math
+import os
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import unquote, urlsplit
+
+from django.conf import settings
+from django.utils.text import slugify
+
+WORDS_PER_MINUTE = 200
+EXCERPT_LENGTH = 300
+TOC_LEVELS = {"h2": 2, "h3": 3}
+
+ALLOWED_TAGS = {
+    "a", "b", "blockquote", "br", "caption", "code", "div", "em", "figcaption", "figure",
+    "h1", "h2", "h3", "h4", "h5", "h6", "hr", "i", "iframe", "img", "li", "ol", "p", "pre",
+    "s", "span", "strong", "sub", "sup", "table", "tbody", "td", "tfoot", "th", "thead",
+    "tr", "u", "ul",
+}
+VOID_TAGS = {"br", "hr", "img"}
+# Butunlay tashlab yuboriladigan (ichidagi matn bilan birga) teglar
+DROP_CONTENT_TAGS = {"script", "style", "object", "embed", "form", "noscript", "template"}
+BLOCK_TAGS = {"p", "div", "br", "li", "h1", "h2", "h3", "h4", "h5", "h6", "tr", "td", "th", "blockquote"}
+
+ALLOWED_ATTRS = {
+    # style ruxsat etilmaydi: CSS orqali sahifani yashirish/qoplash va tracking mumkin
+    "*": {"class", "title"},
+    "a": {"href", "target", "rel"},
+    "img": {"src", "alt", "width", "height"},
+    "iframe": {"src", "width", "height", "allowfullscreen", "frameborder"},
+    "td": {"colspan", "rowspan"},
+    "th": {"colspan", "rowspan"},
+    "ol": {"start"},
+}
+URL_ATTRS = {"href", "src"}
+SAFE_SCHEMES = {"", "http", "https", "mailto", "tel"}
+IFRAME_HOSTS = {"www.youtube.com", "youtube.com", "www.youtube-nocookie.com", "player.vimeo.com"}
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self._skip += 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS and self._skip:
+            self._skip -= 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def html_to_text(value):
+    """CKEditor HTML'idan oddiy matn"""
+    parser = _TextExtractor()
+    parser.feed(value or "")
+    parser.close()
+    return " ".join("".join(parser.parts).split())
+
+
+def _safe_url(value):
+    value = (value or "").strip()
+    scheme = urlsplit(value).scheme.lower()
+    return value if scheme in SAFE_SCHEMES else None
+
+
+def image_size(src):
+    """MEDIA_ROOT ichidagi rasm uchun (width, height); topilmasa None"""
+    path = urlsplit(src or "").path
+    media_url = settings.MEDIA_URL
+    if not media_url or not path.startswith(media_url):
+        return None
+    media_root = os.path.realpath(settings.MEDIA_ROOT)
+    full_path = os.path.realpath(os.path.join(media_root, unquote(path[len(media_url):])))
+    if not full_path.startswith(media_root + os.sep) or not os.path.isfile(full_path):
+        return None
+    try:
+        from PIL import Image
+
+        # Faqat sarlavha o'qiladi, piksel ma'lumotlari yuklanmaydi
+        with Image.open(full_path) as image:
+            return image.size
+    except Exception:
+        return None
+
+
+class _Sanitizer(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self.toc = []
+        self._open = []
+        self._skip = 0
+        self._heading = None
+        self._slugs = set()
+
+    def _unique_slug(self, text):
+        base = slugify(text) or "section"
+        slug, counter = base, 1
+        while slug in self._slugs:
+            counter += 1
+            slug = f"{base}-{counter}"
+        self._slugs.add(slug)
+        return slug
+
+    def _clean_attrs(self, tag, attrs):
+        allowed = ALLOWED_ATTRS["*"] | ALLOWED_ATTRS.get(tag, set())
+        clean = {}
+        for name, value in attrs:
+            name = name.lower()
+            if name not in allowed:
+                continue
+            if name in URL_ATTRS:
+                value = _safe_url(value)
+                if value is None:
+                    continue
+            clean[name] = value
+        return clean
+
+    def _write_start(self, tag, attrs):
+        rendered = "".join(
+            f' {name}' if value is None else f' {name}="{escape(value)}"' for name, value in attrs.items()
+        )
+        self.out.append(f"<{tag}{rendered}>")
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip:
+            if tag in DROP_CONTENT_TAGS or tag == "iframe":
+                self._skip += 1
+            return
+        if tag in DROP_CONTENT_TAGS:
+            self._skip += 1
+            return
+        if tag not in ALLOWED_TAGS:
+            return
+
+        attrs = self._clean_attrs(tag, attrs)
+        if tag == "img":
+            if "src" not in attrs:
+                return
+            attrs.setdefault("loading", "lazy")
+            attrs.setdefault("decoding", "async")
+            if "width" not in attrs or "height" not in attrs:
+                size = image_size(attrs["src"])
+                if size:
+                    attrs["width"], attrs["height"] = str(size[0]), str(size[1])
+        elif tag == "iframe":
+            if urlsplit(attrs.get("src", "")).netloc.lower() not in IFRAME_HOSTS:
+                self._skip += 1
+                return
+            attrs.setdefault("loading", "lazy")
+        elif tag == "a" and attrs.get("target") == "_blank":
+            attrs["rel"] = "noopener noreferrer"
+
+        if tag in TOC_LEVELS and self._heading is None:
+            # Sarlavha matni yopilish tegida ma'lum bo'ladi: joyini saqlab qo'yamiz
+            self._heading = {"tag": tag, "index": len(self.out), "attrs": attrs, "text": []}
+            self.out.append("")
+        else:
+            self._write_start(tag, attrs)
+
+        if tag not in VOID_TAGS:
+            self._open.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        skip = self._skip
+        self.handle_starttag(tag, attrs)
+        if self._skip > skip:
+            # <iframe ... /> kabi o'z-o'zini yopgan tashlab yuborilgan teg
+            self._skip = skip
+        elif tag not in VOID_TAGS and self._open and self._open[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self._skip:
+            if tag in DROP_CONTENT_TAGS or tag == "iframe":
+                self._skip -= 1
+            return
+        if tag not in self._open:
+            return
+        # Yopilmagan ichki teglarni ham yopamiz
+        while self._open:
+            current = self._open.pop()
+            self._close(current)
+            if current == tag:
+                break
+
+    def _close(self, tag):
+        heading = self._heading
+        if heading is not None and heading["tag"] == tag:
+            title = " ".join("".join(heading["text"]).split())
+            attrs = heading["attrs"]
+            if title:
+                attrs["id"] = self._unique_slug(title)
+                self.toc.append({"level": TOC_LEVELS[tag], "id": attrs["id"], "title": title})
+            start = len(self.out)
+            self._write_start(tag, attrs)
+            self.out[heading["index"]] = self.out.pop(start)
+            self._heading = None
+        self.out.append(f"</{tag}>")
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        if self._heading is not None:
+            self._heading["text"].append(data)
+        self.out.append(escape(data, quote=False))
+
+    def close(self):
+        super().close()
+        while self._open:
+            self._close(self._open.pop())
+
+
+def make_excerpt(text, length=EXCERPT_LENGTH):
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(" ", 1)[0] or text[:length]
+    return cut.rstrip(" ,.;:-") + "…"
+
+
+def reading_time(text):
+    words = len(text.split())
+    return max(1, math.ceil(words / WORDS_PER_MINUTE)) if words else 0
+
+
+def render_content(content):
+    """Qaytaradi: {"content_html", "excerpt", "reading_time", "toc"}"""
+    sanitizer = _Sanitizer()
+    sanitizer.feed(content or "")
+    sanitizer.close()
+    text = html_to_text(content)
+    return {
+        "content_html": "".join(sanitizer.out),
+        "excerpt": make_excerpt(text),
+        "reading_time": reading_time(text),
+        "toc": sanitizer.toc,
+    }
@@ -0,0 +1,150 @@
+"""
+Primary/replica database router.
+
+Yozuvlar har doim "default" (primary) bazaga boradi. O'qishlar faqat
+ReplicaRoutingMiddleware replica'ga ruxsat bergan so'rovlarda (GET/HEAD/
+OPTIONS, yaqinda yozuv qilmagan foydalanuvchi) replica'larga yuboriladi;
+management buyruqlari, signal'lar va shell har doim primary'dan o'qiydi.
+
+"O'z yozuvini o'qish" kafolati:
+- so'rov davomida biror yozuv bo'lsa (db_for_write) so'rovning qolgan qismi
+  primary'ga bog'lanadi;
+- javobga DB_PIN_COOKIE_NAME cookie'si qo'yiladi va DB_PIN_SECONDS davomida
+  shu klientning o'qishlari ham primary'dan bo'ladi (replika kechikishi).
+
+Replica holati DB_REPLICA_HEALTH_INTERVAL soniyada bir marta tekshiriladi;
+ishlamayotgan (ulanib bo'lmaydigan, sxemasi yo'q yoki Postgres'da
+DB_REPLICA_MAX_LAG'dan ko'p orqada qolgan) replica tanlanmaydi. Birorta ham
+sog' replica bo'lmasa o'qish primary'ga qaytadi.
+"""
+import contextvars
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = "primary"
+REPLICA = "replica"
+
+# Standart holat - primary: so'rovdan tashqaridagi kod replica'ga tushmaydi
+_mode = contextvars.ContextVar("db_routing_mode", default=PRIMARY)
+_wrote = contextvars.ContextVar("db_routing_wrote", default=False)
+
+_health = {}  # alias -> (sog'mi, tekshirilgan vaqt)
+_health_lock = threading.Lock()
+
+
+def replica_aliases():
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def allow_replica_reads():
+    """Joriy kontekstdagi o'qishlarni replica'ga yo'naltirishga ruxsat beradi"""
+    return _mode.set(REPLICA), _wrote.set(False)
+
+
+def reset(tokens):
+    mode_token, wrote_token = tokens
+    _mode.reset(mode_token)
+    _wrote.reset(wrote_token)
+
+
+def pin_to_primary():
+    """Joriy kontekstning qolgan o'qishlari primary'dan"""
+    _mode.set(PRIMARY)
+
+
+def wrote_to_primary():
+    return _wrote.get()
+
+
+def mark_written():
+    """Boshqa kontekstda (masalan, parallel batch worker'ida) bo'lgan yozuvni joriy kontekstga belgilaydi"""
+    _wrote.set(True)
+
+
+@contextmanager
+def use_primary():
+    """Blok ichida o'qishlar primary'dan (masalan, yozuvdan oldingi tekshiruv)"""
+    token = _mode.set(PRIMARY)
+    try:
+        yield
+    finally:
+        _mode.reset(token)
+
+
+def _lag_seconds(connection):
+    """Postgres replica'ning kechikishi; boshqa bazalar uchun None"""
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT CASE WHEN pg_is_in_recovery() "
+            "THEN EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+        )
+        lag = cursor.fetchone()[0]
+    return float(lag) if lag is not None else None
+
+
+def check_replica(alias):
+    """Replica'ga ulanib, sxema mavjudligini (va Postgres'da kechikishni) tekshiradi"""
+    connection = connections[alias]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM django_migrations LIMIT 1")
+        lag = _lag_seconds(connection)
+    except DatabaseError as error:
+        logger.warning("Replica %s ishlamayapti: %s", alias, error)
+        connection.close()
+        return False
+    max_lag = getattr(settings, "DB_REPLICA_MAX_LAG", 30)
+    if lag is not None and lag > max_lag:
+        logger.warning("Replica %s %.1f s orqada", alias, lag)
+        return False
+    return True
+
+
+def is_healthy(alias):
+    interval = getattr(settings, "DB_REPLICA_HEALTH_INTERVAL", 10)
+    now = time.monotonic()
+    healthy, checked_at = _health.get(alias, (None, 0.0))
+    if healthy is not None and now - checked_at < interval:
+        return healthy
+    with _health_lock:
+        healthy, checked_at = _health.get(alias, (None, 0.0))
+        if healthy is None or now - checked_at >= interval:
+            healthy = check_replica(alias)
+            _health[alias] = (healthy, time.monotonic())
+    return healthy
+
+
+def healthy_replicas():
+    return [alias for alias in replica_aliases() if is_healthy(alias)]
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _mode.get() != REPLICA:
+            return DEFAULT_DB_ALIAS
+        replicas = healthy_replicas()
+        return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        if _mode.get() == REPLICA:
+            _mode.set(PRIMARY)
+        _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Hamma alias'lar bitta ma'lumotlar to'plami
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replica'lar sxemani primary'dan oladi (replikatsiya yoki sync_sqlite_replicas)
+        return db not in replica_aliases()
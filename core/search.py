@@ -0,0 +1,204 @@
+"""
+Bloglar bo'yicha to'liq matnli qidiruv (SQLite FTS5).
+
+core_blog_fts virtual jadvalida har bir blog uchun bitta qator saqlanadi
+(rowid = blog id): sarlavha, qisqa tavsif va CKEditor HTML'idan ajratilgan
+matn. Jadval signal'lar orqali yangilanadi, `rebuild()` uni to'liq qayta
+quradi. Natijalar bm25 bo'yicha saralanadi va (ball, id) keyset cursor'i
+bilan sahifalanadi.
+
+SQLite bo'lmagan bazalarda FTS jadvali yo'q: qidiruv icontains'ga qaytadi.
+"""
+import base64
+import html
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Blog
+from .rendering import html_to_text
+
+FTS_TABLE = "core_blog_fts"
+
+# Ustun og'irliklari bm25 uchun: title, description, body
+BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+# O'zbekcha so'zlardagi tutuq belgilari (o'qish, g'oya) so'z ichida qoladi
+APOSTROPHES = "'ʻʼ‘’"
+
+SNIPPET_TOKENS = 12
+_MARK_START, _MARK_END = "\x02", "\x03"
+
+CREATE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, description, body, "
+    f"tokenize=\"unicode61 remove_diacritics 2 tokenchars '{APOSTROPHES.replace(chr(39), chr(39) * 2)}'\")"
+)
+DROP_SQL = f"DROP TABLE IF EXISTS {FTS_TABLE}"
+
+_TOKEN_RE = re.compile(rf"[\w{APOSTROPHES}]+")
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def is_available():
+    return connection.vendor == "sqlite"
+
+
+def build_match_query(query):
+    """
+    Foydalanuvchi so'rovini xavfsiz FTS5 MATCH ifodasiga aylantiradi: har bir
+    so'z qo'shtirnoqqa olinadi (operatorlar ishlamaydi), oxirgisi prefiks.
+    """
+    tokens = [token.strip(APOSTROPHES) for token in _TOKEN_RE.findall(query or "")]
+    tokens = [token for token in tokens if token]
+    if not tokens:
+        return ""
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _row(blog):
+    return [blog.pk, blog.title, blog.description, html_to_text(blog.content)]
+
+
+def index_blog(blog):
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [blog.pk])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, description, body) VALUES (%s, %s, %s, %s)",
+            _row(blog),
+        )
+
+
+def remove_blog(blog_id):
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [blog_id])
+
+
+def rebuild(batch_size=500):
+    """FTS jadvalini bloglar jadvalidan to'liq qayta quradi, qatorlar sonini qaytaradi"""
+    if not is_available():
+        return 0
+    total = 0
+    with connection.cursor() as cursor:
+        cursor.execute(CREATE_SQL)
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        batch = []
+        blogs = Blog.objects.order_by("pk").only("pk", "title", "description", "content")
+        for blog in blogs.iterator(chunk_size=batch_size):
+            batch.append(_row(blog))
+            if len(batch) >= batch_size:
+                cursor.executemany(
+                    f"INSERT INTO {FTS_TABLE} (rowid, title, description, body) VALUES (%s, %s, %s, %s)", batch
+                )
+                total += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, description, body) VALUES (%s, %s, %s, %s)", batch
+            )
+            total += len(batch)
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+    return total
+
+
+def matching_ids(query):
+    """Admin va filtrlar uchun: mos bloglar id'lari subquery sifatida"""
+    match = build_match_query(query)
+    if not match:
+        return None
+    return RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+
+
+def encode_cursor(score, blog_id):
+    raw = f"{score!r}:{blog_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, blog_id = base64.urlsafe_b64decode(padded.encode()).decode().split(":")
+        return float(score), int(blog_id)
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidCursor(cursor)
+
+
+def _highlight(snippet):
+    # Matn HTML sifatida escape qilinadi, faqat <mark> teglari qoladi
+    return html.escape(snippet, quote=False).replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+def _fts_search(match, after, limit):
+    bm25 = f"bm25({FTS_TABLE}, {', '.join(str(weight) for weight in BM25_WEIGHTS)})"
+    sql = [
+        f"SELECT rowid, {bm25} AS score, "
+        f"snippet({FTS_TABLE}, -1, %s, %s, '…', {SNIPPET_TOKENS}) "
+        f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+    ]
+    params = [_MARK_START, _MARK_END, match]
+    if after is not None:
+        sql.append(f"AND ({bm25} > %s OR ({bm25} = %s AND rowid > %s))")
+        params += [after[0], after[0], after[1]]
+    sql.append("ORDER BY score, rowid LIMIT %s")
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(" ".join(sql), params)
+        return [(blog_id, score, _highlight(snippet)) for blog_id, score, snippet in cursor.fetchall()]
+
+
+def _fallback_search(query, after, limit):
+    qs = Blog.objects.order_by("pk")
+    for token in query.split():
+        qs = qs.filter(Q(title__icontains=token) | Q(description__icontains=token) | Q(content__icontains=token))
+    if after is not None:
+        qs = qs.filter(pk__gt=after[1])
+    return [(blog.pk, 0.0, html.escape(blog.description, quote=False)) for blog in qs.only("pk", "description")[:limit]]
+
+
+def search(query, cursor=None, limit=20):
+    """
+    Qaytaradi: (natijalar, keyingi cursor yoki None). Har bir natija blog
+    kartasi, `score` (bm25, kichigi yaxshiroq) va `snippet` (<mark> bilan).
+    """
+    after = decode_cursor(cursor) if cursor else None
+    if is_available():
+        match = build_match_query(query)
+        rows = _fts_search(match, after, limit + 1) if match else []
+    else:
+        rows = _fallback_search(query, after, limit + 1)
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    blogs = Blog.objects.in_bulk([blog_id for blog_id, _, _ in rows])
+
+    results = []
+    for blog_id, score, snippet in rows:
+        blog = blogs.get(blog_id)
+        if blog is None:
+            continue
+        results.append({
+            "id": blog.id,
+            "title": blog.title,
+            "slug": blog.slug,
+            "description": blog.description,
+            "region": blog.region,
+            "image_url": blog.image_url,
+            "created_date": blog.created_date,
+            "score": score,
+            "snippet": snippet,
+        })
+
+    next_cursor = encode_cursor(rows[-1][1], rows[-1][0]) if has_more and rows else None
+    return results, next_cursor
@@ -2,7 +2,10 @@ from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
 from rest_framework_simplejwt.tokens import RefreshToken
-from .models import About, Blog, Category, Subcategory, Application, ApplicationImage, Profile, Banner, ContactUs
+from .models import (
+    About, Blog, Category, Subcategory, Application, ApplicationImage, ArchivedApplication,
+    ArchivedApplicationImage, Profile, Banner, ContactUs,
+)
 
 
 # ==================== AUTH SERIALIZERS ====================
@@ -96,6 +99,16 @@ class BlogSerializer(serializers.ModelSerializer):
         read_only_fields = ['slug', 'created_date']
 
 
+class BlogListSerializer(serializers.ModelSerializer):
+    """Ro'yxatlar uchun: to'liq kontent o'rniga excerpt"""
+    class Meta:
+        model = Blog
+        fields = [
+            'id', 'title', 'slug', 'description', 'excerpt', 'reading_time',
+            'region', 'image_url', 'created_date', 'updated_date'
+        ]
+
+
 class BlogCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Blog
@@ -150,6 +163,26 @@ class ApplicationSerializer(serializers.ModelSerializer):
         read_only_fields = ['slug', 'status', 'denied_reason', 'created_date']
 
 
+# ==================== ARCHIVED APPLICATION SERIALIZERS ====================
+class ArchivedApplicationImageSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedApplicationImage
+        fields = ['id', 'image', 'image_url', 'created_date', 'application']
+        read_only_fields = fields
+
+
+class ArchivedApplicationSerializer(serializers.ModelSerializer):
+    """?include_archived=1 javoblari uchun; `archived_date` bo'lishi bilan farq qiladi"""
+    category_title = serializers.CharField(source='category.title', read_only=True)
+    subcategory_title = serializers.CharField(source='subcategory.title', read_only=True)
+    images = ArchivedApplicationImageSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ArchivedApplication
+        fields = '__all__'
+        read_only_fields = [field.name for field in ArchivedApplication._meta.concrete_fields]
+
+
 # ==================== APPLICATION CREATE SERIALIZER ====================
 class ApplicationCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -1,7 +1,14 @@
-from django.db.models.signals import post_save
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete, pre_save, pre_delete, m2m_changed
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import Profile
+from django.utils import timezone
+from .models import Profile, Banner, About, Category, Subcategory, Blog, Application, ArchivedApplication, ContactUs
+from .snapshots import safe_publish
+from .sync import SYNC_MODELS, record_tombstone
+from . import autocomplete, leaderboard, search, stats
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -12,3 +19,234 @@ def create_user_profile(sender, instance, created, **kwargs):
 def save_user_profile(sender, instance, **kwargs):
     if hasattr(instance, "profile"):
         instance.profile.save()
+
+
+# ---------------- Snapshots ----------------
+SNAPSHOT_SENDERS = {
+    Banner: "banners",
+    About: "about",
+    Category: "categories",
+    Subcategory: "categories",
+    Blog: "blogs",
+}
+
+
+def schedule_snapshot(name):
+    transaction.on_commit(partial(safe_publish, name))
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def publish_snapshot_on_change(sender, **kwargs):
+    name = SNAPSHOT_SENDERS.get(sender)
+    if name:
+        schedule_snapshot(name)
+
+
+@receiver(m2m_changed, sender=Category.subcategories.through)
+def publish_categories_on_m2m_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        schedule_snapshot("categories")
+
+
+# ---------------- Sync feed ----------------
+SYNC_SENDERS = {model for _, model, _ in SYNC_MODELS}
+
+
+@receiver(post_delete)
+def record_sync_tombstone(sender, instance, **kwargs):
+    if sender in SYNC_SENDERS:
+        record_tombstone(instance)
+
+
+@receiver(m2m_changed, sender=Category.subcategories.through)
+def touch_categories_on_m2m_change(sender, instance, action, reverse, pk_set, **kwargs):
+    # M2M o'zgarishi Category.updated_date'ni o'zi yangilamaydi
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        category_ids = [instance.pk]
+    elif pk_set:
+        category_ids = list(pk_set)
+    else:
+        # reverse clear: pk_set yo'q, pre_clear'da yig'ilgan ro'yxat
+        category_ids = getattr(instance, "_sync_cleared_category_ids", [])
+    Category.objects.filter(pk__in=category_ids).update(updated_date=timezone.now())
+
+
+@receiver(m2m_changed, sender=Category.subcategories.through)
+def remember_categories_before_clear(sender, instance, action, reverse, **kwargs):
+    if action == "pre_clear" and reverse:
+        instance._sync_cleared_category_ids = list(instance.categories.values_list("pk", flat=True))
+
+
+@receiver(pre_delete, sender=Subcategory)
+def touch_categories_on_subcategory_delete(sender, instance, **kwargs):
+    instance.categories.update(updated_date=timezone.now())
+
+
+# ---------------- Statistics counters ----------------
+# DB'dagi eski qiymatni bilish uchun yuklangan paytdagi qiymatlar saqlanadi
+TRACKED_FIELDS = {
+    Application: ("status", "region", "category_id", "subcategory_id", "full_name", "district"),
+    ContactUs: ("is_read",),
+}
+
+
+def remember_tracked_fields(instance):
+    # only()/defer() bilan yuklanmagan maydonlar yozilmaydi (None emas)
+    fields = TRACKED_FIELDS[type(instance)]
+    instance._tracked = {field: instance.__dict__[field] for field in fields if field in instance.__dict__}
+
+
+@receiver(post_init, sender=Application)
+@receiver(post_init, sender=ContactUs)
+def track_fields_on_init(sender, instance, **kwargs):
+    remember_tracked_fields(instance)
+
+
+@receiver(pre_save, sender=Application)
+@receiver(pre_save, sender=ContactUs)
+@receiver(pre_delete, sender=Application)
+@receiver(pre_delete, sender=ContactUs)
+def load_untracked_fields(sender, instance, using, **kwargs):
+    # Kechiktirilgan (deferred) maydonning eski qiymati yozuvdan oldin DB'dan
+    # o'qiladi, aks holda hisoblagichlar None -> yangi qiymat deb o'zgaradi
+    if instance._state.adding:
+        return
+    missing = [field for field in TRACKED_FIELDS[sender] if field not in instance._tracked]
+    if missing:
+        stored = sender._base_manager.using(using).filter(pk=instance.pk).values(*missing).first()
+        instance._tracked.update(stored or {})
+
+
+@receiver(pre_delete, sender=Application)
+@receiver(pre_delete, sender=ContactUs)
+def load_deferred_fields_before_delete(sender, instance, using, **kwargs):
+    # post_delete handler'lari (rollup kaliti, autocomplete) maydonlarni o'qiydi,
+    # o'chirilgandan keyin esa ularni DB'dan yuklab bo'lmaydi
+    deferred = instance.get_deferred_fields()
+    if deferred:
+        instance.refresh_from_db(using=using, fields=deferred)
+
+
+@receiver(post_save)
+def count_total_on_create(sender, created, **kwargs):
+    field = stats.TOTAL_FIELDS.get(sender)
+    if field and created:
+        stats.apply_deltas({field: 1})
+
+
+@receiver(post_delete)
+def count_total_on_delete(sender, **kwargs):
+    field = stats.TOTAL_FIELDS.get(sender)
+    if field:
+        stats.apply_deltas({field: -1})
+
+
+@receiver(post_save, sender=Application)
+def count_application_save(sender, instance, created, **kwargs):
+    new_key = stats.application_rollup_key(instance)
+    if created:
+        stats.apply_deltas(stats.application_deltas(instance.status, 1))
+        stats.apply_rollup_deltas({new_key: 1})
+    else:
+        old_status = instance._tracked.get("status")
+        stats.apply_deltas(stats.application_status_change_deltas(old_status, instance.status))
+        old_key = stats.application_rollup_key(instance, instance._tracked)
+        stats.apply_rollup_deltas(stats.rollup_change_deltas(old_key, new_key))
+
+
+@receiver(post_delete, sender=Application)
+def count_application_delete(sender, instance, **kwargs):
+    stats.apply_deltas(stats.application_deltas(instance._tracked.get("status"), -1))
+    stats.apply_rollup_deltas({stats.application_rollup_key(instance, instance._tracked): -1})
+
+
+@receiver(post_delete, sender=ArchivedApplication)
+def count_archived_application_delete(sender, instance, **kwargs):
+    # Arxiv o'zgartirilmaydi, shuning uchun joriy qiymatlar DB'dagisi bilan bir xil
+    stats.apply_deltas(stats.application_deltas(instance.status, -1))
+    stats.apply_rollup_deltas({stats.application_rollup_key(instance): -1})
+
+
+@receiver(post_save, sender=ContactUs)
+def count_contact_save(sender, instance, created, **kwargs):
+    if created:
+        stats.apply_deltas(stats.contact_deltas(instance.is_read, 1))
+    else:
+        was_read = instance._tracked.get("is_read")
+        if was_read is not None and was_read != instance.is_read:
+            stats.apply_deltas({"unread_contacts": -1 if instance.is_read else 1})
+
+
+@receiver(post_delete, sender=ContactUs)
+def count_contact_delete(sender, instance, **kwargs):
+    stats.apply_deltas(stats.contact_deltas(instance._tracked.get("is_read"), -1))
+
+
+# ---------------- Blog leaderboard ----------------
+@receiver(post_save, sender=Blog)
+@receiver(post_delete, sender=Blog)
+def invalidate_blog_leaderboard(sender, **kwargs):
+    # Keshlangan kartalarda sarlavha/rasm eskirmasligi uchun
+    leaderboard.invalidate()
+
+
+# ---------------- Blog search ----------------
+@receiver(post_save, sender=Blog)
+def index_blog_for_search(sender, instance, **kwargs):
+    search.index_blog(instance)
+
+
+@receiver(post_delete, sender=Blog)
+def remove_blog_from_search(sender, instance, **kwargs):
+    search.remove_blog(instance.pk)
+
+
+# ---------------- Autocomplete ----------------
+AUTOCOMPLETE_TAXONOMY = {
+    Category: "category",
+    Subcategory: "subcategory",
+}
+
+
+# Indeks commit'dan keyin yangilanadi: rollback bo'lgan o'zgarish xotirada
+# qolmasligi kerak. Qiymatlar hozir olinadi (_tracked save'dan keyin yangilanadi).
+def schedule_counted_change(using, field, old_value, new_value):
+    transaction.on_commit(partial(autocomplete.counted_change, field, old_value, new_value), using=using)
+
+
+@receiver(post_save, sender=Application)
+def autocomplete_application_save(sender, instance, created, using, **kwargs):
+    tracked = {} if created else instance._tracked
+    schedule_counted_change(using, "district", tracked.get("district"), instance.district)
+    schedule_counted_change(using, "name", tracked.get("full_name"), instance.full_name)
+
+
+@receiver(post_delete, sender=Application)
+def autocomplete_application_delete(sender, instance, using, **kwargs):
+    schedule_counted_change(using, "district", instance._tracked.get("district"), None)
+    schedule_counted_change(using, "name", instance._tracked.get("full_name"), None)
+
+
+@receiver(post_save)
+def autocomplete_taxonomy_save(sender, instance, using, **kwargs):
+    field = AUTOCOMPLETE_TAXONOMY.get(sender)
+    if field:
+        transaction.on_commit(partial(autocomplete.taxonomy_change, field, instance.pk, instance.title), using=using)
+
+
+@receiver(post_delete)
+def autocomplete_taxonomy_delete(sender, instance, using, **kwargs):
+    field = AUTOCOMPLETE_TAXONOMY.get(sender)
+    if field:
+        transaction.on_commit(partial(autocomplete.taxonomy_change, field, instance.pk), using=using)
+
+
+# ---------------- Tracked fields ----------------
+# Oxirida ro'yxatdan o'tadi: yuqoridagi handler'lar eski qiymatlarni ko'rib bo'lgach yangilanadi
+@receiver(post_save, sender=Application)
+@receiver(post_save, sender=ContactUs)
+def reset_tracked_fields_on_save(sender, instance, **kwargs):
+    remember_tracked_fields(instance)
@@ -0,0 +1,199 @@
+"""
+Ommaviy kontent uchun statik JSON snapshotlar.
+
+Bannerlar, About, kategoriya/subkategoriya daraxti va so'nggi blog kartalari
+hamma foydalanuvchi uchun bir xil. Ular model o'zgarganda SNAPSHOT_ROOT ichiga
+fayl qilib yoziladi va nginx/CDN tomonidan to'g'ridan-to'g'ri beriladi.
+
+Har bir snapshot uchun uchta fayl bor:
+    <name>.<hash>.json  - o'zgarmas versiya (uzoq muddat keshlanadi)
+    <name>.json         - eng so'nggi versiya
+    manifest.json       - nom -> versiyali fayl xaritasi
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows (faqat lokal ishlab chiqish)
+    fcntl = None
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .models import About, Banner, Blog, Category
+from .serializers import AboutSerializer, BannerSerializer
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest"
+MANIFEST_LOCK = ".manifest.lock"
+
+
+def _build_banners():
+    banners = Banner.objects.filter(is_active=True).order_by("-created_date")
+    return BannerSerializer(banners, many=True).data
+
+
+def _build_about():
+    about = About.objects.first()
+    return AboutSerializer(about).data if about else None
+
+
+def _build_categories():
+    categories = Category.objects.prefetch_related("subcategories").order_by("id")
+    return [
+        {
+            "id": category.id,
+            "title": category.title,
+            "image_url": category.image_url,
+            "subcategories": [
+                {"id": sub.id, "title": sub.title, "slug": sub.slug}
+                for sub in sorted(category.subcategories.all(), key=lambda s: s.title)
+            ],
+        }
+        for category in categories
+    ]
+
+
+def _build_blogs():
+    limit = getattr(settings, "SNAPSHOT_LATEST_BLOGS", 12)
+    blogs = Blog.objects.order_by("-created_date").values(
+        "id", "title", "slug", "description", "excerpt", "reading_time", "region", "image_url", "created_date"
+    )[:limit]
+    return list(blogs)
+
+
+SNAPSHOTS = {
+    "banners": _build_banners,
+    "about": _build_about,
+    "categories": _build_categories,
+    "blogs": _build_blogs,
+}
+
+
+def get_snapshot_root():
+    return settings.SNAPSHOT_ROOT
+
+
+def _atomic_write(path, content):
+    """Faylni vaqtinchalik faylga yozib, rename orqali almashtiradi"""
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(content)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _read_manifest(root):
+    try:
+        with open(os.path.join(root, f"{MANIFEST_NAME}.json"), "rb") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+@contextmanager
+def _manifest_lock(root):
+    """
+    Manifestni o'qib-yozish boshqa jarayonlar (worker'lar) bilan ketma-ket:
+    aks holda ikki parallel publish bir-birining yozuvini o'chirib yuboradi.
+    """
+    with open(os.path.join(root, MANIFEST_LOCK), "a") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+
+def _prune_versions(root, name, keep, current):
+    """
+    Eski versiyali fayllarni o'chiradi (joriy fayl bilan birga `keep` tasi qoladi).
+    Joriy fayl mtime bir xil bo'lsa ham hech qachon o'chirilmaydi.
+    """
+    prefix = f"{name}."
+    versions = [
+        entry for entry in os.scandir(root)
+        if entry.name.startswith(prefix) and entry.name.count(".") == 2 and entry.name != current
+    ]
+    versions.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in versions[max(keep - 1, 0):]:
+        try:
+            os.unlink(entry.path)
+        except OSError:
+            pass
+
+
+def publish(name):
+    """Bitta snapshotni qayta yaratadi va versiyali fayl nomini qaytaradi"""
+    if name not in SNAPSHOTS:
+        raise KeyError(name)
+
+    root = get_snapshot_root()
+    os.makedirs(root, exist_ok=True)
+
+    payload = {
+        "generated_at": timezone.now(),
+        "data": SNAPSHOTS[name](),
+    }
+    body = json.dumps(
+        payload["data"], cls=DjangoJSONEncoder, ensure_ascii=False, sort_keys=True
+    ).encode("utf-8")
+    version = hashlib.sha256(body).hexdigest()[:12]
+    content = json.dumps(payload, cls=DjangoJSONEncoder, ensure_ascii=False).encode("utf-8")
+
+    manifest = _read_manifest(root)
+    filename = f"{name}.{version}.json"
+    versioned_path = os.path.join(root, filename)
+    if manifest.get(name, {}).get("file") == filename and os.path.exists(versioned_path):
+        # Ma'lumot o'zgarmagan
+        return filename
+
+    _atomic_write(versioned_path, content)
+    _atomic_write(os.path.join(root, f"{name}.json"), content)
+
+    # Manifest boshqa snapshotlar bilan bir vaqtda yangilanishi mumkin:
+    # qulf ostida qayta o'qib, faqat o'z yozuvimizni almashtiramiz
+    with _manifest_lock(root):
+        manifest = _read_manifest(root)
+        manifest[name] = {
+            "file": filename,
+            "url": f"{settings.SNAPSHOT_URL}{filename}",
+            "version": version,
+            "generated_at": payload["generated_at"],
+        }
+        _atomic_write(
+            os.path.join(root, f"{MANIFEST_NAME}.json"),
+            json.dumps(manifest, cls=DjangoJSONEncoder, ensure_ascii=False).encode("utf-8"),
+        )
+
+    _prune_versions(root, name, getattr(settings, "SNAPSHOT_KEEP_VERSIONS", 3), filename)
+    return filename
+
+
+def publish_all():
+    return {name: publish(name) for name in SNAPSHOTS}
+
+
+def safe_publish(name):
+    """Signal'lar uchun: snapshot xatosi saqlashni buzmasligi kerak"""
+    try:
+        publish(name)
+    except Exception:
+        logger.exception("Snapshot '%s' yaratilmadi", name)
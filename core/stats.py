@@ -0,0 +1,311 @@
+"""
+Statistika hisoblagichlari.
+
+StatisticsAPIView har so'rovda o'nlab COUNT(*) bajarmasligi uchun natijalar
+bitta qatorli StatisticsCounter jadvalida saqlanadi. Yaratish, o'chirish va
+status o'zgarishlarida signal'lar `apply_deltas` orqali F() bilan oshiradi
+yoki kamaytiradi. Hisoblagichlar haqiqatdan chetlashsa `reconcile()` ularni
+qaytadan sanab tuzatadi.
+
+Breakdown statistikasi uchun ApplicationRollup jadvali ham xuddi shunday
+yangilanadi: har bir ariza o'z (kun, viloyat, kategoriya, subkategoriya,
+status) kalitiga +1 beradi.
+"""
+from collections import Counter
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+
+from .dbutils import ITERATOR_CHUNK_SIZE, long_running
+from .models import (
+    Application, ApplicationRollup, ArchivedApplication, Banner, Blog, Category, ContactUs,
+    StatisticsCounter, Subcategory,
+)
+
+COUNTER_PK = 1
+
+COUNTER_FIELDS = [
+    "total_applications",
+    "accepted_applications",
+    "denied_applications",
+    "pending_applications",
+    "total_users",
+    "total_blogs",
+    "total_categories",
+    "total_subcategories",
+    "total_banners",
+    "total_contacts",
+    "unread_contacts",
+]
+
+# Oddiy "jami" hisoblagichlari: model -> maydon
+TOTAL_FIELDS = {
+    User: "total_users",
+    Blog: "total_blogs",
+    Category: "total_categories",
+    Subcategory: "total_subcategories",
+    Banner: "total_banners",
+}
+
+APPLICATION_STATUS_FIELDS = {
+    "pending": "pending_applications",
+    "accepted": "accepted_applications",
+    "denied": "denied_applications",
+}
+
+
+def _application_counts(model):
+    rows = model.objects.order_by().values("status").annotate(count=Count("id"))
+    return {row["status"]: row["count"] for row in rows}
+
+
+def compute_counts():
+    """
+    Hisoblagichlarni to'g'ridan-to'g'ri jadvallardan sanaydi (sekin yo'l).
+    Arizalar asosiy jadval va arxivdan birga sanaladi.
+    """
+    by_status = Counter(_application_counts(Application))
+    by_status.update(_application_counts(ArchivedApplication))
+    return {
+        "total_applications": sum(by_status.values()),
+        "accepted_applications": by_status["accepted"],
+        "denied_applications": by_status["denied"],
+        "pending_applications": by_status["pending"],
+        "total_users": User.objects.count(),
+        "total_blogs": Blog.objects.count(),
+        "total_categories": Category.objects.count(),
+        "total_subcategories": Subcategory.objects.count(),
+        "total_banners": Banner.objects.count(),
+        "total_contacts": ContactUs.objects.count(),
+        "unread_contacts": ContactUs.objects.filter(is_read=False).count(),
+    }
+
+
+def reconcile():
+    """
+    Hisoblagichlarni qayta sanab yozadi va farqlarni qaytaradi
+    ({maydon: (eski, yangi)}).
+    """
+    with long_running():
+        counts = compute_counts()
+        counter, created = StatisticsCounter.objects.select_for_update().get_or_create(
+            pk=COUNTER_PK, defaults=counts
+        )
+        if created:
+            return {}
+
+        drift = {}
+        for field, value in counts.items():
+            old = getattr(counter, field)
+            if old != value:
+                drift[field] = (old, value)
+                setattr(counter, field, value)
+        if drift:
+            counter.save()
+        return drift
+
+
+def get_counters():
+    counters = StatisticsCounter.objects.filter(pk=COUNTER_PK).values(*COUNTER_FIELDS).first()
+    if counters is None:
+        reconcile()
+        counters = StatisticsCounter.objects.filter(pk=COUNTER_PK).values(*COUNTER_FIELDS).first()
+    return counters
+
+
+def apply_deltas(deltas):
+    """Hisoblagichlarga {maydon: +/-n} o'zgarishlarni bitta UPDATE bilan qo'llaydi"""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    with transaction.atomic():
+        updated = StatisticsCounter.objects.filter(pk=COUNTER_PK).update(
+            updated_date=timezone.now(),
+            **{field: F(field) + delta for field, delta in deltas.items()}
+        )
+        if not updated:
+            # Qator hali yo'q: hammasini sanab yaratamiz (o'zgarish ham kiradi)
+            reconcile()
+
+
+def application_deltas(status, sign):
+    deltas = {"total_applications": sign}
+    field = APPLICATION_STATUS_FIELDS.get(status)
+    if field:
+        deltas[field] = sign
+    return deltas
+
+
+def application_status_change_deltas(old_status, new_status, count=1):
+    deltas = {}
+    if old_status == new_status:
+        return deltas
+    old_field = APPLICATION_STATUS_FIELDS.get(old_status)
+    new_field = APPLICATION_STATUS_FIELDS.get(new_status)
+    if old_field:
+        deltas[old_field] = deltas.get(old_field, 0) - count
+    if new_field:
+        deltas[new_field] = deltas.get(new_field, 0) + count
+    return deltas
+
+
+def contact_deltas(is_read, sign):
+    deltas = {"total_contacts": sign}
+    if not is_read:
+        deltas["unread_contacts"] = sign
+    return deltas
+
+
+# ---------------- Rollups ----------------
+ROLLUP_FIELDS = ("day", "region", "category_id", "subcategory_id", "status")
+
+# Breakdown uchun guruhlash o'lchamlari: nom -> (values() ifodasi, qo'shimcha maydonlar)
+BREAKDOWN_DIMENSIONS = {
+    "day": ("day", ()),
+    "month": ("month", ()),
+    "region": ("region", ()),
+    "category": ("category", ("category__title",)),
+    "subcategory": ("subcategory", ("subcategory__title",)),
+    "status": ("status", ()),
+}
+
+
+def rollup_key(created_date, region, category_id, subcategory_id, status):
+    return (timezone.localdate(created_date), region, category_id, subcategory_id, status)
+
+
+def application_rollup_key(application, values=None):
+    """Ariza uchun rollup kaliti; `values` berilsa eski (DB'dagi) qiymatlar olinadi"""
+    values = values or {}
+
+    def value(field):
+        old = values.get(field)
+        return old if old is not None else getattr(application, field)
+
+    return rollup_key(
+        application.created_date,
+        value("region"),
+        value("category_id"),
+        value("subcategory_id"),
+        value("status"),
+    )
+
+
+def rollup_change_deltas(old_key, new_key, count=1):
+    deltas = Counter()
+    if old_key != new_key:
+        deltas[old_key] -= count
+        deltas[new_key] += count
+    return deltas
+
+
+def apply_rollup_deltas(deltas):
+    """{rollup kaliti: +/-n} o'zgarishlarini ApplicationRollup'ga yozadi"""
+    for key, delta in deltas.items():
+        if not delta:
+            continue
+        lookup = dict(zip(ROLLUP_FIELDS, key))
+        with transaction.atomic():
+            updated = ApplicationRollup.objects.filter(**lookup).update(count=F("count") + delta)
+            if not updated and delta > 0:
+                try:
+                    with transaction.atomic():
+                        ApplicationRollup.objects.create(count=delta, **lookup)
+                except IntegrityError:
+                    # Parallel so'rov qatorni birinchi yaratdi
+                    ApplicationRollup.objects.filter(**lookup).update(count=F("count") + delta)
+            elif delta < 0:
+                ApplicationRollup.objects.filter(count__lte=0, **lookup).delete()
+
+
+def apply_rollup_deltas_bulk(deltas):
+    """
+    Ko'p kalitli o'zgarishlar uchun (ommaviy status o'zgarishi): tegishli kunlarning
+    qatorlari bitta SELECT bilan qulflanib o'qiladi, so'ng bulk_update /
+    bulk_create / delete. Parallel yaratilgan qator to'qnashsa - har bir kalit
+    alohida (`apply_rollup_deltas`).
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    try:
+        with transaction.atomic():
+            rows = {
+                tuple(getattr(row, field) for field in ROLLUP_FIELDS): row
+                for row in ApplicationRollup.objects.select_for_update().filter(
+                    day__in={key[0] for key in deltas}
+                )
+            }
+            changed, created, emptied = [], [], []
+            for key, delta in deltas.items():
+                row = rows.get(key)
+                if row is None:
+                    if delta > 0:
+                        created.append(ApplicationRollup(count=delta, **dict(zip(ROLLUP_FIELDS, key))))
+                    continue
+                row.count += delta
+                (changed if row.count > 0 else emptied).append(row)
+            ApplicationRollup.objects.bulk_update(changed, ["count"], batch_size=500)
+            ApplicationRollup.objects.bulk_create(created, batch_size=500)
+            ApplicationRollup.objects.filter(pk__in=[row.pk for row in emptied]).delete()
+    except IntegrityError:
+        apply_rollup_deltas(deltas)
+
+
+def rebuild_rollups():
+    """ApplicationRollup'ni arizalar jadvali va arxivdan to'liq qayta quradi"""
+    with long_running():
+        counts = Counter()
+        for model in (Application, ArchivedApplication):
+            rows = (
+                model.objects.order_by()
+                .annotate(day=TruncDate("created_date"))
+                .values("day", "region", "category_id", "subcategory_id", "status")
+                .annotate(count=Count("id"))
+            )
+            for row in rows.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+                count = row.pop("count")
+                counts[tuple(row.items())] += count
+
+        ApplicationRollup.objects.all().delete()
+        ApplicationRollup.objects.bulk_create(
+            (ApplicationRollup(count=count, **dict(key)) for key, count in counts.items()),
+            batch_size=1000,
+        )
+    return ApplicationRollup.objects.count()
+
+
+def breakdown(group_by, filters):
+    """
+    Rollup qatorlarini guruhlaydi. `filters`: region, category, subcategory,
+    status (ro'yxatlar), date_from, date_to.
+    """
+    qs = ApplicationRollup.objects.order_by()
+    if filters.get("date_from"):
+        qs = qs.filter(day__gte=filters["date_from"])
+    if filters.get("date_to"):
+        qs = qs.filter(day__lte=filters["date_to"])
+    for field in ("region", "category", "subcategory", "status"):
+        if filters.get(field):
+            qs = qs.filter(**{f"{field}__in": filters[field]})
+
+    if "month" in group_by:
+        qs = qs.annotate(month=TruncMonth("day"))
+
+    if not group_by:
+        return qs.aggregate(count=Sum("count"))["count"] or 0, []
+
+    fields = []
+    for name in group_by:
+        expression, extra = BREAKDOWN_DIMENSIONS[name]
+        fields.append(expression)
+        fields.extend(extra)
+
+    order = [BREAKDOWN_DIMENSIONS[name][0] for name in group_by]
+    results = list(qs.values(*fields).annotate(count=Sum("count")).order_by(*order))
+    total = sum(row["count"] for row in results)
+    return total, results
@@ -0,0 +1,149 @@
+"""
+"changes since" sync feed.
+
+Klientlar kategoriya, subkategoriya, banner va bloglarni keshlaydi. Ro'yxatni
+to'liq qayta yuklash o'rniga ular oxirgi cursor'ni yuboradi va faqat o'sha
+paytdan keyin o'zgargan (updated_date) yoki o'chirilgan (Tombstone) yozuvlarni
+oladi.
+
+Barcha oqimlar (timestamp, model tartibi, pk) bo'yicha tartiblanadi, shuning
+uchun cursor bitta nuqtani aniq belgilaydi va partiyalar orasida yozuv
+yo'qolmaydi yoki takrorlanmaydi.
+"""
+import base64
+import heapq
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Banner, Blog, Category, Subcategory, Tombstone
+from .serializers import BannerSerializer, BlogSerializer, CategorySerializer, SubcategorySerializer
+
+# (model nomi, model, serializer) - tartib cursor'ning bir qismi, o'zgartirmang
+SYNC_MODELS = [
+    ("banner", Banner, BannerSerializer),
+    ("blog", Blog, BlogSerializer),
+    ("category", Category, CategorySerializer),
+    ("subcategory", Subcategory, SubcategorySerializer),
+]
+TOMBSTONE_KIND = len(SYNC_MODELS)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class CursorExpired(ValueError):
+    pass
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def _to_micros(value):
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def _from_micros(micros):
+    return EPOCH + timedelta(microseconds=micros)
+
+
+def encode_cursor(ts, kind, pk):
+    raw = f"{_to_micros(ts)}:{kind}:{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        micros, kind, pk = base64.urlsafe_b64decode(padded.encode()).decode().split(":")
+        return _from_micros(int(micros)), int(kind), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidCursor(cursor)
+
+
+def _after(queryset, field, kind, cursor):
+    """Cursor'dan keyingi yozuvlar: (ts, kind, pk) > cursor"""
+    if cursor is None:
+        return queryset
+    ts, cursor_kind, cursor_pk = cursor
+    if kind < cursor_kind:
+        return queryset.filter(**{f"{field}__gt": ts})
+    if kind > cursor_kind:
+        return queryset.filter(**{f"{field}__gte": ts})
+    return queryset.filter(Q(**{f"{field}__gt": ts}) | Q(**{field: ts, "pk__gt": cursor_pk}))
+
+
+def _tombstone_horizon():
+    days = getattr(settings, "SYNC_TOMBSTONE_TTL_DAYS", 90)
+    return timezone.now() - timedelta(days=days)
+
+
+def get_changes(since=None, limit=None):
+    """
+    Cursor'dan keyingi o'zgarishlarni qaytaradi:
+        {"changes": [...], "cursor": "...", "has_more": bool}
+    """
+    max_limit = getattr(settings, "SYNC_MAX_BATCH", 1000)
+    limit = min(limit or getattr(settings, "SYNC_DEFAULT_BATCH", 200), max_limit)
+
+    cursor = decode_cursor(since) if since else None
+    if cursor and cursor[0] < _tombstone_horizon():
+        # Bu nuqtadan keyingi o'chirishlar tozalab yuborilgan bo'lishi mumkin
+        raise CursorExpired(since)
+
+    # Hali commit qilinmagan tranzaksiyalar eski timestamp bilan paydo bo'lib
+    # qolmasligi uchun eng so'nggi bir necha soniya keyingi so'rovga qoldiriladi
+    settle = timezone.now() - timedelta(seconds=getattr(settings, "SYNC_SETTLE_SECONDS", 2))
+
+    streams = []
+    for kind, (name, model, serializer_class) in enumerate(SYNC_MODELS):
+        qs = _after(model.objects.filter(updated_date__lte=settle), "updated_date", kind, cursor)
+        rows = list(qs.order_by("updated_date", "pk")[:limit + 1])
+        streams.append([(row.updated_date, kind, row.pk, row) for row in rows])
+
+    qs = _after(Tombstone.objects.filter(deleted_date__lte=settle), "deleted_date", TOMBSTONE_KIND, cursor)
+    rows = list(qs.order_by("deleted_date", "pk")[:limit + 1])
+    streams.append([(row.deleted_date, TOMBSTONE_KIND, row.pk, row) for row in rows])
+
+    merged = list(heapq.merge(*streams, key=lambda item: item[:3]))
+    has_more = len(merged) > limit
+    merged = merged[:limit]
+
+    changes = []
+    for ts, kind, pk, row in merged:
+        if kind == TOMBSTONE_KIND:
+            changes.append({
+                "model": row.model,
+                "op": "delete",
+                "id": row.object_id,
+                "timestamp": ts,
+            })
+        else:
+            name, _, serializer_class = SYNC_MODELS[kind]
+            changes.append({
+                "model": name,
+                "op": "upsert",
+                "id": pk,
+                "timestamp": ts,
+                "data": serializer_class(row).data,
+            })
+
+    if merged:
+        ts, kind, pk, _ = merged[-1]
+        next_cursor = encode_cursor(ts, kind, pk)
+    else:
+        next_cursor = since or ""
+
+    return {"changes": changes, "cursor": next_cursor, "has_more": has_more}
+
+
+def record_tombstone(instance):
+    Tombstone.objects.create(model=instance._meta.model_name, object_id=instance.pk)
+
+
+def prune_tombstones():
+    deleted, _ = Tombstone.objects.filter(deleted_date__lt=_tombstone_horizon()).delete()
+    return deleted
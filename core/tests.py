@@ -1,3 +1,1836 @@
-from django.test import TestCase
+import base64
+import datetime
+import io
+import json
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import uuid
+from unittest import mock
 
-# Create your tests here.
+import aiohttp
+from asgiref.sync import async_to_sync
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.http import JsonResponse
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from google.auth import crypt, jwt as google_jwt
+from hitcount.models import Hit, HitCount
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from . import autocomplete, hits, idempotency, intake, leaderboard, outbound, routers, search, snapshots, stats, sync
+from .applications import BulkStatusError, bulk_set_status, parse_bulk_status, unique_slug
+from .archive import archive_applications
+from .backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+from .benchmarks import explain, plan_problems
+from .dbutils import long_running
+from .filters import BlogFilter
+from .imports import ImportFormatError, SlugAllocator, import_applications
+from .lookups import search_applications
+from .middleware import ReplicaRoutingMiddleware
+from .rendering import render_content
+from .models import (
+    Application, ApplicationImage, ApplicationIntake, ApplicationRollup, ArchivedApplication, Blog, BlogLeaderboard,
+    BlogViewDaily,
+    ArchivedApplicationImage, Category, ContactUs, IdempotencyKey, REGION_CHOICES, StatisticsCounter, Subcategory,
+    Tombstone,
+    application_slug_base, normalize_phone,
+)
+
+
+def make_taxonomy():
+    category = Category.objects.create(title="Test kategoriya")
+    subcategory = Subcategory.objects.create(title="Test subkategoriya", slug="test-subkategoriya")
+    category.subcategories.add(subcategory)
+    return category, subcategory
+
+
+def submission(category, subcategory, **kwargs):
+    """POST /api/applications/ uchun forma maydonlari"""
+    data = {
+        "full_name": "Ali Valiyev", "phone_number": "90 123 45 67", "birth_date": "1990-01-01",
+        "passport_number": "AA 1234567", "region": REGION_CHOICES[0][0], "district": "Yunusobod",
+        "location": "Test", "category": category.pk, "subcategory": subcategory.pk, "description": "Test",
+    }
+    data.update(kwargs)
+    return data
+
+
+def make_blog(title="Test blog", **kwargs):
+    fields = {
+        "title": title, "description": "Tavsif", "content": "<p>Matn</p>",
+        "region": REGION_CHOICES[0][0], "image_url": "https://i.ibb.co/test.jpg",
+    }
+    fields.update(kwargs)
+    return Blog.objects.create(**fields)
+
+
+def make_application(category, subcategory, **kwargs):
+    fields = {
+        "full_name": "Ali Valiyev",
+        "phone_number": "+998 90 123 45 67",
+        "birth_date": datetime.date(1990, 1, 1),
+        "passport_number": "AA 1234567",
+        "region": REGION_CHOICES[0][0],
+        "location": "Test",
+        "category": category,
+        "subcategory": subcategory,
+        "description": "Test",
+    }
+    fields.update(kwargs)
+    return Application.objects.create(**fields)
+
+
+class StatsAssertionsMixin:
+    def assertStatsConsistent(self):
+        """Signal/delta bilan yangilangan hisoblagichlar qayta sanalganiga teng"""
+        self.assertEqual(stats.reconcile(), {})
+        rollups = set(ApplicationRollup.objects.exclude(count=0).values_list(
+            "day", "region", "category_id", "subcategory_id", "status", "count"
+        ))
+        stats.rebuild_rollups()
+        rebuilt = set(ApplicationRollup.objects.values_list(
+            "day", "region", "category_id", "subcategory_id", "status", "count"
+        ))
+        self.assertEqual(rollups, rebuilt)
+
+
+class BulkStatusTests(StatsAssertionsMixin, TestCase):
+    def setUp(self):
+        self.category, self.subcategory = make_taxonomy()
+        self.pending = make_application(self.category, self.subcategory, full_name="Pending Ariza")
+        self.accepted = make_application(self.category, self.subcategory, full_name="Accepted Ariza", status="accepted")
+        self.denied = make_application(
+            self.category, self.subcategory, full_name="Denied Ariza", status="denied", denied_reason="Eski sabab",
+        )
+        stats.reconcile()
+        stats.rebuild_rollups()
+
+    def assertBatchError(self, payload, key):
+        with self.assertRaises(BulkStatusError) as raised:
+            parse_bulk_status(payload)
+        self.assertIn(key, raised.exception.errors)
+
+    def test_denied_without_reason_rejects_the_whole_batch(self):
+        self.assertBatchError({"items": [
+            {"slug": self.pending.slug, "status": "accepted"},
+            {"slug": self.accepted.slug, "status": "denied", "denied_reason": "  "},
+        ]}, "1")
+        self.assertBatchError({"slugs": [self.pending.slug], "status": "denied"}, "0")
+
+    def test_duplicate_slug_is_rejected(self):
+        self.assertBatchError({"slugs": [self.pending.slug, self.pending.slug], "status": "accepted"}, "1")
+
+    @override_settings(BULK_STATUS_MAX_ITEMS=2)
+    def test_size_limit(self):
+        slugs = [self.pending.slug, self.accepted.slug, self.denied.slug]
+        self.assertBatchError({"slugs": slugs, "status": "accepted"}, "items")
+        self.assertEqual(len(parse_bulk_status({"slugs": slugs[:2], "status": "accepted"})), 2)
+
+    def test_results_per_slug_in_request_order(self):
+        results = bulk_set_status(parse_bulk_status({
+            "slugs": ["yoq-ariza", self.accepted.slug, self.pending.slug], "status": "accepted",
+        }))
+        self.assertEqual(results, [
+            {"slug": "yoq-ariza", "result": "not_found", "status": None},
+            {"slug": self.accepted.slug, "result": "unchanged", "status": "accepted"},
+            {"slug": self.pending.slug, "result": "updated", "status": "accepted"},
+        ])
+        self.pending.refresh_from_db()
+        self.assertEqual(self.pending.status, "accepted")
+
+    def test_changed_reason_counts_as_update(self):
+        results = bulk_set_status(parse_bulk_status({
+            "slugs": [self.denied.slug], "status": "denied", "denied_reason": "Yangi sabab",
+        }))
+        self.assertEqual(results[0]["result"], "updated")
+        self.denied.refresh_from_db()
+        self.assertEqual(self.denied.denied_reason, "Yangi sabab")
+
+    def test_counters_and_rollups_match_reconcile(self):
+        bulk_set_status(parse_bulk_status({"items": [
+            {"slug": self.pending.slug, "status": "denied", "denied_reason": "Sabab"},
+            {"slug": self.accepted.slug, "status": "pending"},
+            {"slug": self.denied.slug, "status": "accepted"},
+        ]}))
+        counters = stats.get_counters()
+        self.assertEqual(
+            (counters["pending_applications"], counters["accepted_applications"], counters["denied_applications"]),
+            (1, 1, 1),
+        )
+        self.assertStatsConsistent()
+
+    def test_closed_date_is_set_kept_and_cleared(self):
+        closed_date = self.accepted.closed_date
+        self.assertIsNotNone(closed_date)
+        bulk_set_status(parse_bulk_status({"items": [
+            {"slug": self.pending.slug, "status": "accepted"},
+            {"slug": self.accepted.slug, "status": "denied", "denied_reason": "Sabab"},
+            {"slug": self.denied.slug, "status": "pending"},
+        ]}))
+        for application in (self.pending, self.accepted, self.denied):
+            application.refresh_from_db()
+        self.assertIsNotNone(self.pending.closed_date)
+        self.assertEqual(self.accepted.closed_date, closed_date)
+        self.assertIsNone(self.denied.closed_date)
+
+    @override_settings(ALLOWED_HOSTS=["*"])
+    def test_admin_action_refuses_denied_without_reason(self):
+        User.objects.create_superuser("admin", "admin@example.com", "parol")
+        client = Client(HTTP_HOST="localhost")
+        client.login(username="admin", password="parol")
+        url = "/admin/core/application/"
+        data = {"action": "mark_denied", "_selected_action": [self.pending.pk, self.accepted.pk]}
+
+        response = client.post(url, {**data, "denied_reason": ""}, follow=True)
+        self.assertContains(response, "Rad etish uchun sabab kiriting.")
+        self.assertEqual(Application.objects.filter(status="denied").count(), 1)
+
+        client.post(url, {**data, "denied_reason": "Hujjatlar to'liq emas"})
+        self.assertEqual(Application.objects.filter(status="denied").count(), 3)
+        self.assertStatsConsistent()
+
+
+class ImportTests(StatsAssertionsMixin, TestCase):
+    HEADER = "full_name,phone_number,birth_date,passport_number,region,district,location,category,subcategory,description"
+
+    def setUp(self):
+        self.category, self.subcategory = make_taxonomy()
+        stats.reconcile()
+        stats.rebuild_rollups()
+
+    def row(self, full_name="Ali Valiyev", **kwargs):
+        row = {
+            "full_name": full_name, "phone_number": "90 123 45 67", "birth_date": "01.02.1990",
+            "passport_number": "AA 1234567", "region": REGION_CHOICES[0][0], "district": "Yunusobod",
+            "location": "Test", "category": self.category.title, "subcategory": str(self.subcategory.pk),
+            "description": "Import",
+        }
+        row.update(kwargs)
+        return row
+
+    def csv(self, *rows):
+        lines = [self.HEADER] + [",".join(row[field] for field in self.HEADER.split(",")) for row in rows]
+        return io.StringIO("\n".join(lines) + "\n", newline="")
+
+    def ndjson(self, *lines):
+        return io.StringIO("\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines))
+
+    def test_csv_reports_row_errors_with_line_numbers(self):
+        report = import_applications(self.csv(
+            self.row(), self.row(phone_number="", birth_date="1990/02/01", category="Yo'q"), self.row(),
+        ), "csv")
+        self.assertEqual((report["total"], report["created"], report["failed"]), (3, 2, 1))
+        self.assertEqual(report["errors"][0]["line"], 3)
+        self.assertEqual(set(report["errors"][0]["errors"]), {"phone_number", "birth_date", "category"})
+        application = Application.objects.order_by("pk").first()
+        self.assertEqual(application.birth_date, datetime.date(1990, 2, 1))
+        self.assertEqual((application.category, application.subcategory), (self.category, self.subcategory))
+        self.assertStatsConsistent()
+
+    def test_csv_with_missing_columns_is_rejected(self):
+        stream = io.StringIO("full_name,phone_number\nAli,901234567\n", newline="")
+        with self.assertRaises(ImportFormatError):
+            import_applications(stream, "csv")
+        self.assertFalse(Application.objects.exists())
+
+    def test_ndjson_malformed_lines(self):
+        report = import_applications(
+            self.ndjson(self.row(), '{"full_name": ', "[1, 2]", "", self.row(full_name="Vali Aliyev")),
+            "ndjson", chunk_size=1,
+        )
+        self.assertEqual((report["total"], report["created"], report["failed"]), (4, 2, 2))
+        self.assertEqual(
+            report["errors"],
+            [
+                {"line": 2, "errors": {"non_field_errors": "JSON noto'g'ri"}},
+                {"line": 3, "errors": {"non_field_errors": "JSON obyekt kutilgan"}},
+            ],
+        )
+        self.assertStatsConsistent()
+
+    def test_slugs_continue_after_existing_suffixes(self):
+        for slug in ("ali-valiyev", "ali-valiyev-1", "ali-valiyev-2", "ali-valiyev-x"):
+            make_application(self.category, self.subcategory, slug=slug)
+        import_applications(self.ndjson(self.row(), self.row(), self.row(full_name="Ali Valiyev 2")), "ndjson")
+        self.assertEqual(
+            [*Application.objects.filter(description="Import").order_by("pk").values_list("slug", flat=True)],
+            ["ali-valiyev-3", "ali-valiyev-4", "ali-valiyev-2-1"],
+        )
+
+    def test_slug_conflict_falls_back_to_row_saves(self):
+        load = SlugAllocator._load
+
+        def load_then_conflict(allocator, bases):
+            load(allocator, bases)
+            # Partiya yozilishidan oldin boshqa so'rov shu slug'ni band qiladi
+            make_application(self.category, self.subcategory, slug="ali-valiyev")
+
+        with mock.patch.object(SlugAllocator, "_load", load_then_conflict):
+            report = import_applications(self.ndjson(self.row(), self.row()), "ndjson")
+        self.assertEqual((report["created"], report["failed"]), (2, 0))
+        self.assertEqual(
+            [*Application.objects.filter(description="Import").order_by("pk").values_list("slug", flat=True)],
+            ["ali-valiyev-1", "ali-valiyev-2"],
+        )
+        self.assertStatsConsistent()
+
+    def test_dry_run_writes_nothing(self):
+        counters = stats.get_counters()
+        report = import_applications(self.csv(self.row(), self.row(region="Mars")), "csv", dry_run=True)
+        self.assertEqual((report["total"], report["created"], report["failed"], report["dry_run"]), (2, 0, 1, True))
+        self.assertEqual(report["errors"][0]["line"], 3)
+        self.assertFalse(Application.objects.exists())
+        self.assertEqual(stats.get_counters(), counters)
+        self.assertFalse(ApplicationRollup.objects.exclude(count=0).exists())
+
+
+@override_settings(ALLOWED_HOSTS=["*"])
+class IdempotencyTests(TestCase):
+    def setUp(self):
+        self.category, self.subcategory = make_taxonomy()
+        self.client = Client(HTTP_HOST="localhost")
+
+    def post_application(self, key, **kwargs):
+        return self.client.post(
+            "/api/applications/", submission(self.category, self.subcategory, **kwargs), HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_replay_returns_stored_response(self):
+        first = self.post_application("kalit-1")
+        self.assertEqual(first.status_code, 201)
+        self.assertNotIn(idempotency.REPLAYED_HEADER, first.headers)
+
+        second = self.post_application("kalit-1")
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.headers[idempotency.REPLAYED_HEADER], "true")
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(Application.objects.count(), 1)
+
+    def test_without_key_every_request_runs(self):
+        self.client.post("/api/applications/", submission(self.category, self.subcategory))
+        self.client.post("/api/applications/", submission(self.category, self.subcategory))
+        self.assertEqual(Application.objects.count(), 2)
+
+    def test_reused_key_with_different_body_is_rejected(self):
+        self.post_application("kalit-1")
+        response = self.post_application("kalit-1", full_name="Vali Aliyev")
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Application.objects.count(), 1)
+
+    def test_error_response_releases_the_key(self):
+        response = self.post_application("kalit-1", birth_date="")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        # Tuzatilgan so'rov shu kalit bilan qayta yuborilishi mumkin
+        response = self.post_application("kalit-1")
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn(idempotency.REPLAYED_HEADER, response.headers)
+        self.assertEqual(IdempotencyKey.objects.get().state, idempotency.COMPLETED)
+
+    def test_request_in_progress_returns_conflict(self):
+        self.post_application("kalit-1")
+        IdempotencyKey.objects.update(state=idempotency.PROCESSING, response_status=None, response_body=None)
+        with override_settings(IDEMPOTENCY_RETRY_AFTER=2):
+            response = self.post_application("kalit-1")
+        # Kutmasdan: klientga qachon qayta urinish aytiladi
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.headers["Retry-After"], "2")
+        self.assertEqual(Application.objects.count(), 1)
+
+    def test_async_request_in_progress_returns_conflict(self):
+        data = {"full_name": "Ali Valiyev", "email": "ali@example.com", "theme": "Hamkorlik", "message": "Salom"}
+        with mock.patch("core.views.send_telegram_message", new=mock.AsyncMock()):
+            self.client.post("/api/contact-us/", data, HTTP_IDEMPOTENCY_KEY="kalit-1")
+            IdempotencyKey.objects.update(state=idempotency.PROCESSING, response_status=None, response_body=None)
+            response = self.client.post("/api/contact-us/", data, HTTP_IDEMPOTENCY_KEY="kalit-1")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.headers["Retry-After"], "1")
+        self.assertEqual(ContactUs.objects.count(), 1)
+
+    @override_settings(IDEMPOTENCY_PROCESSING_TIMEOUT=60)
+    def test_stale_processing_record_is_taken_over(self):
+        self.post_application("kalit-1")
+        IdempotencyKey.objects.update(
+            state=idempotency.PROCESSING, response_status=None, response_body=None,
+            created_date=timezone.now() - datetime.timedelta(seconds=120),
+        )
+        response = self.post_application("kalit-1")
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn(idempotency.REPLAYED_HEADER, response.headers)
+        self.assertEqual(Application.objects.count(), 2)
+        record = IdempotencyKey.objects.get()
+        self.assertEqual((record.state, record.response_body["slug"]), (idempotency.COMPLETED, response.json()["slug"]))
+
+    def test_async_contact_create(self):
+        data = {"full_name": "Ali Valiyev", "email": "ali@example.com", "theme": "Hamkorlik", "message": "Salom"}
+        with mock.patch("core.views.send_telegram_message", new=mock.AsyncMock()) as send:
+            first = self.client.post("/api/contact-us/", data, HTTP_IDEMPOTENCY_KEY="kalit-1")
+            second = self.client.post("/api/contact-us/", data, HTTP_IDEMPOTENCY_KEY="kalit-1")
+            changed = self.client.post("/api/contact-us/", {**data, "message": "Boshqa"}, HTTP_IDEMPOTENCY_KEY="kalit-1")
+
+        self.assertEqual((first.status_code, second.status_code, changed.status_code), (201, 201, 422))
+        self.assertEqual(second.headers[idempotency.REPLAYED_HEADER], "true")
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(ContactUs.objects.count(), 1)
+        send.assert_awaited_once()
+
+    def test_application_and_contact_keys_are_scoped(self):
+        self.post_application("kalit-1")
+        data = {"full_name": "Ali Valiyev", "email": "ali@example.com", "theme": "Hamkorlik", "message": "Salom"}
+        with mock.patch("core.views.send_telegram_message", new=mock.AsyncMock()):
+            response = self.client.post("/api/contact-us/", data, HTTP_IDEMPOTENCY_KEY="kalit-1")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(IdempotencyKey.objects.count(), 2)
+
+
+@override_settings(ALLOWED_HOSTS=["*"], APPLICATION_INTAKE_MAX_ATTEMPTS=2)
+class IntakeTests(StatsAssertionsMixin, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.media = override_settings(MEDIA_ROOT=cls.media_root)
+        cls.media.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.media.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.category, self.subcategory = make_taxonomy()
+        self.client = Client(HTTP_HOST="localhost")
+        stats.reconcile()
+        stats.rebuild_rollups()
+
+    def submit(self, images=2):
+        data = submission(self.category, self.subcategory)
+        data["images"] = [SimpleUploadedFile(f"{n}.png", b"rasm", "image/png") for n in range(images)]
+        response = self.client.post("/api/applications/?async=1", data)
+        self.assertEqual(response.status_code, 202)
+        return response
+
+    def imgbb(self, *results):
+        """imgbb o'rniga: URL (str) qaytaradi yoki xato (Exception) ko'taradi"""
+        return mock.patch("core.models.upload_to_imgbb", side_effect=results)
+
+    def test_create_returns_202_with_status_location(self):
+        response = self.submit()
+        body = response.json()
+        self.assertEqual(response.headers["Location"], body["status_url"])
+        self.assertEqual(
+            response.headers["Location"], reverse("application_intake", kwargs={"intake_id": body["id"]}),
+        )
+        self.assertEqual((body["state"], body["images_total"], body["slug"]), (intake.QUEUED, 2, None))
+        self.assertFalse(Application.objects.exists())
+
+        stored = ApplicationIntake.objects.get().files["images"]
+        self.assertTrue(all(os.path.exists(os.path.join(self.media_root, path)) for path in stored))
+
+        status_response = self.client.get(response.headers["Location"])
+        self.assertEqual(status_response.status_code, 200)
+        self.assertEqual(status_response.json()["state"], intake.QUEUED)
+
+    def test_invalid_submission_is_rejected_before_queueing(self):
+        data = submission(self.category, self.subcategory, birth_date="")
+        response = self.client.post("/api/applications/?async=1", data)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ApplicationIntake.objects.exists())
+
+    def test_unknown_intake_is_404(self):
+        response = self.client.get(reverse("application_intake", kwargs={"intake_id": uuid.uuid4()}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_claim_is_exclusive(self):
+        self.submit()
+        claimed = intake.claim()
+        self.assertEqual((claimed.state, claimed.attempts), (intake.PROCESSING, 1))
+        # Ikkinchi worker: yozuv allaqachon egallangan
+        self.assertIsNone(intake.claim())
+
+        # Shu qiymatlarni avvalroq o'qigan worker'ning shartli UPDATE'i hech narsa o'zgartirmaydi
+        self.assertEqual(
+            ApplicationIntake.objects.filter(pk=claimed.pk, state=intake.QUEUED, started_date=None)
+            .update(state=intake.PROCESSING), 0,
+        )
+
+    @override_settings(APPLICATION_INTAKE_STALE_SECONDS=60)
+    def test_stale_processing_intake_is_claimed_again(self):
+        self.submit()
+        claimed = intake.claim()
+        ApplicationIntake.objects.filter(pk=claimed.pk).update(
+            started_date=timezone.now() - datetime.timedelta(seconds=120),
+        )
+        reclaimed = intake.claim()
+        self.assertEqual((reclaimed.pk, reclaimed.attempts), (claimed.pk, 2))
+        self.assertIsNone(intake.claim())
+
+    def test_process_creates_application_and_reports_slug(self):
+        location = self.submit().headers["Location"]
+        with self.imgbb("https://i.ibb.co/1.png", "https://i.ibb.co/2.png"):
+            self.assertEqual(intake.process(intake.claim()), intake.COMPLETED)
+
+        application = Application.objects.get()
+        self.assertEqual(
+            sorted(application.images.values_list("image_url", flat=True)),
+            ["https://i.ibb.co/1.png", "https://i.ibb.co/2.png"],
+        )
+        body = self.client.get(location).json()
+        self.assertEqual((body["state"], body["slug"], body["images_done"]), (intake.COMPLETED, application.slug, 2))
+        self.assertIsNotNone(body["finished_date"])
+        stored = ApplicationIntake.objects.get().files["images"]
+        self.assertFalse(any(os.path.exists(os.path.join(self.media_root, path)) for path in stored))
+        self.assertStatsConsistent()
+
+    def test_retry_continues_after_failed_image(self):
+        self.submit()
+        with self.imgbb("https://i.ibb.co/1.png", ConnectionError("imgbb")), self.assertLogs("core.intake", "ERROR"):
+            self.assertEqual(intake.process(intake.claim()), intake.QUEUED)
+
+        record = ApplicationIntake.objects.get()
+        self.assertEqual((record.images_done, record.error), (1, {"error": "imgbb"}))
+        self.assertGreater(record.retry_date, timezone.now())
+        # Kechikish tugamaguncha qayta olinmaydi
+        self.assertIsNone(intake.claim())
+
+        ApplicationIntake.objects.update(retry_date=timezone.now())
+        with self.imgbb("https://i.ibb.co/2.png") as upload:
+            retried = intake.claim()
+            self.assertEqual(retried.attempts, 2)
+            self.assertEqual(intake.process(retried), intake.COMPLETED)
+        # Birinchi rasm qayta yuklanmaydi, ariza qayta yaratilmaydi
+        self.assertEqual(upload.call_count, 1)
+        application = Application.objects.get()
+        self.assertEqual(application.slug, ApplicationIntake.objects.get().slug)
+        self.assertEqual(application.images.count(), 2)
+        self.assertStatsConsistent()
+
+    def test_last_failed_attempt_removes_partial_application(self):
+        location = self.submit().headers["Location"]
+        for _ in range(2):
+            ApplicationIntake.objects.update(retry_date=None)
+            with self.imgbb(ConnectionError("imgbb")), self.assertLogs("core.intake", "ERROR"):
+                state = intake.process(intake.claim())
+        self.assertEqual(state, intake.FAILED)
+        self.assertFalse(Application.objects.exists())
+
+        body = self.client.get(location).json()
+        self.assertEqual((body["state"], body["slug"], body["error"]), (intake.FAILED, None, {"error": "imgbb"}))
+        self.assertStatsConsistent()
+
+
+class TrackedFieldsTests(StatsAssertionsMixin, TestCase):
+    def setUp(self):
+        self.category, self.subcategory = make_taxonomy()
+        self.application = make_application(self.category, self.subcategory, status="pending")
+        stats.reconcile()
+
+    def test_deferred_status_is_read_before_save(self):
+        application = Application.objects.only("id", "full_name").get(pk=self.application.pk)
+        application.status = "accepted"
+        application.save()
+        self.assertEqual(stats.get_counters()["accepted_applications"], 1)
+        self.assertStatsConsistent()
+
+    def test_deferred_instance_save_keeps_counters(self):
+        application = Application.objects.defer("status", "region").get(pk=self.application.pk)
+        application.full_name = "Vali Aliyev"
+        application.save()
+        self.assertStatsConsistent()
+
+    def test_deferred_instance_delete(self):
+        Application.objects.only("id").get(pk=self.application.pk).delete()
+        self.assertStatsConsistent()
+
+
+class PhoneSearchTests(TestCase):
+    QUERIES = ("+998901234567", "998 90 123", "90 123 45 67", "90 123", "+998 (90) 123-45-67")
+
+    def setUp(self):
+        self.category, self.subcategory = make_taxonomy()
+
+    def test_normalize_phone_adds_country_code_to_local_numbers(self):
+        self.assertEqual(normalize_phone("90 123 45 67"), "998901234567")
+        self.assertEqual(normalize_phone("+998 90 123-45-67"), "998901234567")
+        self.assertEqual(normalize_phone("90 123"), "90123")
+
+    def test_local_and_international_input_are_found_by_both_query_shapes(self):
+        for phone_number in ("90 123 45 67", "+998 90 123-45-67"):
+            with self.subTest(phone_number=phone_number):
+                application = make_application(self.category, self.subcategory, phone_number=phone_number)
+                self.assertEqual(application.phone_digits, "998901234567")
+                for query in self.QUERIES:
+                    found = search_applications(Application.objects.all(), query)
+                    self.assertEqual([*found.values_list("pk", flat=True)], [application.pk], query)
+                application.delete()
+
+    def test_other_numbers_are_not_matched(self):
+        make_application(self.category, self.subcategory, phone_number="91 765 43 21")
+        for query in self.QUERIES:
+            self.assertFalse(search_applications(Application.objects.all(), query).exists(), query)
+
+
+class AutocompleteTests(TestCase):
+    def setUp(self):
+        self.category, self.subcategory = make_taxonomy()
+        worker = mock.patch("core.autocomplete.start")
+        worker.start()
+        self.addCleanup(worker.stop)
+        caches["default"].clear()
+        self.addCleanup(caches["default"].clear)
+        for field in autocomplete.SOURCES:
+            autocomplete.rebuild(field)
+
+    def districts(self, query):
+        return [entry["value"] for entry in autocomplete.suggest("district", query)]
+
+    def test_index_is_updated_after_commit(self):
+        self.assertEqual(self.districts("yunus"), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            make_application(self.category, self.subcategory, district="Yunusobod")
+            self.assertEqual(self.districts("yunus"), [])
+        self.assertEqual(self.districts("yunus"), ["Yunusobod"])
+
+    def test_rolled_back_change_is_not_indexed(self):
+        self.districts("yunus")
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(ValueError), transaction.atomic():
+                make_application(self.category, self.subcategory, district="Yunusobod")
+                raise ValueError
+        self.assertEqual(self.districts("yunus"), [])
+
+    def test_search_ranks_beyond_first_keys(self):
+        index = autocomplete.PrefixIndex()
+        index.load([(f"a{i:05d}", f"a{i:05d}", 1, None) for i in range(5000)] + [("azz", "azz", 50, None)])
+        self.assertEqual(index.search("a", limit=1)[0]["value"], "azz")
+
+    def test_request_path_never_reads_the_database(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            make_application(self.category, self.subcategory, district="Yunusobod")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.districts("yunus"), ["Yunusobod"])
+
+        # Ommaviy o'zgarish: qayta qurish fon thread'iga qoldiriladi
+        Application.objects.update(district="Chilonzor")
+        autocomplete.invalidate("district")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.districts("yunus"), ["Yunusobod"])
+        autocomplete.refresh_stale()
+        self.assertEqual(self.districts("chil"), ["Chilonzor"])
+
+    def test_deltas_from_other_processes_are_applied_without_rebuild(self):
+        # Boshqa jarayon: versiyani oshirib deltani keshga yozgan
+        version = autocomplete._bump_version("district")
+        caches["default"].set(autocomplete._delta_key("district", version), ("counted", "", "Sergeli"))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.districts("serg"), ["Sergeli"])
+        self.assertFalse(autocomplete._stale)
+
+    def test_missing_delta_marks_index_stale(self):
+        autocomplete._bump_version("district")
+        self.districts("a")
+        self.assertIn("district", autocomplete._stale)
+        autocomplete.refresh_stale()
+        self.assertFalse(autocomplete._stale)
+
+    def test_searches_are_served_while_rebuilding(self):
+        loading, release = threading.Event(), threading.Event()
+
+        def slow_items():
+            loading.set()
+            release.wait(5)
+            yield "yangi", "Yangi", 1, None
+
+        with mock.patch.dict(autocomplete.SOURCES, {"district": slow_items}):
+            builder = threading.Thread(target=autocomplete.rebuild, args=("district",))
+            builder.start()
+            try:
+                self.assertTrue(loading.wait(5))
+                # DB'dan o'qish davomida qulf ushlanmaydi: qidiruv eski nusxadan javob beradi
+                self.assertEqual(self.districts("yangi"), [])
+            finally:
+                release.set()
+                builder.join(5)
+        self.assertEqual(self.districts("yangi"), ["Yangi"])
+
+    def test_search_reads_only_the_prefix_list(self):
+        index = autocomplete.PrefixIndex()
+        index.load([(f"a{i:05d}", f"a{i:05d}", i % 7, None) for i in range(5000)])
+        with mock.patch.object(autocomplete.PrefixIndex, "_collect", side_effect=AssertionError("scan")):
+            self.assertEqual(len(index.search("a", limit=10)), 10)
+
+    def test_prefix_lists_stay_exact_under_changes(self):
+        rng = random.Random(7)
+        words = ["olma", "olmazor", "olot", "oltin", "ona", "orol", "osh", "otabek", "oybek", "oq"]
+        index = autocomplete.PrefixIndex()
+        index.load([(word, word.title(), rng.randint(1, 5), None) for word in words])
+        for query in ("o", "ol", "olm"):
+            index.search(query)
+        for _ in range(300):
+            word = rng.choice(words + [f"o{rng.randint(0, 30)}"])
+            if rng.random() < 0.55:
+                index.add(word, word.title(), count=rng.randint(1, 3))
+            else:
+                index.remove(word, count=rng.choice([1, 2, None]))
+            for query in ("o", "ol", "olm"):
+                expected = sorted(
+                    (entry_id for entry_id, text in index._texts.items() if text.startswith(query)),
+                    key=lambda entry_id: index._rank(query, entry_id),
+                )[:autocomplete.TOP_K]
+                got = [entry["value"] for entry in index.search(query, limit=autocomplete.TOP_K)]
+                self.assertEqual(got, [index.entries[entry_id]["value"] for entry_id in expected])
+
+
+class ArchiveTests(StatsAssertionsMixin, TestCase):
+    def setUp(self):
+        self.category, self.subcategory = make_taxonomy()
+
+    def test_closed_applications_move_with_images_and_counters_stay(self):
+        old = make_application(self.category, self.subcategory, status="accepted", passport_number="AA 0000001")
+        recent = make_application(
+            self.category, self.subcategory, status="denied", denied_reason="Hujjat yetarli emas",
+            passport_number="AA 0000002",
+        )
+        pending = make_application(self.category, self.subcategory, passport_number="AA 0000003")
+        Application.objects.filter(pk=old.pk).update(closed_date=timezone.now() - datetime.timedelta(days=40))
+        ApplicationImage.objects.bulk_create([
+            ApplicationImage(application=old, image_url="https://example.com/1.png"),
+            ApplicationImage(application=recent, image_url="https://example.com/2.png"),
+        ])
+        stats.reconcile()
+        stats.rebuild_rollups()
+        counters = stats.get_counters()
+
+        self.assertEqual(archive_applications(30, batch_size=1), (1, 1))
+
+        self.assertEqual(set(Application.objects.values_list("pk", flat=True)), {recent.pk, pending.pk})
+        archived = ArchivedApplication.objects.get()
+        self.assertEqual(archived.original_id, old.pk)
+        self.assertEqual(
+            [*ArchivedApplicationImage.objects.values_list("application_id", "image_url")],
+            [(archived.pk, "https://example.com/1.png")],
+        )
+        self.assertEqual([*ApplicationImage.objects.values_list("application_id", flat=True)], [recent.pk])
+        self.assertEqual(stats.get_counters(), counters)
+        self.assertStatsConsistent()
+
+    def test_include_archived_list_pages_the_union(self):
+        now = timezone.now()
+        for days in (1, 2, 3):
+            application = make_application(self.category, self.subcategory, status="accepted")
+            Application.objects.filter(pk=application.pk).update(
+                created_date=now - datetime.timedelta(days=days),
+                closed_date=now - datetime.timedelta(days=40 if days == 3 else 1),
+            )
+        archive_applications(30)
+        client = Client(HTTP_HOST="localhost")
+        url = reverse("application-list")
+        with override_settings(ALLOWED_HOSTS=["*"]), CaptureQueriesContext(connection) as queries:
+            first = client.get(url, {"include_archived": "1", "limit": 2}).json()
+            second = client.get(url, {"include_archived": "1", "limit": 2, "offset": 2}).json()
+        self.assertEqual((first["count"], len(first["results"])), (3, 2))
+        self.assertEqual(len(second["results"]), 1)
+        self.assertEqual(second["results"][0]["slug"], ArchivedApplication.objects.get().slug)
+        created = [item["created_date"] for item in first["results"] + second["results"]]
+        self.assertEqual(created, sorted(created, reverse=True))
+        # Kalitlar UNION'i sahifa bilan cheklanadi, to'liq o'qilmaydi
+        unions = [q["sql"] for q in queries if "UNION" in q["sql"]]
+        self.assertTrue(unions)
+        self.assertTrue(all("LIMIT 2" in sql for sql in unions))
+
+
+class SlugTests(TestCase):
+    LONG_NAME = "Abdurahmonov Abdulaziz Abdurashid o'g'li Toshkent viloyati"
+
+    def setUp(self):
+        self.category, self.subcategory = make_taxonomy()
+
+    def allocate(self, full_name):
+        application = Application(full_name=full_name)
+        SlugAllocator().assign([application])
+        return application.slug
+
+    def test_api_and_import_share_the_slug_base(self):
+        base = unique_slug(self.LONG_NAME)
+        self.assertLessEqual(len(base), Application._meta.get_field("slug").max_length - 8)
+        self.assertFalse(base.endswith("-"))
+        self.assertEqual(self.allocate(self.LONG_NAME), base)
+
+        make_application(self.category, self.subcategory, full_name=self.LONG_NAME, slug=base)
+        self.assertEqual(unique_slug(self.LONG_NAME), f"{base}-1")
+        self.assertEqual(self.allocate(self.LONG_NAME), f"{base}-1")
+
+    def test_model_save_uses_the_same_base(self):
+        application = make_application(self.category, self.subcategory, full_name=self.LONG_NAME)
+        self.assertEqual(application.slug, application_slug_base(self.LONG_NAME))
+        self.assertEqual(self.allocate(self.LONG_NAME), f"{application.slug}-1")
+
+    def test_archived_slugs_are_not_reused(self):
+        archived = make_application(self.category, self.subcategory, full_name=self.LONG_NAME, status="accepted")
+        Application.objects.filter(pk=archived.pk).update(closed_date=timezone.now() - datetime.timedelta(days=40))
+        archive_applications(30)
+        base = archived.slug
+        self.assertFalse(Application.objects.filter(slug=base).exists())
+
+        self.assertEqual(unique_slug(self.LONG_NAME), f"{base}-1")
+        self.assertEqual(self.allocate(self.LONG_NAME), f"{base}-1")
+        self.assertEqual(make_application(self.category, self.subcategory, full_name=self.LONG_NAME).slug, f"{base}-1")
+
+        other = make_application(self.category, self.subcategory, full_name="Boshqa Ism")
+        client = Client(HTTP_HOST="localhost")
+        with override_settings(ALLOWED_HOSTS=["*"]):
+            response = client.patch(
+                reverse("application-detail", args=[other.slug]),
+                encode_multipart(BOUNDARY, {"full_name": self.LONG_NAME}),
+                content_type=MULTIPART_CONTENT,
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+        other.refresh_from_db()
+        self.assertEqual(other.slug, f"{base}-2")
+
+
+class SnapshotTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        overrides = override_settings(SNAPSHOT_ROOT=self.root, SNAPSHOT_KEEP_VERSIONS=2)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def read(self, filename):
+        with open(os.path.join(self.root, filename), encoding="utf-8") as f:
+            return json.load(f)
+
+    def versions(self):
+        return sorted(
+            name for name in os.listdir(self.root) if name.startswith("categories.") and name.count(".") == 2
+        )
+
+    def test_publish_writes_versioned_latest_and_manifest(self):
+        Category.objects.create(title="Birinchi")
+        filename = snapshots.publish("categories")
+
+        latest = self.read("categories.json")
+        self.assertEqual(latest, self.read(filename))
+        self.assertEqual([item["title"] for item in latest["data"]], ["Birinchi"])
+        entry = self.read("manifest.json")["categories"]
+        self.assertEqual(entry["file"], filename)
+        self.assertEqual(entry["url"], f"/api/snapshots/{filename}")
+        self.assertFalse([name for name in os.listdir(self.root) if name.startswith(".tmp-")])
+
+    def test_unchanged_data_keeps_the_version(self):
+        Category.objects.create(title="Birinchi")
+        filename = snapshots.publish("categories")
+        self.assertEqual(snapshots.publish("categories"), filename)
+        self.assertEqual(self.versions(), [filename])
+
+    def test_old_versions_are_pruned_but_current_is_kept(self):
+        published = []
+        for title in ("Birinchi", "Ikkinchi", "Uchinchi"):
+            Category.objects.create(title=title)
+            published.append(snapshots.publish("categories"))
+            # Bir xil mtime bo'lsa ham joriy versiya qolishi kerak
+            for name in self.versions():
+                os.utime(os.path.join(self.root, name), (0, 0))
+
+        remaining = self.versions()
+        self.assertEqual(len(remaining), 2)
+        self.assertIn(published[-1], remaining)
+        self.assertEqual(self.read("manifest.json")["categories"]["file"], published[-1])
+
+    def test_failed_write_keeps_previous_file_and_removes_temp(self):
+        Category.objects.create(title="Birinchi")
+        snapshots.publish("categories")
+        before = self.read("categories.json")
+
+        Category.objects.create(title="Ikkinchi")
+        with mock.patch("core.snapshots.os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                snapshots.publish("categories")
+
+        self.assertEqual(self.read("categories.json"), before)
+        self.assertFalse([name for name in os.listdir(self.root) if name.startswith(".tmp-")])
+
+    def test_manifest_keeps_other_snapshots(self):
+        snapshots.publish("about")
+        snapshots.publish("categories")
+        self.assertEqual(set(self.read("manifest.json")), {"about", "categories"})
+
+
+@override_settings(SYNC_SETTLE_SECONDS=0)
+class SyncTests(TestCase):
+    def setUp(self):
+        self.categories = [Category.objects.create(title=f"Kategoriya {i}") for i in range(3)]
+        self.subcategories = [
+            Subcategory.objects.create(title=f"Subkategoriya {i}", slug=f"sub-{i}") for i in range(2)
+        ]
+        # Bir xil timestamp: tartibni faqat (kind, pk) hal qiladi
+        ts = timezone.now() - datetime.timedelta(minutes=1)
+        Category.objects.update(updated_date=ts)
+        Subcategory.objects.update(updated_date=ts)
+
+    def drain(self, since=None, limit=2):
+        seen = []
+        while True:
+            page = sync.get_changes(since=since, limit=limit)
+            seen.extend((change["model"], change["op"], change["id"]) for change in page["changes"])
+            since = page["cursor"]
+            if not page["has_more"]:
+                return seen, since
+
+    def test_pages_cover_every_row_once(self):
+        seen, _ = self.drain()
+        expected = [("category", "upsert", c.pk) for c in self.categories]
+        expected += [("subcategory", "upsert", s.pk) for s in self.subcategories]
+        self.assertEqual(seen, expected)
+
+    def test_cursor_returns_only_later_changes(self):
+        _, cursor = self.drain()
+        self.assertEqual(sync.get_changes(since=cursor)["changes"], [])
+
+        category = self.categories[1]
+        category.title = "Yangilangan"
+        category.save()
+        deleted_pk = self.subcategories[0].pk
+        self.subcategories[0].delete()
+
+        seen, _ = self.drain(since=cursor)
+        self.assertIn(("category", "upsert", category.pk), seen)
+        self.assertIn(("subcategory", "delete", deleted_pk), seen)
+        self.assertNotIn(("category", "upsert", self.categories[0].pk), seen)
+
+    def test_expired_cursor(self):
+        old = sync.encode_cursor(timezone.now() - datetime.timedelta(days=365), 0, 0)
+        with self.assertRaises(sync.CursorExpired):
+            sync.get_changes(since=old)
+
+        client = Client(HTTP_HOST="localhost")
+        with override_settings(ALLOWED_HOSTS=["*"]):
+            response = client.get(reverse("sync"), {"since": old})
+            self.assertEqual(response.status_code, 410)
+            self.assertTrue(response.json()["reset"])
+            self.assertEqual(client.get(reverse("sync"), {"since": "!!"}).status_code, 400)
+
+    def test_prune_removes_only_old_tombstones(self):
+        self.subcategories[0].delete()
+        Tombstone.objects.create(model="blog", object_id=1)
+        Tombstone.objects.filter(model="blog").update(
+            deleted_date=timezone.now() - datetime.timedelta(days=365)
+        )
+        self.assertEqual(sync.prune_tombstones(), 1)
+        self.assertEqual([*Tombstone.objects.values_list("model", flat=True)], ["subcategory"])
+
+
+@override_settings(ALLOWED_HOSTS=["*"])
+class BatchTests(TestCase):
+    def setUp(self):
+        self.client = Client(HTTP_HOST="localhost")
+        self.category = Category.objects.create(title="Kategoriya")
+
+    def batch(self, *paths, token=None, **extra):
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"} if token else {}
+        response = self.client.post(
+            reverse("batch"), {"requests": [*paths], **extra}, content_type="application/json", **headers
+        )
+        self.assertEqual(response.status_code, 200)
+        return [(item["path"], item["status"]) for item in response.json()["responses"]], response.json()
+
+    def token(self):
+        user = User.objects.create_user("batch", "batch@example.com", "parol12345")
+        return str(RefreshToken.for_user(user).access_token)
+
+    def test_sub_requests_keep_order_and_status(self):
+        statuses, data = self.batch(
+            "/api/categories/", "/api/about/", "/api/yoq/", "https://example.com/api/about/", "/api/batch/"
+        )
+        self.assertEqual(statuses, [
+            ("/api/categories/", 200), ("/api/about/", 404), ("/api/yoq/", 404),
+            ("https://example.com/api/about/", 400), ("/api/batch/", 400),
+        ])
+        self.assertEqual(data["responses"][0]["body"][0]["title"], "Kategoriya")
+
+    def test_auth_is_forwarded(self):
+        self.assertEqual(self.batch("/api/auth/test/")[0], [("/api/auth/test/", 401)])
+        self.assertEqual(self.batch("/api/auth/test/", token=self.token())[0], [("/api/auth/test/", 200)])
+
+    def test_failing_item_does_not_break_the_others(self):
+        with mock.patch("core.views.CategoryViewSet.list", side_effect=RuntimeError("boom")):
+            with self.assertLogs("core.batch", "ERROR"):
+                statuses, _ = self.batch("/api/categories/", "/api/about/")
+        self.assertEqual(statuses, [("/api/categories/", 500), ("/api/about/", 404)])
+
+    def test_parallel_workers_close_their_connections(self):
+        with mock.patch("core.batch.connections") as connections:
+            statuses, _ = self.batch("/api/auth/test/", "/api/yoq/", token=self.token(), parallel=True)
+        self.assertEqual(statuses, [("/api/auth/test/", 200), ("/api/yoq/", 404)])
+        self.assertEqual(connections.close_all.call_count, 2)
+
+    def test_too_many_requests_is_rejected(self):
+        response = self.client.post(
+            reverse("batch"), {"requests": ["/api/about/"] * 11}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class CounterTests(StatsAssertionsMixin, TestCase):
+    def setUp(self):
+        self.category, self.subcategory = make_taxonomy()
+
+    def contact(self, **kwargs):
+        return ContactUs.objects.create(
+            full_name="Ali", email="ali@example.com", theme="Boshqa", message="Salom", **kwargs
+        )
+
+    def test_signals_apply_deltas(self):
+        first = make_application(self.category, self.subcategory)
+        second = make_application(self.category, self.subcategory)
+        first.status = "accepted"
+        first.save()
+        second.delete()
+        message = self.contact()
+        self.contact(is_read=True)
+        message.is_read = True
+        message.save()
+
+        counters = stats.get_counters()
+        self.assertEqual(counters["total_applications"], 1)
+        self.assertEqual(counters["accepted_applications"], 1)
+        self.assertEqual(counters["pending_applications"], 0)
+        self.assertEqual(counters["total_contacts"], 2)
+        self.assertEqual(counters["unread_contacts"], 0)
+        self.assertEqual(counters["total_categories"], 1)
+        self.assertStatsConsistent()
+
+    def test_reconcile_repairs_drift_from_bulk_update(self):
+        make_application(self.category, self.subcategory)
+        # queryset.update() signal yubormaydi: hisoblagich eskiradi
+        Application.objects.update(status="accepted")
+        self.assertEqual(stats.get_counters()["pending_applications"], 1)
+
+        self.assertEqual(stats.reconcile(), {
+            "accepted_applications": (0, 1),
+            "pending_applications": (1, 0),
+        })
+        self.assertEqual(stats.get_counters(), stats.compute_counts())
+        self.assertEqual(stats.reconcile(), {})
+
+    def test_missing_row_is_counted_on_first_read(self):
+        make_application(self.category, self.subcategory)
+        StatisticsCounter.objects.all().delete()
+        self.assertEqual(stats.get_counters(), stats.compute_counts())
+
+    def test_delta_without_row_recounts(self):
+        make_application(self.category, self.subcategory)
+        StatisticsCounter.objects.all().delete()
+        stats.apply_deltas({"total_applications": 1})
+        # Qator qayta sanab yaratiladi: delta ikki marta qo'shilmaydi
+        self.assertEqual(stats.get_counters()["total_applications"], 1)
+
+
+class RollupTests(StatsAssertionsMixin, TestCase):
+    def setUp(self):
+        self.category, self.subcategory = make_taxonomy()
+        self.regions = [REGION_CHOICES[0][0], REGION_CHOICES[1][0]]
+
+    def test_status_and_region_changes_move_counts(self):
+        application = make_application(self.category, self.subcategory)
+        make_application(self.category, self.subcategory, region=self.regions[1])
+        application.status = "accepted"
+        application.region = self.regions[1]
+        application.save()
+
+        total, rows = stats.breakdown(["region", "status"], {})
+        self.assertEqual(total, 2)
+        # Saralash kod bo'yicha (choices tartibi): pending, accepted, denied
+        self.assertEqual(
+            [(row["region"], row["status"], row["count"]) for row in rows],
+            [(self.regions[1], "pending", 1), (self.regions[1], "accepted", 1)],
+        )
+        # Bo'shab qolgan kalit qatori o'chiriladi
+        self.assertFalse(ApplicationRollup.objects.filter(count__lte=0).exists())
+        self.assertStatsConsistent()
+
+    def test_filters_and_dates(self):
+        today = timezone.localdate()
+        make_application(self.category, self.subcategory)
+        old = make_application(self.category, self.subcategory, region=self.regions[1])
+        Application.objects.filter(pk=old.pk).update(created_date=timezone.now() - datetime.timedelta(days=40))
+        stats.rebuild_rollups()
+
+        self.assertEqual(stats.breakdown([], {"date_from": today})[0], 1)
+        self.assertEqual(stats.breakdown([], {"region": [self.regions[1]]})[0], 1)
+        total, rows = stats.breakdown(["category"], {"status": ["pending"]})
+        self.assertEqual(total, 2)
+        self.assertEqual(rows[0]["category__title"], self.category.title)
+
+    def test_breakdown_api_validates_params(self):
+        make_application(self.category, self.subcategory)
+        client = Client(HTTP_HOST="localhost")
+        with override_settings(ALLOWED_HOSTS=["*"]):
+            url = reverse("statistics_breakdown")
+            response = client.get(url, {"group_by": "status"})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["total"], 1)
+            self.assertEqual(client.get(url, {"group_by": "day,month"}).status_code, 400)
+            self.assertEqual(client.get(url, {"group_by": "nima"}).status_code, 400)
+            self.assertEqual(client.get(url, {"date_from": "2024-13-01"}).status_code, 400)
+
+
+@override_settings(BLOG_VIEW_DEDUP_WINDOW=60)
+class BlogViewBufferTests(TestCase):
+    def setUp(self):
+        caches["hits"].clear()
+        self.addCleanup(caches["hits"].clear)
+        flusher = mock.patch("core.hits._ensure_flusher")
+        flusher.start()
+        self.addCleanup(flusher.stop)
+        self.blog = make_blog()
+        self.factory = RequestFactory()
+
+    def view(self, blog=None, agent="Test/1.0"):
+        request = self.factory.get("/", HTTP_USER_AGENT=agent)
+        request.user = AnonymousUser()
+        return hits.record_view(request, blog or self.blog)
+
+    def test_dedup_window(self):
+        self.assertTrue(self.view())
+        self.assertFalse(self.view())
+        self.assertTrue(self.view(agent="Boshqa/2.0"))
+
+        later = timezone.now().timestamp() + 61
+        with mock.patch("django.core.cache.backends.locmem.time.time", return_value=later):
+            self.assertTrue(self.view())
+        self.assertEqual(hits.pending_views(self.blog.pk), 3)
+
+    def test_read_merges_persisted_and_pending(self):
+        HitCount.objects.create(content_type=ContentType.objects.get_for_model(Blog), object_pk=self.blog.pk, hits=5)
+        self.view()
+        self.view(agent="Boshqa/2.0")
+        self.assertEqual(hits.get_view_count(self.blog), 7)
+
+        self.assertEqual(hits.flush(), 2)
+        self.assertEqual(hits.pending_views(self.blog.pk), 0)
+        self.assertEqual(hits.get_view_count(self.blog), 7)
+
+    def test_flush_is_one_batched_update(self):
+        other = make_blog("Ikkinchi blog")
+        self.view()
+        self.view(agent="Boshqa/2.0")
+        self.view(other)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(hits.flush(), 3)
+        table = HitCount._meta.db_table
+        updates = [q["sql"] for q in queries.captured_queries if q["sql"].startswith(f'UPDATE "{table}"')]
+        self.assertEqual(len(updates), 1)
+
+        ctype = ContentType.objects.get_for_model(Blog)
+        self.assertEqual(
+            dict(HitCount.objects.filter(content_type=ctype).values_list("object_pk", "hits")),
+            {self.blog.pk: 2, other.pk: 1},
+        )
+        self.assertEqual(
+            dict(BlogViewDaily.objects.filter(day=timezone.localdate()).values_list("blog_id", "views")),
+            {self.blog.pk: 2, other.pk: 1},
+        )
+
+    def test_failed_flush_returns_views_to_the_cache(self):
+        self.view()
+        with mock.patch("core.hits._apply", side_effect=RuntimeError("db")):
+            with self.assertRaises(RuntimeError):
+                hits.flush()
+        self.assertEqual(hits.pending_views(self.blog.pk), 1)
+        self.assertEqual(hits.flush(), 1)
+
+    def test_only_one_worker_flushes(self):
+        self.view()
+        caches["hits"].add(hits.FLUSH_LOCK_KEY, 1)
+        self.assertEqual(hits.flush(), 0)
+        self.assertEqual(hits.pending_views(self.blog.pk), 1)
+
+
+class HitCompactionTests(TestCase):
+    def setUp(self):
+        caches["hits"].clear()
+        self.addCleanup(caches["hits"].clear)
+        self.blog = make_blog()
+        self.hitcount = HitCount.objects.create(
+            content_type=ContentType.objects.get_for_model(Blog), object_pk=self.blog.pk, hits=3
+        )
+        self.today = timezone.localdate()
+
+    def legacy_hits(self, days_ago, count):
+        # bulk_create: Hit.save() HitCount'ni oshirmasin (jami allaqachon yozilgan)
+        hits_ = Hit.objects.bulk_create(
+            [Hit(hitcount=self.hitcount, ip="127.0.0.1", session="s", user_agent="ua") for _ in range(count)]
+        )
+        Hit.objects.filter(pk__in=[hit.pk for hit in hits_]).update(
+            created=timezone.now() - datetime.timedelta(days=days_ago)
+        )
+
+    def test_hits_move_into_daily_rows_in_batches(self):
+        self.legacy_hits(1, 2)
+        self.legacy_hits(40, 1)
+        BlogViewDaily.objects.create(blog=self.blog, day=self.today - datetime.timedelta(days=1), views=5)
+
+        self.assertEqual(hits.compact_hits(batch_size=2), (3, 2))
+        self.assertFalse(Hit.objects.exists())
+        self.assertEqual(
+            dict(BlogViewDaily.objects.values_list("day", "views")),
+            {self.today - datetime.timedelta(days=1): 7, self.today - datetime.timedelta(days=40): 1},
+        )
+        self.hitcount.refresh_from_db()
+        self.assertEqual(self.hitcount.hits, 3)
+
+    def test_second_run_is_a_no_op(self):
+        self.legacy_hits(1, 1)
+        hits.compact_hits()
+        self.assertEqual(hits.compact_hits(), (0, 0))
+        self.assertEqual(BlogViewDaily.objects.get().views, 1)
+
+    def test_history_reads_only_daily_rows_and_pending(self):
+        BlogViewDaily.objects.create(blog=self.blog, day=self.today - datetime.timedelta(days=1), views=4)
+        hits._add_pending({self.blog.pk: 2})
+        with CaptureQueriesContext(connection) as queries:
+            history = hits.view_history(self.blog, days=3)
+        self.assertEqual([day["views"] for day in history], [0, 4, 2])
+        self.assertFalse([q for q in queries.captured_queries if Hit._meta.db_table in q["sql"]])
+
+
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        caches["hits"].clear()
+        self.addCleanup(caches["default"].clear)
+        self.addCleanup(caches["hits"].clear)
+        self.today = timezone.localdate()
+        self.recent = make_blog("Yangi")
+        self.older = make_blog("Eski")
+        for blog, days_ago, views in ((self.recent, 1, 5), (self.older, 20, 9)):
+            BlogViewDaily.objects.create(blog=blog, day=self.today - datetime.timedelta(days=days_ago), views=views)
+        HitCount.objects.create(
+            content_type=ContentType.objects.get_for_model(Blog), object_pk=self.older.pk, hits=14
+        )
+
+    def ranking(self, window):
+        return [(entry["blog"]["id"], entry["views"]) for entry in leaderboard.get_popular(window)]
+
+    def test_windows_are_summed_from_daily_rows(self):
+        call_command("rebuild_blog_leaderboard", stdout=io.StringIO())
+        self.assertEqual(self.ranking("7d"), [(self.recent.pk, 5)])
+        self.assertEqual(self.ranking("30d"), [(self.older.pk, 9), (self.recent.pk, 5)])
+        self.assertEqual(self.ranking("all"), [(self.older.pk, 14)])
+
+    def test_read_never_recomputes_or_touches_hits(self):
+        leaderboard.refresh()
+        BlogLeaderboard.objects.update(computed_day=self.today - datetime.timedelta(days=3))
+        caches["default"].clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.ranking("7d"), [(self.recent.pk, 5)])
+        sql = [q["sql"] for q in queries.captured_queries]
+        self.assertEqual(len(sql), 1)
+        self.assertIn(BlogLeaderboard._meta.db_table, sql[0])
+        self.assertNotIn(Hit._meta.db_table, sql[0])
+
+        # Keyingi o'qish keshdan: so'rov yo'q
+        with self.assertNumQueries(0):
+            self.ranking("7d")
+
+    def test_periodic_job_refreshes_stale_windows(self):
+        leaderboard.refresh()
+        BlogViewDaily.objects.filter(blog=self.recent).update(day=self.today - datetime.timedelta(days=10))
+        BlogLeaderboard.objects.update(computed_day=self.today - datetime.timedelta(days=1))
+        caches["default"].clear()
+
+        hits.run_periodic()
+        self.assertEqual(self.ranking("7d"), [])
+        self.assertEqual(set(BlogLeaderboard.objects.values_list("computed_day", flat=True)), {self.today})
+
+    def test_flush_updates_changed_blogs(self):
+        leaderboard.refresh()
+        hits._add_pending({self.older.pk: 10})
+        hits.flush()
+        self.assertEqual(self.ranking("7d"), [(self.older.pk, 10), (self.recent.pk, 5)])
+
+
+@override_settings(ALLOWED_HOSTS=["*"])
+class VisitorCookieTests(TestCase):
+    def setUp(self):
+        caches["hits"].clear()
+        self.addCleanup(caches["hits"].clear)
+        flusher = mock.patch("core.hits._ensure_flusher")
+        flusher.start()
+        self.addCleanup(flusher.stop)
+        self.blog = make_blog()
+        self.url = reverse("blog-detail", args=[self.blog.slug])
+
+    def client_for(self, agent="Test/1.0"):
+        return Client(HTTP_HOST="localhost", HTTP_USER_AGENT=agent)
+
+    def test_first_view_sets_signed_cookie_without_session(self):
+        client = self.client_for()
+        response = client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["view_count"], 1)
+        cookie = response.cookies["blog_visitor"]
+        self.assertTrue(cookie["httponly"])
+        self.assertIn(":", cookie.value)  # imzolangan
+        self.assertFalse(Session.objects.exists())
+
+        again = client.get(self.url)
+        self.assertNotIn("blog_visitor", again.cookies)
+        self.assertEqual(again.json()["view_count"], 1)
+
+    def test_cookie_identifies_visitor_across_user_agents(self):
+        client = self.client_for()
+        client.get(self.url)
+        # Cookie bor: fingerprint (User-Agent) o'zgarsa ham o'sha o'quvchi
+        client.defaults["HTTP_USER_AGENT"] = "Boshqa/2.0"
+        self.assertEqual(client.get(self.url).json()["view_count"], 1)
+
+    def test_tampered_cookie_is_replaced(self):
+        client = self.client_for()
+        client.get(self.url)
+        client.cookies["blog_visitor"] = "soxta:imzo"
+        response = client.get(self.url)
+        self.assertIn("blog_visitor", response.cookies)
+        self.assertNotEqual(response.cookies["blog_visitor"].value, "soxta:imzo")
+
+    def test_cookieless_clients_fall_back_to_fingerprint(self):
+        self.client_for().get(self.url)
+        self.client_for().get(self.url)
+        self.assertEqual(hits.pending_views(self.blog.pk), 1)
+        self.client_for("Boshqa/2.0").get(self.url)
+        self.assertEqual(hits.pending_views(self.blog.pk), 2)
+
+
+class BlogSearchTests(TestCase):
+    def setUp(self):
+        self.in_body = make_blog("Yangiliklar", content="<p>Xayriya aksiyasi <b>haqida</b> batafsil</p>")
+        self.in_title = make_blog("Xayriya kuni", content="<p>Bugun tadbir</p>")
+        self.unrelated = make_blog("Sport", content="<p>Futbol</p>")
+
+    def ids(self, query, **kwargs):
+        results, cursor = search.search(query, **kwargs)
+        return [result["id"] for result in results], cursor
+
+    def test_title_match_ranks_first(self):
+        self.assertEqual(self.ids("xayriya")[0], [self.in_title.pk, self.in_body.pk])
+
+    def test_prefix_apostrophes_and_operators(self):
+        make_blog("Kitob", content="<p>O'qish foydali</p>")
+        self.assertEqual(len(self.ids("o'qi")[0]), 1)
+        self.assertEqual(self.ids("xayr")[0][0], self.in_title.pk)
+        # FTS operatorlari oddiy so'z sifatida
+        self.assertEqual(self.ids('xayriya OR "sport')[0], [])
+        self.assertEqual(self.ids("  ")[0], [])
+
+    def test_keyset_cursor_pages_without_gaps(self):
+        extra = [make_blog(f"Tadbir {i}", content="<p>tadbir</p>") for i in range(3)]
+        seen, cursor = [], None
+        while True:
+            page, cursor = self.ids("tadbir", limit=2, cursor=cursor)
+            seen.extend(page)
+            if cursor is None:
+                break
+        self.assertEqual(sorted(seen), sorted([self.in_title.pk] + [blog.pk for blog in extra]))
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_snippet_is_escaped_and_marked(self):
+        make_blog("Xavfsizlik", content="<p>&lt;script&gt; xayriya</p>")
+        results, _ = search.search("xayriya")
+        snippets = " ".join(result["snippet"] for result in results)
+        self.assertIn("<mark>", snippets)
+        self.assertNotIn("<script>", snippets)
+
+    def test_index_follows_save_and_delete(self):
+        self.unrelated.title = "Xayriya sporti"
+        self.unrelated.save()
+        self.assertIn(self.unrelated.pk, self.ids("xayriya")[0])
+        self.unrelated.delete()
+        self.assertNotIn(self.unrelated.pk, self.ids("xayriya")[0])
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(search.InvalidCursor):
+            search.search("xayriya", cursor="!!")
+
+
+class SanitizerTests(TestCase):
+    def html(self, content):
+        return render_content(content)["content_html"]
+
+    def test_script_urls_are_dropped(self):
+        for href in (
+            "javascript:alert(1)", "JaVaScRiPt:alert(1)", " javascript:alert(1)",
+            "java\tscript:alert(1)", "&#106;avascript:alert(1)", "data:text/html,<script>alert(1)</script>",
+            "vbscript:msgbox(1)",
+        ):
+            html = self.html(f'<a href="{href}">x</a><img src="{href}">')
+            self.assertNotIn("href", html, href)
+            self.assertNotIn("<img", html, href)
+        self.assertEqual(self.html('<a href="https://example.com">x</a>'), '<a href="https://example.com">x</a>')
+
+    def test_event_handlers_and_style_are_dropped(self):
+        html = self.html(
+            '<p onclick="alert(1)" style="position:fixed" class="lead">'
+            '<img src="/m/a.png" onerror="alert(1)" ONLOAD="alert(1)">matn</p>'
+        )
+        self.assertNotIn("alert", html)
+        self.assertNotIn("style", html)
+        self.assertIn('class="lead"', html)
+        self.assertIn('<img src="/m/a.png" loading="lazy" decoding="async">', html)
+
+    def test_dropped_tags_lose_their_content(self):
+        html = self.html("<p>a</p><script>alert(1)</script><style>p{}</style><svg><script>alert(2)</script></svg>")
+        self.assertEqual(html, "<p>a</p>")
+
+    def test_iframe_host_allowlist(self):
+        allowed = self.html('<iframe src="https://www.youtube.com/embed/x"></iframe>')
+        self.assertIn('src="https://www.youtube.com/embed/x"', allowed)
+        self.assertIn('loading="lazy"', allowed)
+        for src in (
+            "https://evil.com/embed", "//evil.com/x", "https://www.youtube.com.evil.com/x",
+            "javascript:alert(1)", "",
+        ):
+            html = self.html(f'<p>a</p><iframe src="{src}"><p>ichida</p></iframe><p>b</p>')
+            self.assertEqual(html, "<p>a</p><p>b</p>", src)
+
+    def test_attribute_values_are_escaped(self):
+        html = self.html('<a title="&quot; onmouseover=&quot;alert(1)" href="/x">x</a>')
+        self.assertIn('title="&quot; onmouseover=&quot;alert(1)"', html)
+        self.assertEqual(self.html("<p>&lt;script&gt;</p>"), "<p>&lt;script&gt;</p>")
+
+    def test_blank_target_gets_noopener(self):
+        html = self.html('<a href="/x" target="_blank" rel="opener">x</a>')
+        self.assertIn('rel="noopener noreferrer"', html)
+
+
+@override_settings(ALLOWED_HOSTS=["*"])
+class BlogFilterTests(TestCase):
+    def setUp(self):
+        self.region, self.other_region = REGION_CHOICES[0][0], REGION_CHOICES[1][0]
+        day = datetime.date(2025, 3, 10)
+        self.stamps = {
+            "kecha-oxiri": (datetime.datetime.combine(day - datetime.timedelta(days=1), datetime.time(23, 59, 59)), self.region),
+            "kun-boshi": (datetime.datetime.combine(day, datetime.time.min), self.region),
+            "kun-oxiri": (datetime.datetime.combine(day, datetime.time(23, 59, 59)), self.region),
+            "ertasi": (datetime.datetime.combine(day + datetime.timedelta(days=1), datetime.time.min), self.region),
+            "boshqa-viloyat": (datetime.datetime.combine(day, datetime.time(12)), self.other_region),
+        }
+        for title, (created, region) in self.stamps.items():
+            blog = make_blog(title, region=region)
+            Blog.objects.filter(pk=blog.pk).update(created_date=timezone.make_aware(created))
+
+    def titles(self, **params):
+        response = Client(HTTP_HOST="localhost").get(reverse("blog-list"), params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(blog["title"] for blog in response.json())
+
+    def test_date_bounds_are_inclusive_days(self):
+        self.assertEqual(
+            self.titles(date_from="2025-03-10", date_to="2025-03-10"),
+            ["boshqa-viloyat", "kun-boshi", "kun-oxiri"],
+        )
+        self.assertEqual(self.titles(date_from="2025-03-11"), ["ertasi"])
+        self.assertEqual(self.titles(date_to="2025-03-09"), ["kecha-oxiri"])
+
+    def test_region_with_dates(self):
+        self.assertEqual(
+            self.titles(region=self.region, date_from="2025-03-10", date_to="2025-03-10"),
+            ["kun-boshi", "kun-oxiri"],
+        )
+        self.assertEqual(self.titles(region=self.other_region), ["boshqa-viloyat"])
+
+    def test_invalid_values_are_rejected(self):
+        client = Client(HTTP_HOST="localhost")
+        self.assertEqual(client.get(reverse("blog-list"), {"region": "Mars"}).status_code, 400)
+        self.assertEqual(client.get(reverse("blog-list"), {"date_from": "2025-02-30"}).status_code, 400)
+
+    def test_filters_compare_the_column_directly(self):
+        qs = BlogFilter(
+            {"region": self.region, "date_from": "2025-03-10", "date_to": "2025-03-10"},
+            queryset=Blog.objects.order_by("-created_date"),
+        ).qs
+        sql, params = qs.query.sql_with_params()
+        self.assertNotIn("django_datetime_cast_date", sql)
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(str(row) for row in cursor.fetchall())
+        self.assertIn("core_blog_region_created_idx", plan)
+
+
+class ApplicationIndexTests(TestCase):
+    def setUp(self):
+        self.category, self.subcategory = make_taxonomy()
+
+    def test_plan_problems(self):
+        self.assertEqual(plan_problems([
+            "SEARCH core_application USING INDEX core_app_status_created_idx (status=?)",
+            "SCAN core_application USING INDEX core_app_created_idx",
+        ]), [])
+        self.assertEqual(
+            plan_problems(["SCAN core_application", "USE TEMP B-TREE FOR ORDER BY"]),
+            ["SCAN core_application", "USE TEMP B-TREE FOR ORDER BY"],
+        )
+
+    def test_list_filters_use_composite_indexes(self):
+        ordered = Application.objects.order_by("-created_date", "-id")
+        cases = {
+            "core_app_status_created_idx": ordered.filter(status="pending"),
+            "core_app_region_created_idx": ordered.filter(region=REGION_CHOICES[0][0]),
+            "core_app_category_created_idx": ordered.filter(category=self.category),
+            "core_app_subcat_created_idx": ordered.filter(subcategory=self.subcategory),
+        }
+        for index, queryset in cases.items():
+            plan = explain(queryset[:20])
+            self.assertEqual(plan_problems(plan), [], index)
+            self.assertIn(index, " ".join(plan), index)
+
+    def test_benchmark_command_passes_and_rolls_back(self):
+        out = io.StringIO()
+        call_command("benchmark_application_queries", sizes="300", repeat=1, stdout=out)
+        self.assertIn("Barcha so'rovlar indeks orqali bajarildi", out.getvalue())
+        self.assertFalse(Application.objects.exists())
+
+
+class CodedChoiceTests(StatsAssertionsMixin, TestCase):
+    def setUp(self):
+        self.category, self.subcategory = make_taxonomy()
+
+    def test_unknown_value_raises_instead_of_matching_nothing(self):
+        with self.assertRaises(ValidationError):
+            list(Application.objects.filter(region="Atlantida"))
+        with self.assertRaises(ValidationError):
+            list(ApplicationRollup.objects.filter(status__in=["pending", "yopiq"]))
+
+    def test_rollup_stores_codes(self):
+        make_application(self.category, self.subcategory, region=REGION_CHOICES[1][0])
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT region, status FROM core_applicationrollup")
+            self.assertEqual(cursor.fetchall(), [(2, 1)])
+        self.assertEqual(ApplicationRollup.objects.get().region, REGION_CHOICES[1][0])
+        self.assertStatsConsistent()
+
+    def test_views_reject_unknown_values(self):
+        client = Client(HTTP_HOST="localhost")
+        with override_settings(ALLOWED_HOSTS=["*"]):
+            for url, params in (
+                (reverse("filter_applications"), {"region": "Atlantida"}),
+                (reverse("filter_applications"), {"status": "yopiq"}),
+                (reverse("statistics_breakdown"), {"region": f"{REGION_CHOICES[0][0]},Atlantida"}),
+                (reverse("statistics_breakdown"), {"status": "yopiq"}),
+                (reverse("blog-popular"), {"region": "Atlantida"}),
+            ):
+                self.assertEqual(client.get(url, params).status_code, 400, (url, params))
+            response = client.get(reverse("filter_applications"), {"region": REGION_CHOICES[0][0]})
+            self.assertEqual(response.status_code, 200)
+
+
+class SQLiteLockRetryTests(TestCase):
+    """core.backends.sqlite3: "database is locked" qayta urinish bilan yumshatiladi"""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.path = os.path.join(directory, "lock.sqlite3")
+        holder = sqlite3.connect(self.path, isolation_level=None)
+        holder.execute("CREATE TABLE item (id INTEGER PRIMARY KEY)")
+        holder.close()
+
+    def wrapper(self, **options):
+        # timeout=0: busy_timeout kutmaydi, qulf darhol backend'ning o'ziga yetadi
+        settings_dict = {
+            **connections.settings["default"],
+            "NAME": self.path, "CONN_MAX_AGE": 0,
+            "OPTIONS": {"timeout": 0, **options},
+        }
+        wrapper = SQLiteDatabaseWrapper(settings_dict, alias="lock_test")
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def lock(self):
+        holder = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        holder.execute("BEGIN EXCLUSIVE")
+        return holder
+
+    def test_write_succeeds_once_lock_is_released(self):
+        holder = self.lock()
+        release = threading.Timer(0.15, holder.execute, ["ROLLBACK"])
+        release.start()
+        self.addCleanup(holder.close)
+        with self.wrapper(lock_retries=6, lock_backoff=0.05).cursor() as cursor:
+            cursor.execute("INSERT INTO item DEFAULT VALUES")
+        release.join()
+        self.assertEqual(holder.execute("SELECT COUNT(*) FROM item").fetchone(), (1,))
+
+    def test_gives_up_after_configured_retries(self):
+        holder = self.lock()
+        self.addCleanup(holder.close)
+        wrapper = self.wrapper(lock_retries=2, lock_backoff=0.01)
+        with mock.patch("core.backends.sqlite3.base.time.sleep") as sleep:
+            with self.assertRaisesMessage(Exception, "database is locked"):
+                with wrapper.cursor() as cursor:
+                    cursor.execute("INSERT INTO item DEFAULT VALUES")
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_other_errors_are_not_retried(self):
+        with mock.patch("core.backends.sqlite3.base.time.sleep") as sleep:
+            with self.assertRaisesMessage(Exception, "no such table"):
+                with self.wrapper(lock_retries=3).cursor() as cursor:
+                    cursor.execute("SELECT * FROM missing")
+        sleep.assert_not_called()
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1"], DB_PIN_COOKIE_NAME="db_pin")
+class ReplicaRoutingTests(TestCase):
+    """Yozuvdan keyin so'rovning qolgan qismi va klientning keyingi so'rovlari primary'dan o'qiydi"""
+
+    def setUp(self):
+        patcher = mock.patch.object(routers, "healthy_replicas", return_value=["replica_1"])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.router = routers.PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+
+    def run_request(self, request, write=False):
+        reads = []
+
+        def view(request):
+            reads.append(self.router.db_for_read(Category))
+            if write:
+                Category.objects.create(title="Yangi")
+                reads.append(self.router.db_for_read(Category))
+            return JsonResponse({})
+
+        response = ReplicaRoutingMiddleware(view)(request)
+        return reads, response
+
+    def test_reads_go_to_replica_until_a_write(self):
+        reads, response = self.run_request(self.factory.get("/api/blogs/"), write=True)
+        self.assertEqual(reads, ["replica_1", "default"])
+        self.assertIn("db_pin", response.cookies)
+
+    def test_read_only_request_sets_no_pin(self):
+        reads, response = self.run_request(self.factory.get("/api/blogs/"))
+        self.assertEqual(reads, ["replica_1"])
+        self.assertNotIn("db_pin", response.cookies)
+
+    def test_pinned_client_unsafe_method_and_admin_read_primary(self):
+        pinned = self.factory.get("/api/blogs/")
+        pinned.COOKIES["db_pin"] = "1"
+        for request in (pinned, self.factory.post("/api/contact/"), self.factory.get("/admin/core/blog/")):
+            self.assertEqual(self.run_request(request)[0], ["default"], request.path)
+
+    def test_outside_request_reads_primary(self):
+        self.assertEqual(self.router.db_for_read(Category), "default")
+        self.run_request(self.factory.get("/api/blogs/"))
+        # Middleware holatni tiklaydi: keyingi kod primary'dan o'qiydi
+        self.assertEqual(self.router.db_for_read(Category), "default")
+
+
+class LongRunningTests(TestCase):
+    def test_sqlite_only_opens_a_transaction(self):
+        self.assertEqual(connection.vendor, "sqlite")
+        with CaptureQueriesContext(connection) as queries:
+            with long_running():
+                self.assertTrue(connection.in_atomic_block)
+        # statement_timeout faqat Postgres'da: SQLite'da savepoint'dan boshqa so'rov yo'q
+        self.assertFalse([q["sql"] for q in queries if "SAVEPOINT" not in q["sql"]])
+
+    def test_rolls_back_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with long_running():
+                Category.objects.create(title="Vaqtinchalik")
+                raise RuntimeError
+        self.assertFalse(Category.objects.exists())
+
+
+class FakeResponse:
+    """aiohttp javobining `async with` bilan ishlatiladigan qismi"""
+
+    def __init__(self, payload=None, status=200, headers=None):
+        self.payload = payload
+        self.status = status
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(mock.Mock(real_url="fake"), (), status=self.status)
+
+    async def json(self):
+        return self.payload
+
+
+class FakeSession:
+    """outbound.session() o'rniga: so'rovlarni yozib, navbatdagi javobni qaytaradi"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def _request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        return self.responses.pop(0)
+
+    def get(self, url, **kwargs):
+        return self._request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._request("POST", url, **kwargs)
+
+
+def make_google_key():
+    """Test uchun RSA kalit va o'z-o'zini imzolagan sertifikat (Google certs formatida PEM)"""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.x509.oid import NameOID
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "test")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder().subject_name(name).issuer_name(name).public_key(key.public_key())
+        .serial_number(1).not_valid_before(now).not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    return private_pem, certificate.public_bytes(serialization.Encoding.PEM).decode()
+
+
+@override_settings(
+    ALLOWED_HOSTS=["*"], GOOGLE_CLIENT_ID="test-client", TELEGRAM_BOT_TOKEN="test-token",
+    TELEGRAM_CHAT_ID=-100, IMGBB_API_KEY="test-key",
+)
+class OutboundTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        private_pem, cls.certificate = make_google_key()
+        cls.signer = crypt.RSASigner.from_string(private_pem, key_id="kalit-1")
+
+    def setUp(self):
+        outbound._google_certs.update(certs=None, expires=0.0)
+        self.addCleanup(outbound._google_certs.update, certs=None, expires=0.0)
+        self.client = Client(HTTP_HOST="localhost")
+
+    def use_session(self, *responses):
+        fake = FakeSession(*responses)
+        patcher = mock.patch.object(outbound, "session", new=mock.AsyncMock(return_value=fake))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return fake
+
+    def certs_response(self, max_age=600):
+        return FakeResponse({"kalit-1": self.certificate}, headers={"Cache-Control": f"public, max-age={max_age}"})
+
+    def token(self, **claims):
+        now = int(timezone.now().timestamp())
+        payload = {
+            "iss": "https://accounts.google.com", "aud": "test-client", "sub": "1",
+            "email": "ali@example.com", "name": "Ali", "iat": now, "exp": now + 600,
+        }
+        payload.update(claims)
+        return google_jwt.encode(self.signer, payload).decode()
+
+    def google_login(self, token):
+        return self.client.post(reverse("google_auth"), {"token": token}, content_type="application/json")
+
+    def test_google_login_verifies_token_and_caches_certs(self):
+        session = self.use_session(self.certs_response(max_age=600), self.certs_response())
+        for _ in range(2):
+            response = self.google_login(self.token())
+            self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["user"]["email"], "ali@example.com")
+        self.assertEqual(User.objects.filter(username="ali@example.com").count(), 1)
+        # Sertifikatlar Cache-Control muddatigacha bir marta olinadi
+        self.assertEqual([call[:2] for call in session.calls], [("GET", "https://www.googleapis.com/oauth2/v1/certs")])
+
+        with mock.patch.object(outbound.time, "monotonic", return_value=outbound._google_certs["expires"] + 1):
+            async_to_sync(outbound.google_certs)()
+        self.assertEqual(len(session.calls), 2)
+
+    def test_google_login_rejects_bad_tokens(self):
+        self.use_session(self.certs_response())
+        other_signer = crypt.RSASigner.from_string(make_google_key()[0], key_id="kalit-1")
+        now = int(timezone.now().timestamp())
+        forged = google_jwt.encode(other_signer, {"iss": "accounts.google.com", "aud": "test-client",
+                                                   "email": "x@example.com", "iat": now, "exp": now + 600}).decode()
+        for token in (
+            self.token(aud="boshqa-client"),
+            self.token(iss="https://evil.example.com"),
+            self.token(iat=0, exp=1),
+            forged,
+        ):
+            response = self.google_login(token)
+            self.assertEqual(response.status_code, 400, token)
+            self.assertNotIn("access", response.json())
+        self.assertFalse(User.objects.exists())
+
+    def test_google_certs_fetch_error_is_a_400(self):
+        self.use_session(FakeResponse(status=503))
+        self.assertEqual(self.google_login(self.token()).status_code, 400)
+        self.assertIsNone(outbound._google_certs["certs"])
+
+    def test_telegram_message_and_failure_is_only_logged(self):
+        session = self.use_session(FakeResponse({"ok": True}), FakeResponse(status=500))
+        async_to_sync(outbound.send_telegram)("Salom")
+        method, url, kwargs = session.calls[0]
+        self.assertEqual((method, url), ("POST", "https://api.telegram.org/bottest-token/sendMessage"))
+        self.assertEqual(kwargs["params"], {"chat_id": -100, "text": "Salom", "parse_mode": "Markdown"})
+
+        with self.assertLogs("core.outbound", "WARNING"):
+            async_to_sync(outbound.send_telegram)("Salom")
+
+    def test_imgbb_upload_through_add_images(self):
+        category, subcategory = make_taxonomy()
+        application = make_application(category, subcategory)
+        session = self.use_session(
+            *(FakeResponse({"data": {"url": f"https://i.ibb.co/{n}.png"}}) for n in range(2))
+        )
+        url = reverse("application-add-images", args=[application.slug])
+        images = [SimpleUploadedFile(f"{n}.png", f"rasm-{n}".encode(), "image/png") for n in range(2)]
+        response = self.client.post(url, {"images": images})
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(
+            sorted(application.images.values_list("image_url", flat=True)),
+            ["https://i.ibb.co/0.png", "https://i.ibb.co/1.png"],
+        )
+        payloads = sorted(kwargs["data"]["image"] for _, _, kwargs in session.calls)
+        self.assertEqual(payloads, sorted(base64.b64encode(f"rasm-{n}".encode()).decode() for n in range(2)))
+        self.assertTrue(all(kwargs["data"]["key"] == "test-key" for _, _, kwargs in session.calls))
+
+    def test_imgbb_failure_adds_nothing(self):
+        category, subcategory = make_taxonomy()
+        application = make_application(category, subcategory)
+        self.use_session(FakeResponse(status=400))
+        url = reverse("application-add-images", args=[application.slug])
+        response = self.client.post(url, {"images": [SimpleUploadedFile("0.png", b"rasm", "image/png")]})
+        self.assertEqual(response.status_code, 502)
+        self.assertFalse(application.images.exists())
@@ -5,9 +5,11 @@ from .views import (
     CategoryViewSet, SubcategoryViewSet, ApplicationViewSet,
     ApplicationImageViewSet, RegisterView, LoginView,
     TokenRefreshView, ProfileAPIView, TestAuthView,
-    StatisticsAPIView, ContactUsViewSet,
+    StatisticsAPIView, StatisticsBreakdownAPIView, ContactUsViewSet,
+    SyncAPIView, BatchAPIView, AutocompleteAPIView, ApplicationIntakeStatusView,
     applications_by_category, applications_by_subcategory,
-    filter_applications, index, dashboard, get_csrf_token, subcategories_by_category
+    filter_applications, index, dashboard, get_csrf_token, subcategories_by_category,
+    snapshot_file
 )
 
 router = DefaultRouter()
@@ -23,6 +25,9 @@ urlpatterns = [
     path('', index, name='index'),
     path('dashboard/', dashboard, name='dashboard'),
     path('csrf/', get_csrf_token, name='csrf_token'),
+
+    # Static snapshots (nginx/CDN topa olmasa)
+    path('snapshots/<str:filename>', snapshot_file, name='snapshot_file'),
     
     # Auth
     path('auth/google/', GoogleAuthView.as_view(), name='google_auth'),
@@ -37,11 +42,22 @@ urlpatterns = [
     
     # Statistics
     path('statistics/', StatisticsAPIView.as_view(), name='statistics'),
+    path('statistics/breakdown/', StatisticsBreakdownAPIView.as_view(), name='statistics_breakdown'),
+
+    # Sync feed
+    path('sync/', SyncAPIView.as_view(), name='sync'),
+
+    # Batch
+    path('batch/', BatchAPIView.as_view(), name='batch'),
+
+    # Autocomplete
+    path('autocomplete/', AutocompleteAPIView.as_view(), name='autocomplete'),
     
     # Filter views
     path('applications/category/<int:category_id>/', applications_by_category, name='applications_by_category'),
     path('applications/subcategory/<int:subcategory_id>/', applications_by_subcategory, name='applications_by_subcategory'),
     path('applications/filter/', filter_applications, name='filter_applications'),
+    path('applications/intake/<uuid:intake_id>/', ApplicationIntakeStatusView.as_view(), name='application_intake'),
     path('categories/<int:category_id>/subcategories/', subcategories_by_category, name='subcategories_by_category'),
     # Router urls
     path('', include(router.urls)),
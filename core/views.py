@@ -1,20 +1,21 @@
 from django.contrib.auth.models import User
 from django.middleware.csrf import get_token
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
-from django.shortcuts import render
+from django.http import JsonResponse, FileResponse, Http404
+from django.shortcuts import aget_object_or_404, render
+from django.urls import reverse
+from django.utils.dateparse import parse_date
 from django.utils.text import slugify
 
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
-
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework import status, viewsets, filters
-from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import ValidationError as SubmissionError
 from rest_framework.generics import CreateAPIView
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
@@ -22,10 +23,14 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiTypes
 from drf_spectacular.types import OpenApiTypes
 
-from .models import About, Blog, Category, Subcategory, Application, ApplicationImage, Profile, Banner, ContactUs
+from .models import (
+    About, Blog, Category, Subcategory, Application, ApplicationImage, ArchivedApplication, Profile, Banner,
+    ContactUs, ApplicationIntake, ApplicationRollup, unique_application_slug,
+)
 from .serializers import (
     AboutSerializer,
     BlogSerializer,
+    BlogListSerializer,
     BlogCreateSerializer,
     CategorySerializer,
     SubcategorySerializer,
@@ -34,6 +39,7 @@ from .serializers import (
     ApplicationCreateWithFilesSerializer,
     ApplicationUpdateSerializer,
     ApplicationImageSerializer,
+    ArchivedApplicationSerializer,
     CustomRegisterSerializer,
     LoginSerializer,
     ProfileSerializer,
@@ -42,10 +48,34 @@ from .serializers import (
     ContactUsSerializer
 )
 
-from hitcount.models import HitCount
-from hitcount.views import HitCountMixin as HCViewMixin
+from .filters import BlogFilter
+from .snapshots import MANIFEST_NAME, SNAPSHOTS, get_snapshot_root, publish, publish_all
+from .sync import CursorExpired, InvalidCursor, get_changes
+from .batch import BatchError, dispatch_batch, parse_batch_paths
+from .stats import BREAKDOWN_DIMENSIONS, breakdown, get_counters
+from .hits import get_view_count, record_view, set_visitor_cookie, view_history
+from .leaderboard import WINDOWS as LEADERBOARD_WINDOWS, get_popular
+from .search import InvalidCursor as InvalidSearchCursor, search as search_blogs
+from .lookups import ApplicationSearchFilter, search_applications
+from .archive import include_archived, merged_applications
+from .applications import (
+    BulkStatusError, attach_image, bulk_set_status as apply_bulk_status, create_application,
+    parse_bulk_status, submission_data, validate_submission,
+)
+from .intake import requested as intake_requested, status as intake_status, submit as submit_intake
+from .idempotency import HEADER as IDEMPOTENCY_HEADER, idempotent
+from .asyncviews import AsyncDispatchMixin
+from . import outbound
+from .imports import FORMATS as IMPORT_FORMATS, ImportFormatError, detect_format, import_applications
+from .autocomplete import SOURCES as AUTOCOMPLETE_FIELDS, STAFF_ONLY_FIELDS as AUTOCOMPLETE_STAFF_FIELDS, suggest
+
 from django_filters.rest_framework import DjangoFilterBackend
-import requests
+from asgiref.sync import sync_to_async
+import asyncio
+import io
+import os
+import re
+from collections import Counter
 
 from django.db import models
 
@@ -53,7 +83,7 @@ from django.db import models
 # ===============================================
 # TELEGRAM NOTIFICATION
 # ===============================================
-def send_telegram_message(full_name, email, theme, message, created_date):
+async def send_telegram_message(full_name, email, theme, message, created_date):
     text = (
         f"📩 *Yangi Contact xabari!*\n\n"
         f"👤 *Foydalanuvchi:* {full_name}\n"
@@ -62,25 +92,14 @@ def send_telegram_message(full_name, email, theme, message, created_date):
         f"💬 *Xabar:* {message}\n"
         f"⏰ *Yuborilgan:* {created_date.strftime('%Y-%m-%d %H:%M')}"
     )
-
-    url = f"https://api.telegram.org/bot8417763736:AAG4188kWn4LofdFhJvSVWHDzj-NSCiOTLM/sendMessage"
-    params = {
-        "chat_id": -5075343219,
-        "text": text,
-        "parse_mode": "Markdown"
-    }
-
-    try:
-        requests.post(url, params=params, timeout=5)
-    except Exception as e:
-        print("Telegram error:", e)
+    await outbound.send_telegram(text)
 
 
 # ===============================================
 # GOOGLE AUTH
 # ===============================================
 @extend_schema(tags=['Auth'])
-class GoogleAuthView(APIView):
+class GoogleAuthView(AsyncDispatchMixin, APIView):
     permission_classes = [AllowAny]
     
     @extend_schema(
@@ -100,21 +119,21 @@ class GoogleAuthView(APIView):
             400: OpenApiTypes.OBJECT
         }
     )
-    def post(self, request):
+    async def post(self, request):
         token = request.data.get("token")
         if not token:
             return Response({"error": "Token required"}, status=400)
 
         try:
             from django.conf import settings
-            idinfo = id_token.verify_oauth2_token(token, google_requests.Request(), settings.GOOGLE_CLIENT_ID)
+            idinfo = await outbound.verify_google_token(token, settings.GOOGLE_CLIENT_ID)
             email = idinfo.get("email")
             name = idinfo.get("name")
 
             if not email:
                 return Response({"error": "Email not found in token"}, status=400)
 
-            user, created = User.objects.get_or_create(
+            user, created = await User.objects.aget_or_create(
                 username=email,
                 defaults={"email": email, "first_name": name},
             )
@@ -148,6 +167,52 @@ def get_csrf_token(request):
     return JsonResponse({"csrfToken": get_token(request)})
 
 
+def unknown_choices(model, field_name, values):
+    """
+    Kodlangan maydon uchun noma'lum qiymatlar. CodedChoiceField bunday qiymat
+    bilan filtrlashda xato beradi, shuning uchun so'rov parametrlari oldindan
+    tekshirilib 400 qaytariladi.
+    """
+    field = model._meta.get_field(field_name)
+    return [value for value in values if field.code_for(value) is None]
+
+
+# ===============================================
+# STATIC SNAPSHOTS (fallback)
+# ===============================================
+SNAPSHOT_FILENAME_RE = re.compile(r"^(?P<name>[a-z]+)(\.[0-9a-f]{12})?\.json$")
+
+
+def snapshot_file(request, filename):
+    """
+    Odatda snapshotlarni nginx/CDN beradi. Bu view faqat fayl topilmaganda
+    yoki to'g'ridan-to'g'ri Django'ga kelgan so'rovlar uchun ishlaydi.
+    """
+    match = SNAPSHOT_FILENAME_RE.match(filename)
+    if not match:
+        raise Http404()
+
+    name = match.group("name")
+    if name != MANIFEST_NAME and name not in SNAPSHOTS:
+        raise Http404()
+
+    path = os.path.join(get_snapshot_root(), filename)
+    if not os.path.exists(path):
+        if filename != f"{name}.json":
+            raise Http404()
+        if name == MANIFEST_NAME:
+            publish_all()
+        else:
+            publish(name)
+
+    response = FileResponse(open(path, "rb"), content_type="application/json")
+    if filename == f"{name}.json":
+        response["Cache-Control"] = "public, max-age=60"
+    else:
+        response["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
+
+
 # ===============================================
 # ABOUT VIEW
 # ===============================================
@@ -247,10 +312,15 @@ class BannerViewSet(viewsets.ModelViewSet):
 # ===============================================
 # BLOG VIEWSET
 # ===============================================
+class BlogPagination(LimitOffsetPagination):
+    max_limit = 100
+
+
 @extend_schema_view(
     list=extend_schema(
         summary="Barcha bloglarni olish",
-        description="Barcha bloglarni olish"
+        description="Barcha bloglarni olish (kontent o'rniga excerpt va o'qish vaqti)",
+        responses={200: BlogListSerializer(many=True)}
     ),
     retrieve=extend_schema(
         summary="Blogni slug bo'yicha olish",
@@ -284,6 +354,13 @@ class BlogViewSet(viewsets.ModelViewSet):
     queryset = Blog.objects.all().order_by("-created_date")
     parser_classes = [MultiPartParser, FormParser]
     lookup_field = "slug"
+
+    # ?region=&date_from=&date_to= -> (region, created_date) indeksi
+    filterset_class = BlogFilter
+    ordering_fields = ['created_date']
+    ordering = ['-created_date']
+    # ?limit=&offset= berilmasa ro'yxat avvalgidek to'liq qaytadi
+    pagination_class = BlogPagination
     
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
@@ -293,6 +370,8 @@ class BlogViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
         if self.action == 'create':
             return BlogCreateSerializer
+        if self.action == 'list':
+            return BlogListSerializer
         return BlogSerializer
 
     def perform_create(self, serializer):
@@ -308,12 +387,131 @@ class BlogViewSet(viewsets.ModelViewSet):
         else:
             serializer.save()
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related('hit_count_generic')
+        elif self.action == 'list':
+            queryset = queryset.defer('content', 'content_html', 'toc')
+        return queryset
+
     def retrieve(self, request, *args, **kwargs):
         blog = self.get_object()
-        hit_count = HitCount.objects.get_for_object(blog)
-        HCViewMixin.hit_count(request, hit_count)
+        # Ko'rish buferga yoziladi, bazaga fon thread'i partiya qilib yozadi
+        record_view(request, blog)
         serializer = self.get_serializer(blog)
-        return Response(serializer.data)
+        data = serializer.data
+        data["view_count"] = get_view_count(blog)
+        return set_visitor_cookie(request, Response(data))
+
+    @extend_schema(
+        summary="Bloglar bo'yicha qidiruv",
+        description="To'liq matnli qidiruv (bm25 bo'yicha saralangan, <mark> bilan belgilangan snippet'lar)",
+        parameters=[
+            OpenApiParameter(
+                name='q',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Qidiruv so'zi",
+                required=True
+            ),
+            OpenApiParameter(
+                name='cursor',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Oldingi javobdagi next_cursor"
+            ),
+            OpenApiParameter(
+                name='limit',
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description='Nechta natija (default 20, max 50)'
+            ),
+        ],
+        responses={200: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT}
+    )
+    @action(detail=False, methods=['get'], url_path='search')
+    def search(self, request):
+        query = request.GET.get("q", "").strip()
+        if not query:
+            return Response({"error": "q parametri majburiy"}, status=400)
+        try:
+            limit = min(max(int(request.GET.get("limit", 20)), 1), 50)
+        except ValueError:
+            return Response({"error": "limit butun son bo'lishi kerak"}, status=400)
+
+        try:
+            results, next_cursor = search_blogs(query, cursor=request.GET.get("cursor"), limit=limit)
+        except InvalidSearchCursor:
+            return Response({"error": "Noto'g'ri cursor"}, status=400)
+        return Response({"query": query, "results": results, "next_cursor": next_cursor})
+
+    @extend_schema(
+        summary="Eng ko'p o'qilgan bloglar",
+        description="Oldindan hisoblangan reyting (7d, 30d yoki all oynasi, viloyat bo'yicha filter)",
+        parameters=[
+            OpenApiParameter(
+                name='window',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Oyna',
+                enum=list(LEADERBOARD_WINDOWS)
+            ),
+            OpenApiParameter(
+                name='region',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Viloyat'
+            ),
+            OpenApiParameter(
+                name='limit',
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description='Nechta blog (default 10, max 50)'
+            ),
+        ],
+        responses={200: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT}
+    )
+    @action(detail=False, methods=['get'], url_path='popular')
+    def popular(self, request):
+        window = request.GET.get("window", "7d")
+        if window not in LEADERBOARD_WINDOWS:
+            return Response({"error": f"window: {', '.join(LEADERBOARD_WINDOWS)}"}, status=400)
+        try:
+            limit = min(max(int(request.GET.get("limit", 10)), 1), 50)
+        except ValueError:
+            return Response({"error": "limit butun son bo'lishi kerak"}, status=400)
+
+        region = request.GET.get("region") or None
+        if region and unknown_choices(Blog, "region", [region]):
+            return Response({"error": f"Noma'lum region: {region}"}, status=400)
+        return Response({
+            "window": window,
+            "region": region,
+            "results": get_popular(window, region=region, limit=limit),
+        })
+
+    @extend_schema(
+        summary="Blog ko'rishlari tarixi",
+        description="Oxirgi `days` kun (default 30, max 365) uchun kunlik ko'rishlar soni",
+        parameters=[
+            OpenApiParameter(
+                name='days',
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description='Kunlar soni'
+            ),
+        ],
+        responses={200: OpenApiTypes.OBJECT}
+    )
+    @action(detail=True, methods=['get'], url_path='views')
+    def views_history(self, request, slug=None):
+        blog = self.get_object()
+        try:
+            days = min(max(int(request.GET.get("days", 30)), 1), 365)
+        except ValueError:
+            return Response({"error": "days butun son bo'lishi kerak"}, status=400)
+        return Response({"slug": blog.slug, "days": view_history(blog, days)})
 
 
 # ===============================================
@@ -422,6 +620,72 @@ class SubcategoryViewSet(viewsets.ModelViewSet):
 # ===============================================
 # APPLICATION VIEWSET
 # ===============================================
+INCLUDE_ARCHIVED_PARAMETER = OpenApiParameter(
+    name='include_archived',
+    type=OpenApiTypes.BOOL,
+    location=OpenApiParameter.QUERY,
+    description=(
+        "1 bo'lsa arxivlangan (yopilganiga ko'p vaqt bo'lgan) arizalar ham qaytariladi. "
+        "Javob sahifalanadi: `limit` (default 50, max 100) va `offset`, "
+        "natija `{count, next, previous, results}` ko'rinishida"
+    )
+)
+
+
+class MergedApplicationPagination(LimitOffsetPagination):
+    """include_archived ro'yxati: ikki jadval UNION'i hech qachon to'liq o'qilmaydi"""
+    default_limit = 50
+    max_limit = 100
+
+
+def merged_response(request, live, archived, context):
+    paginator = MergedApplicationPagination()
+    page = paginator.paginate_queryset(merged_applications(live, archived), request)
+    return paginator.get_paginated_response(serialize_applications(page, context))
+
+ASYNC_INTAKE_PARAMETER = OpenApiParameter(
+    name='async',
+    type=OpenApiTypes.BOOL,
+    location=OpenApiParameter.QUERY,
+    description="1 bo'lsa ariza navbatga qo'yiladi va darhol 202 qaytariladi"
+)
+
+INTAKE_STATUS_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'id': {'type': 'string', 'format': 'uuid'},
+        'state': {'type': 'string', 'enum': ['queued', 'processing', 'completed', 'failed']},
+        'images_total': {'type': 'integer'},
+        'images_done': {'type': 'integer'},
+        'slug': {'type': 'string', 'nullable': True},
+        'error': {'type': 'object', 'nullable': True},
+        'created_date': {'type': 'string', 'format': 'date-time'},
+        'finished_date': {'type': 'string', 'format': 'date-time', 'nullable': True},
+        'status_url': {'type': 'string'},
+    },
+}
+
+IDEMPOTENCY_KEY_PARAMETER = OpenApiParameter(
+    name=IDEMPOTENCY_HEADER,
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.HEADER,
+    description=(
+        "Ixtiyoriy. Qayta yuborilgan so'rov (shu kalit bilan) yangi yozuv yaratmaydi, "
+        "birinchi javob qaytariladi"
+    )
+)
+
+
+def serialize_applications(items, context):
+    """Asosiy jadval va arxivdan aralash arizalar ro'yxati"""
+    return [
+        (ArchivedApplicationSerializer if isinstance(item, ArchivedApplication) else ApplicationSerializer)(
+            item, context=context
+        ).data
+        for item in items
+    ]
+
+
 @extend_schema_view(
     list=extend_schema(
         summary="Barcha arizalarni olish",
@@ -464,17 +728,24 @@ class SubcategoryViewSet(viewsets.ModelViewSet):
                 location=OpenApiParameter.QUERY,
                 description='Qidiruv (Ism, telefon, passport)'
             ),
+            INCLUDE_ARCHIVED_PARAMETER,
         ],
         responses={200: ApplicationSerializer(many=True)}
     ),
     retrieve=extend_schema(
         summary="Arizani slug bo'yicha olish",
         description="Arizani slug bo'yicha olish",
+        parameters=[INCLUDE_ARCHIVED_PARAMETER],
         responses={200: ApplicationSerializer}
     ),
     create=extend_schema(
         summary="Yangi ariza yaratish",
-        description="Yangi ariza yaratish (multipart/form-data)",
+        description=(
+            "Yangi ariza yaratish (multipart/form-data). `async=1` bo'lsa maydonlar tekshirilib "
+            "fayllar saqlanadi va 202 qaytariladi; ariza worker tomonidan yaratiladi, holati "
+            "`status_url` (GET /api/applications/intake/<id>/) orqali kuzatiladi."
+        ),
+        parameters=[IDEMPOTENCY_KEY_PARAMETER, ASYNC_INTAKE_PARAMETER],
         request={
             'multipart/form-data': {
                 'type': 'object',
@@ -503,7 +774,7 @@ class SubcategoryViewSet(viewsets.ModelViewSet):
                 ]
             }
         },
-        responses={201: ApplicationSerializer}
+        responses={201: ApplicationSerializer, 202: INTAKE_STATUS_SCHEMA}
     ),
     update=extend_schema(
         summary="Arizani yangilash",
@@ -523,15 +794,35 @@ class SubcategoryViewSet(viewsets.ModelViewSet):
     )
 )
 @extend_schema(tags=['Applications'])
-class ApplicationViewSet(viewsets.ModelViewSet):
+class ApplicationViewSet(AsyncDispatchMixin, viewsets.ModelViewSet):
     queryset = Application.objects.all().order_by("-created_date")
     parser_classes = [MultiPartParser, FormParser]
     lookup_field = "slug"
     permission_classes = [AllowAny]
 
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, ApplicationSearchFilter]
     filterset_fields = ['category', 'subcategory', 'status', 'region']
-    search_fields = ['full_name', 'phone_number', 'passport_number']
+    # Telefon/passport so'rovlari normallashtirilgan indeksli ustunlarga yo'naltiriladi
+    search_fields = ['full_name', 'phone_digits', 'passport_normalized']
+
+    def list(self, request, *args, **kwargs):
+        if not include_archived(request):
+            return super().list(request, *args, **kwargs)
+        # Bir xil filtr va qidiruv ikkala jadvalga qo'llanadi
+        live = self.filter_queryset(self.get_queryset())
+        archived = self.filter_queryset(ArchivedApplication.objects.all())
+        return merged_response(request, live, archived, self.get_serializer_context())
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            if not include_archived(request):
+                raise
+        archived = ArchivedApplication.objects.filter(slug=kwargs["slug"]).order_by("-archived_date").first()
+        if archived is None:
+            raise Http404
+        return Response(ArchivedApplicationSerializer(archived, context=self.get_serializer_context()).data)
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -540,52 +831,37 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             return ApplicationUpdateSerializer
         return ApplicationSerializer
 
+    @idempotent("application-create")
     def create(self, request, *args, **kwargs):
-        # Foydalanuvchi nomidan slug yaratish
         full_name = request.data.get("full_name")
         if not full_name:
             return Response({"error": "full_name kerak"}, status=400)
 
-        slug = slugify(full_name)
-        counter = 1
-        new_slug = slug
-
-        while Application.objects.filter(slug=new_slug).exists():
-            new_slug = f"{slug}-{counter}"
-            counter += 1
+        data = submission_data(request.data)
+        video, document = request.FILES.get('video'), request.FILES.get('document')
+        images_files = request.FILES.getlist('images')
+        try:
+            serializer = validate_submission(data, video, document)
+        except SubmissionError as e:
+            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+
+        if intake_requested(request):
+            # Fayllar saqlanadi, ariza process_application_intakes worker'ida yaratiladi
+            intake = submit_intake(data, video, document, images_files)
+            status_url = reverse("application_intake", kwargs={"intake_id": intake.pk})
+            return Response(
+                {**intake_status(intake), "status_url": status_url},
+                status=status.HTTP_202_ACCEPTED,
+                headers={"Location": status_url},
+            )
 
-        # Serializer uchun data
-        data = {
-            'full_name': request.data.get('full_name'),
-            'phone_number': request.data.get('phone_number'),
-            'birth_date': request.data.get('birth_date'),
-            'passport_number': request.data.get('passport_number'),
-            'region': request.data.get('region'),
-            'district': request.data.get('district'),
-            'location': request.data.get('location'),
-            'category': request.data.get('category'),
-            'subcategory': request.data.get('subcategory'),
-            'description': request.data.get('description'),
-            'video': request.FILES.get('video'),
-            'document': request.FILES.get('document'),
-        }
-        
-        serializer = self.get_serializer(data=data)
-        
-        if not serializer.is_valid():
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        
         try:
             # Application yaratish
-            application = serializer.save(slug=new_slug)
+            application = create_application(serializer)
             
             # Rasm fayllarini saqlash
-            images_files = request.FILES.getlist('images')
             for image_file in images_files:
-                ApplicationImage.objects.create(
-                    application=application,
-                    image=image_file
-                )
+                attach_image(application, image_file)
             
             return Response(
                 ApplicationSerializer(application).data,
@@ -598,16 +874,16 @@ class ApplicationViewSet(viewsets.ModelViewSet):
                 application.delete()
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     
+    async def aget_object(self):
+        """get_object'ning async varianti (async rasm action'lari uchun)"""
+        application = await aget_object_or_404(self.get_queryset(), slug=self.kwargs["slug"])
+        self.check_object_permissions(self.request, application)
+        return application
+
     def perform_update(self, serializer):
         full_name = serializer.validated_data.get("full_name")
         if full_name:
-            slug = slugify(full_name)
-            counter = 1
-            new_slug = slug
-            while Application.objects.filter(slug=new_slug).exclude(pk=self.get_object().pk).exists():
-                new_slug = f"{slug}-{counter}"
-                counter += 1
-            serializer.save(slug=new_slug)
+            serializer.save(slug=unique_application_slug(full_name, exclude_pk=serializer.instance.pk))
         else:
             serializer.save()
 
@@ -618,8 +894,8 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         responses={201: ApplicationImageSerializer}
     )
     @action(detail=True, methods=["post"], url_path="add-image")
-    def add_image(self, request, slug=None):
-        application = self.get_object()
+    async def add_image(self, request, slug=None):
+        application = await self.aget_object()
 
         image_file = request.FILES.get("image")
         image_url = request.data.get("image_url")
@@ -627,11 +903,20 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         if not image_file and not image_url:
             return Response({"error": "image yoki image_url kiriting"}, status=400)
 
-        serializer = ApplicationImageSerializer(
-            data={"image": image_file, "image_url": image_url}
-        )
+        # None qiymat serializer'da "null bo'lishi mumkin emas" xatosini beradi
+        data = {"image": image_file, "image_url": image_url}
+        serializer = ApplicationImageSerializer(data={name: value for name, value in data.items() if value})
         serializer.is_valid(raise_exception=True)
-        serializer.save(application=application)
+        if image_url:
+            # imgbb'ga yuklanmaydi (ApplicationImage.save bilan bir xil)
+            await sync_to_async(serializer.save)(application=application)
+            return Response(serializer.data, status=201)
+
+        try:
+            url = await outbound.upload_to_imgbb(image_file)
+        except outbound.ERRORS as e:
+            return Response({"error": f"Rasm yuklanmadi: {e}"}, status=502)
+        serializer.instance = await ApplicationImage.objects.acreate(application=application, image_url=url)
 
         return Response(serializer.data, status=201)
 
@@ -662,20 +947,22 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         }
     )
     @action(detail=True, methods=["post"], url_path="add-images")
-    def add_images(self, request, slug=None):
-        application = self.get_object()
+    async def add_images(self, request, slug=None):
+        application = await self.aget_object()
         images = request.FILES.getlist("images")
 
         if not images:
             return Response({"error": "Rasm yuborilmadi"}, status=400)
 
-        added = 0
-        for image in images:
-            ApplicationImage.objects.create(
-                application=application,
-                image=image
-            )
-            added += 1
+        # Rasmlar imgbb'ga parallel yuklanadi; biri yuklanmasa hech biri qo'shilmaydi
+        try:
+            urls = await asyncio.gather(*(outbound.upload_to_imgbb(image) for image in images))
+        except outbound.ERRORS as e:
+            return Response({"error": f"Rasm yuklanmadi: {e}"}, status=502)
+        created = await ApplicationImage.objects.abulk_create([
+            ApplicationImage(application=application, image_url=url) for url in urls
+        ])
+        added = len(created)
 
         return Response(
             {"detail": f"{added} ta rasm qo'shildi", "added_count": added},
@@ -754,6 +1041,159 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(application)
         return Response(serializer.data)
 
+    @extend_schema(
+        summary="Bir nechta ariza statusini o'zgartirish",
+        description=(
+            "Partiya oldindan to'liq tekshiriladi (xato bo'lsa hech narsa o'zgarmaydi), keyin "
+            "bitta tranzaksiyada qo'llanadi. Ikki ko'rinish: {slugs, status, denied_reason} "
+            "yoki {items: [{slug, status, denied_reason}]}. (admin uchun)"
+        ),
+        request={
+            'application/json': {
+                'type': 'object',
+                'properties': {
+                    'slugs': {'type': 'array', 'items': {'type': 'string'}},
+                    'status': {'type': 'string', 'enum': ['pending', 'accepted', 'denied']},
+                    'denied_reason': {'type': 'string'},
+                    'items': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'slug': {'type': 'string'},
+                                'status': {'type': 'string', 'enum': ['pending', 'accepted', 'denied']},
+                                'denied_reason': {'type': 'string'},
+                            },
+                        },
+                    },
+                },
+            }
+        },
+        responses={
+            200: {
+                'type': 'object',
+                'properties': {
+                    'updated': {'type': 'integer'},
+                    'unchanged': {'type': 'integer'},
+                    'not_found': {'type': 'integer'},
+                    'results': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'slug': {'type': 'string'},
+                                'result': {'type': 'string', 'enum': ['updated', 'unchanged', 'not_found']},
+                                'status': {'type': 'string', 'nullable': True},
+                            },
+                        },
+                    },
+                },
+            },
+            400: OpenApiTypes.OBJECT,
+        }
+    )
+    @action(
+        detail=False, methods=["post"], url_path="bulk-set-status",
+        parser_classes=[JSONParser], permission_classes=[IsAdminUser],
+    )
+    def bulk_set_status(self, request):
+        try:
+            items = parse_bulk_status(request.data)
+        except BulkStatusError as e:
+            return Response({"error": str(e), "errors": e.errors}, status=400)
+
+        results = apply_bulk_status(items)
+        summary = Counter(result["result"] for result in results)
+        return Response({
+            "updated": summary["updated"],
+            "unchanged": summary["unchanged"],
+            "not_found": summary["not_found"],
+            "results": results,
+        })
+
+    @extend_schema(
+        summary="Arizalarni fayldan import qilish",
+        description=(
+            "CSV yoki NDJSON fayldagi arizalarni partiyalab yaratadi (admin uchun). "
+            "Format fayl kengaytmasidan yoki `format` maydonidan olinadi. Noto'g'ri "
+            "qatorlar importni to'xtatmaydi: `errors` ro'yxatida qator raqami bilan "
+            "qaytariladi. `dry_run=1` faqat tekshiradi."
+        ),
+        request={
+            'multipart/form-data': {
+                'type': 'object',
+                'properties': {
+                    'file': {'type': 'string', 'format': 'binary'},
+                    'format': {'type': 'string', 'enum': [*IMPORT_FORMATS]},
+                    'dry_run': {'type': 'boolean'},
+                },
+                'required': ['file'],
+            }
+        },
+        responses={
+            200: {
+                'type': 'object',
+                'properties': {
+                    'total': {'type': 'integer'},
+                    'created': {'type': 'integer'},
+                    'failed': {'type': 'integer'},
+                    'errors': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'line': {'type': 'integer'},
+                                'errors': {'type': 'object'},
+                            },
+                        },
+                    },
+                    'errors_truncated': {'type': 'boolean'},
+                    'dry_run': {'type': 'boolean'},
+                },
+            },
+            400: OpenApiTypes.OBJECT,
+        }
+    )
+    @action(
+        detail=False, methods=["post"], url_path="import",
+        parser_classes=[MultiPartParser], permission_classes=[IsAdminUser],
+    )
+    def import_file(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"error": "file kerak"}, status=400)
+        dry_run = request.data.get("dry_run") in ("1", "true")
+        try:
+            fmt = detect_format(upload.name, request.data.get("format"))
+            upload.seek(0)
+            stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+            report = import_applications(stream, fmt, dry_run=dry_run)
+        except ImportFormatError as e:
+            return Response({"error": str(e)}, status=400)
+        return Response(report)
+
+
+# ===============================================
+# APPLICATION INTAKE STATUS
+# ===============================================
+@extend_schema(tags=['Applications'])
+class ApplicationIntakeStatusView(APIView):
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        summary="Asinxron ariza holati",
+        description=(
+            "POST /api/applications/?async=1 qaytargan id bo'yicha: navbatda, ishlanmoqda, "
+            "yaratildi (slug bilan) yoki xato. `images_done` / `images_total` - yuklangan rasmlar."
+        ),
+        responses={200: INTAKE_STATUS_SCHEMA, 404: OpenApiTypes.OBJECT}
+    )
+    def get(self, request, intake_id):
+        intake = ApplicationIntake.objects.filter(pk=intake_id).first()
+        if intake is None:
+            return Response({"error": "Topilmadi"}, status=404)
+        return Response({**intake_status(intake), "status_url": request.path})
+
 
 # ===============================================
 # APPLICATION IMAGE VIEWSET
@@ -1033,22 +1473,274 @@ class StatisticsAPIView(APIView):
         }
     )
     def get(self, request):
-        data = {
-            "total_applications": Application.objects.count(),
-            "accepted_applications": Application.objects.filter(status="accepted").count(),
-            "denied_applications": Application.objects.filter(status="denied").count(),
-            "pending_applications": Application.objects.filter(status="pending").count(),
-            "total_users": User.objects.count(),
-            "total_blogs": Blog.objects.count(),
-            "total_categories": Category.objects.count(),
-            "total_subcategories": Subcategory.objects.count(),
-            "total_banners": Banner.objects.count(),
-            "total_contacts": ContactUs.objects.count(),
-            "unread_contacts": ContactUs.objects.filter(is_read=False).count(),
-        }
+        # Hisoblagichlar signal'lar orqali yangilanadi (core/stats.py)
+        return Response(get_counters())
+
+
+@extend_schema(tags=['Statistics'])
+class StatisticsBreakdownAPIView(APIView):
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        summary="Arizalar statistikasi kesimlar bo'yicha",
+        description=(
+            "Arizalar sonini kun/oy, viloyat, kategoriya, subkategoriya va status "
+            "bo'yicha guruhlaydi. Faqat oldindan hisoblangan rollup jadvalidan o'qiladi."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name='group_by',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Vergul bilan: day, month, region, category, subcategory, status"
+            ),
+            OpenApiParameter(
+                name='region',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Viloyat(lar), vergul bilan'
+            ),
+            OpenApiParameter(
+                name='category',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Kategoriya ID(lar), vergul bilan'
+            ),
+            OpenApiParameter(
+                name='subcategory',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Subkategoriya ID(lar), vergul bilan'
+            ),
+            OpenApiParameter(
+                name='status',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Status(lar), vergul bilan'
+            ),
+            OpenApiParameter(
+                name='date_from',
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+                description='Boshlanish sanasi (YYYY-MM-DD)'
+            ),
+            OpenApiParameter(
+                name='date_to',
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+                description='Tugash sanasi (YYYY-MM-DD)'
+            ),
+        ],
+        responses={200: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT}
+    )
+    def get(self, request):
+        def split(name):
+            value = request.GET.get(name, "")
+            return [item.strip() for item in value.split(",") if item.strip()]
+
+        group_by = split("group_by")
+        unknown = [name for name in group_by if name not in BREAKDOWN_DIMENSIONS]
+        if unknown:
+            return Response({"error": f"Noma'lum group_by: {', '.join(unknown)}"}, status=400)
+        if "day" in group_by and "month" in group_by:
+            return Response({"error": "day va month birga ishlatilmaydi"}, status=400)
+
+        filters = {"region": split("region"), "status": split("status")}
+        for name in ("region", "status"):
+            unknown = unknown_choices(ApplicationRollup, name, filters[name])
+            if unknown:
+                return Response({"error": f"Noma'lum {name}: {', '.join(unknown)}"}, status=400)
+        try:
+            filters["category"] = [int(v) for v in split("category")]
+            filters["subcategory"] = [int(v) for v in split("subcategory")]
+        except ValueError:
+            return Response({"error": "category va subcategory ID butun son bo'lishi kerak"}, status=400)
+
+        for name in ("date_from", "date_to"):
+            value = request.GET.get(name)
+            if value:
+                try:
+                    # parse_date mavjud bo'lmagan sanada (2024-13-01) ValueError beradi
+                    filters[name] = parse_date(value)
+                except ValueError:
+                    filters[name] = None
+                if filters[name] is None:
+                    return Response({"error": f"{name} noto'g'ri sana (YYYY-MM-DD)"}, status=400)
+
+        total, results = breakdown(list(dict.fromkeys(group_by)), filters)
+        return Response({"group_by": group_by, "total": total, "results": results})
+
+
+# ===============================================
+# SYNC FEED
+# ===============================================
+@extend_schema(tags=['Sync'])
+class SyncAPIView(APIView):
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        summary="O'zgarishlar (changes since)",
+        description=(
+            "Banner, blog, kategoriya va subkategoriyalarning cursor'dan keyingi "
+            "o'zgarishlari va o'chirilishlari. Birinchi so'rovda `since` bo'sh "
+            "qoldiriladi, keyingilarida javobdagi `cursor` yuboriladi. "
+            "`has_more=true` bo'lsa darhol yana so'rov yuboring."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name='since',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Oldingi javobdagi cursor'
+            ),
+            OpenApiParameter(
+                name='limit',
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description='Partiya hajmi'
+            ),
+        ],
+        responses={200: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT, 410: OpenApiTypes.OBJECT}
+    )
+    def get(self, request):
+        since = request.GET.get("since") or None
+        limit = request.GET.get("limit")
+        try:
+            limit = int(limit) if limit else None
+        except ValueError:
+            return Response({"error": "limit butun son bo'lishi kerak"}, status=400)
+        if limit is not None and limit < 1:
+            return Response({"error": "limit musbat bo'lishi kerak"}, status=400)
+
+        try:
+            data = get_changes(since=since, limit=limit)
+        except InvalidCursor:
+            return Response({"error": "Noto'g'ri cursor"}, status=400)
+        except CursorExpired:
+            return Response(
+                {"error": "Cursor eskirgan, to'liq qayta sinxronlash kerak", "reset": True},
+                status=410
+            )
         return Response(data)
 
 
+# ===============================================
+# BATCH VIEW
+# ===============================================
+@extend_schema(tags=['Batch'])
+class BatchAPIView(APIView):
+    permission_classes = [AllowAny]
+    parser_classes = [JSONParser]
+    batch_excluded = True
+
+    @extend_schema(
+        summary="Bir nechta GET so'rovni bitta so'rovda bajarish",
+        description=(
+            "`/api/` ichidagi GET yo'llarni server ichida bajaradi va natijalarni "
+            "bitta javobda qaytaradi. Har bir natijada o'z status kodi bor. "
+            "`parallel=true` bo'lsa so'rovlar bir vaqtda bajariladi."
+        ),
+        request={
+            'application/json': {
+                'type': 'object',
+                'properties': {
+                    'requests': {
+                        'type': 'array',
+                        'items': {'type': 'string'},
+                        'description': "Masalan: ['/api/banners/active/', '/api/about/']"
+                    },
+                    'parallel': {'type': 'boolean'}
+                },
+                'required': ['requests']
+            }
+        },
+        responses={
+            200: {
+                'type': 'object',
+                'properties': {
+                    'responses': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'path': {'type': 'string'},
+                                'status': {'type': 'integer'},
+                                'body': {}
+                            }
+                        }
+                    }
+                }
+            },
+            400: OpenApiTypes.OBJECT
+        }
+    )
+    def post(self, request):
+        try:
+            paths = parse_batch_paths(request.data)
+        except BatchError as e:
+            return Response({"error": str(e)}, status=400)
+
+        results, cookies = dispatch_batch(
+            request._request, request, paths,
+            concurrent=bool(request.data.get("parallel"))
+        )
+        response = Response({"responses": results})
+        # Ichki javoblar qo'ygan cookie'lar (masalan, blog tashrif buyuruvchisi)
+        response.cookies.update(cookies)
+        return response
+
+
+# ===============================================
+# AUTOCOMPLETE
+# ===============================================
+@extend_schema(tags=['Autocomplete'])
+class AutocompleteAPIView(APIView):
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        summary="Typeahead takliflari",
+        description=(
+            "Tuman, kategoriya, subkategoriya yoki ariza egasi ismi (faqat admin) bo'yicha "
+            "prefiks takliflari. Xotiradagi indeksdan javob beradi, bazaga murojaat qilmaydi."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name='field',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Maydon',
+                enum=list(AUTOCOMPLETE_FIELDS),
+                required=True
+            ),
+            OpenApiParameter(
+                name='q',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Yozilgan matn (prefiks)"
+            ),
+            OpenApiParameter(
+                name='limit',
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description='Nechta taklif (default 10, max 20)'
+            ),
+        ],
+        responses={200: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT, 403: OpenApiTypes.OBJECT}
+    )
+    def get(self, request):
+        field = request.GET.get("field")
+        if field not in AUTOCOMPLETE_FIELDS:
+            return Response({"error": f"field: {', '.join(AUTOCOMPLETE_FIELDS)}"}, status=400)
+        if field in AUTOCOMPLETE_STAFF_FIELDS and not request.user.is_staff:
+            return Response({"error": "Ruxsat yo'q"}, status=403)
+        try:
+            limit = min(max(int(request.GET.get("limit", 10)), 1), 20)
+        except ValueError:
+            return Response({"error": "limit butun son bo'lishi kerak"}, status=400)
+
+        return Response({"field": field, "results": suggest(field, request.GET.get("q", ""), limit=limit)})
+
+
 # ===============================================
 # CONTACT US VIEWSET
 # ===============================================
@@ -1066,6 +1758,7 @@ class StatisticsAPIView(APIView):
     create=extend_schema(
         summary="Yangi contact xabar yaratish",
         description="Yangi contact xabar yaratish",
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
         request=ContactUsSerializer,
         responses={201: ContactUsSerializer}
     ),
@@ -1087,7 +1780,7 @@ class StatisticsAPIView(APIView):
     )
 )
 @extend_schema(tags=['Contact Us'])
-class ContactUsViewSet(viewsets.ModelViewSet):
+class ContactUsViewSet(AsyncDispatchMixin, viewsets.ModelViewSet):
     queryset = ContactUs.objects.all().order_by("-created_date")
     serializer_class = ContactUsSerializer
     permission_classes = [AllowAny]
@@ -1097,13 +1790,15 @@ class ContactUsViewSet(viewsets.ModelViewSet):
             return [IsAdminUser()]
         return [AllowAny()]
 
-    def create(self, request, *args, **kwargs):
+    @idempotent("contact-create")
+    async def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        contact = serializer.save()
+        contact = await ContactUs.objects.acreate(**serializer.validated_data)
+        serializer.instance = contact
 
         # Telegramga yuborish
-        send_telegram_message(
+        await send_telegram_message(
             full_name=contact.full_name,
             email=contact.email,
             theme=contact.theme,
@@ -1194,6 +1889,7 @@ def applications_by_subcategory(request, subcategory_id):
             location=OpenApiParameter.QUERY,
             description='Qidiruv (Ism, telefon, passport)'
         ),
+        INCLUDE_ARCHIVED_PARAMETER,
     ],
     responses={200: ApplicationSerializer(many=True)}
 )
@@ -1206,22 +1902,27 @@ def filter_applications(request):
     region = request.GET.get('region')
     search = request.GET.get('search')
 
-    queryset = Application.objects.all()
-
-    if category_id:
-        queryset = queryset.filter(category_id=category_id)
-    if subcategory_id:
-        queryset = queryset.filter(subcategory_id=subcategory_id)
-    if status:
-        queryset = queryset.filter(status=status)
-    if region:
-        queryset = queryset.filter(region=region)
-    if search:
-        queryset = queryset.filter(
-            models.Q(full_name__icontains=search) |
-            models.Q(phone_number__icontains=search) |
-            models.Q(passport_number__icontains=search)
-        )
+    for name, value in (('status', status), ('region', region)):
+        if value and unknown_choices(Application, name, [value]):
+            return Response({"error": f"Noma'lum {name}: {value}"}, status=400)
+
+    def apply_filters(queryset):
+        if category_id:
+            queryset = queryset.filter(category_id=category_id)
+        if subcategory_id:
+            queryset = queryset.filter(subcategory_id=subcategory_id)
+        if status:
+            queryset = queryset.filter(status=status)
+        if region:
+            queryset = queryset.filter(region=region)
+        if search:
+            queryset = search_applications(queryset, search)
+        return queryset
+
+    queryset = apply_filters(Application.objects.all())
+    if include_archived(request):
+        archived = apply_filters(ArchivedApplication.objects.all())
+        return merged_response(request, queryset, archived, {'request': request})
 
     serializer = ApplicationSerializer(queryset, many=True)
     return Response(serializer.data)